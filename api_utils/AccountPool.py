@@ -0,0 +1,123 @@
+import os
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+
+class LeaseTimeout(TimeoutError):
+    """Все аккаунты пула заняты дольше допустимого времени ожидания."""
+
+
+class AccountPool:
+    """
+    Пул аккаунтов (токенов авторизации) для изоляции корзин тестов:
+    - Аккаунт выдается в аренду одному владельцу (xdist-воркеру
+      или тесту) и возвращается после использования,
+    - Занятость аккаунтов отмечается файлами-блокировками в общем
+      каталоге запуска, поэтому пул работает между процессами xdist,
+    - При отсутствии свободных аккаунтов аренда ожидает освобождения.
+    """
+
+    def __init__(self, tokens: list, lock_dir=None,
+                 timeout: float = 60, poll: float = 0.1) -> None:
+        """
+        Инициализация пула.
+            tokens: list - токены аккаунтов пула,
+            lock_dir - каталог блокировок, общий для всех воркеров запуска
+                       (по умолчанию - каталог запуска xdist во временном
+                       каталоге системы),
+            timeout: float - время ожидания свободного аккаунта (сек.),
+            poll: float - интервал проверки освобождения аккаунтов (сек.).
+        """
+        if not tokens:
+            raise ValueError("Пул аккаунтов пуст: не задан ни один токен")
+        self.tokens = list(dict.fromkeys(tokens))
+        if lock_dir is None:
+            run_id = (os.environ.get("PYTEST_XDIST_TESTRUNUID") or
+                      uuid.uuid4().hex)
+            lock_dir = Path(tempfile.gettempdir()) / f"cg-accounts-{run_id}"
+        self.lock_dir = Path(lock_dir)
+        self.lock_dir.mkdir(parents=True, exist_ok=True)
+        self.timeout = timeout
+        self.poll = poll
+        self.leased = {}
+        self.retired = set()
+        self.lock = threading.Lock()
+
+    def _lock_path(self, index: int) -> Path:
+        return self.lock_dir / f"account-{index}.lock"
+
+    def _try_lease(self, owner: str):
+        for index, token in enumerate(self.tokens):
+            try:
+                fd = os.open(self._lock_path(index),
+                             os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as lock:
+                lock.write(f"{owner} {os.getpid()}\n")
+            with self.lock:
+                self.leased[token] = index
+            return token
+        return None
+
+    def lease(self, owner: str) -> str:
+        """
+        Берет свободный аккаунт в аренду и возвращает его токен.
+            owner: str - владелец аренды (имя воркера или id теста).
+        Если свободный аккаунт не появился за 'timeout' секунд,
+        выбрасывается исключение LeaseTimeout.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            token = self._try_lease(owner)
+            if token is not None:
+                return token
+            if time.monotonic() >= deadline:
+                raise LeaseTimeout(
+                    f"Нет свободного аккаунта для '{owner}' за "
+                    f"{self.timeout} сек.: все {len(self.tokens)} заняты")
+            time.sleep(self.poll)
+
+    def release(self, token: str) -> None:
+        """Возвращает аккаунт в пул."""
+        with self.lock:
+            index = self.leased.pop(token, None)
+        if index is not None:
+            try:
+                self._lock_path(index).unlink()
+            except FileNotFoundError:
+                pass
+
+    def retire(self, token: str) -> None:
+        """
+        Исключает аккаунт из пула до завершения этого процесса (например,
+        если его корзину не удалось очистить): блокировка аккаунта
+        снимается только в close().
+        """
+        with self.lock:
+            index = self.leased.pop(token, None)
+            if index is not None:
+                self.retired.add(index)
+
+    def close(self) -> None:
+        """
+        Возвращает в пул все аккаунты этого процесса (в том числе
+        исключенные) и удаляет каталог блокировок, если он пуст
+        (остальные воркеры завершили работу).
+        """
+        for token in list(self.leased):
+            self.release(token)
+        with self.lock:
+            retired, self.retired = self.retired, set()
+        for index in retired:
+            try:
+                self._lock_path(index).unlink()
+            except FileNotFoundError:
+                pass
+        try:
+            self.lock_dir.rmdir()
+        except OSError:
+            pass
@@ -0,0 +1,126 @@
+import threading
+from api_utils.AsyncCartApi import AsyncCartApi
+from api_utils.AsyncSearchApi import AsyncSearchApi
+from api_utils.AsyncTransport import AsyncTransport
+from api_utils.BaseApi import BaseApi
+from api_utils.CartApi import CartApi
+from api_utils.SearchApi import SearchApi
+from api_utils.Transport import Transport, get_transport
+from configuration.ConfigProvider import ConfigProvider
+from testdata.DataProvider import DataProvider
+
+
+class ApiClientFactory:
+    """
+    Фабрика API-клиентов на сессию тестов:
+    - URL эндпоинтов и заголовки формируются один раз,
+    - Клиенты BaseApi, CartApi, SearchApi (и асинхронные варианты)
+      используют общий транспорт и создаются один раз на токен,
+    - Токен можно переопределить для отдельного теста.
+    """
+    ENDPOINTS = ("track", "cart", "cart_short", "search", "for_data")
+
+    def __init__(self, base_url: str, endpoints: dict, token: str,
+                 user_agent: str, content_type: str,
+                 transport: Transport = None,
+                 async_transport: AsyncTransport = None) -> None:
+        """
+        Инициализация фабрики.
+            base_url: str - базовый URL API,
+            endpoints: dict - {имя эндпоинта: путь} из секции [api],
+            token, user_agent, content_type: str - данные для заголовков,
+            transport: Transport - общий транспорт
+                       (по умолчанию - общий пул соединений),
+            async_transport: AsyncTransport - транспорт асинхронных
+                             клиентов (создается при первом обращении).
+        """
+        self.base_url = base_url
+        self.urls = {name: base_url + path
+                     for name, path in endpoints.items()}
+        self.token = token
+        self.user_agent = user_agent
+        self.content_type = content_type
+        self.transport = transport or get_transport()
+        self.async_transport = async_transport
+        self._headers = {}
+        self._clients = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, base_url: str = None,
+                    transport: Transport = None) -> "ApiClientFactory":
+        """
+        Создает фабрику по test_config.ini и test_data.json.
+            base_url: str - базовый URL API (по умолчанию - из [api]).
+        """
+        config = ConfigProvider()
+        data = DataProvider()
+        endpoints = {name: config.get("api", name)
+                     for name in cls.ENDPOINTS}
+        return cls(base_url or config.get("api", "base_url"), endpoints,
+                   data.get_token(), data.get_user_agent(),
+                   data.get_content_type(), transport)
+
+    def headers(self, token: str = None) -> dict:
+        """
+        Заголовки для авторизации (общий словарь на токен -
+        не изменять).
+        """
+        token = token or self.token
+        headers = self._headers.get(token)
+        if headers is None:
+            headers = self._headers.setdefault(token, {
+                'Authorization': token,
+                'user-agent': self.user_agent,
+                'Content-Type': self.content_type
+            })
+        return headers
+
+    def _client(self, kind: str, token: str, build):
+        key = (kind, token or self.token)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = self._clients[key] = build(
+                        self.headers(token))
+        return client
+
+    def base(self, token: str = None) -> BaseApi:
+        return self._client("base", token, lambda headers: BaseApi(
+            self.base_url, self.urls["track"], headers, self.transport))
+
+    def cart(self, token: str = None) -> CartApi:
+        return self._client("cart", token, lambda headers: CartApi(
+            self.urls["cart"], self.urls["cart_short"], headers,
+            self.transport))
+
+    def search(self, token: str = None) -> SearchApi:
+        return self._client("search", token, lambda headers: SearchApi(
+            self.urls["search"], headers, self.transport))
+
+    def _async_transport(self) -> AsyncTransport:
+        with self._lock:
+            if self.async_transport is None:
+                self.async_transport = AsyncTransport(self.transport)
+        return self.async_transport
+
+    def cart_async(self, token: str = None) -> AsyncCartApi:
+        transport = self._async_transport()
+        return self._client("cart_async", token, lambda headers:
+                            AsyncCartApi(self.urls["cart"],
+                                         self.urls["cart_short"],
+                                         headers, transport))
+
+    def search_async(self, token: str = None) -> AsyncSearchApi:
+        transport = self._async_transport()
+        return self._client("search_async", token, lambda headers:
+                            AsyncSearchApi(self.urls["search"], headers,
+                                           transport))
+
+    def close(self) -> None:
+        """Закрывает асинхронный транспорт, если он создавался."""
+        if self.async_transport is not None:
+            self.async_transport.close()
+            self.async_transport = None
@@ -0,0 +1,104 @@
+import json
+import requests
+from api_utils.Schema import validate
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ApiResponse:
+    """
+    Компактный ответ API-клиентов вместо requests.Response:
+    - Тело ответа разбирается один раз и только при первом обращении,
+    - Для разбора используется orjson, если он установлен,
+    - Типизированные доступы к данным корзины и поиска.
+    """
+    __slots__ = ("status_code", "reason", "url", "headers", "elapsed",
+                 "content", "encoding", "_data")
+
+    _EMPTY = object()
+
+    def __init__(self, status_code: int, content: bytes, headers=None,
+                 url: str = "", reason: str = "", elapsed=None,
+                 encoding: str = None) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers if headers is not None else {}
+        self.url = url
+        self.reason = reason
+        self.elapsed = elapsed
+        self.encoding = encoding
+        self._data = self._EMPTY
+
+    @classmethod
+    def from_response(cls, response: requests.Response,
+                      schema: str = None) -> "ApiResponse":
+        """
+        Создает ответ из requests.Response, сохраняя только нужные поля.
+            schema: str - имя эндпоинта для проверки успешного ответа
+                    по схеме (см. Schema.SCHEMAS); тело разбирается
+                    один раз и используется повторно.
+        """
+        api_response = cls(response.status_code, response.content,
+                           response.headers, response.url, response.reason,
+                           response.elapsed, response.encoding)
+        if schema is not None and api_response.ok and api_response.content:
+            validate(schema, api_response.json())
+        return api_response
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", "replace")
+
+    def json(self):
+        """
+        Возвращает разобранное тело ответа (разбор выполняется один раз).
+        В случае некорректного JSON выбрасывается исключение ValueError.
+        """
+        if self._data is self._EMPTY:
+            if orjson is not None:
+                self._data = orjson.loads(self.content)
+            else:
+                self._data = json.loads(self.content)
+        return self._data
+
+    # доступы к данным корзины
+    @property
+    def products(self) -> list:
+        """Товары корзины из ответа cart_info: ['products']."""
+        return self.json()["products"]
+
+    @property
+    def quantity(self) -> int:
+        """Количество товаров из ответа cart_short: ['data']['quantity']."""
+        return self.json()["data"]["quantity"]
+
+    # доступы к данным поиска
+    @property
+    def included(self) -> list:
+        """Найденные товары из ответа поиска: ['included']."""
+        return self.json()["included"]
+
+    @property
+    def titles(self) -> list:
+        """Наименования найденных товаров из ответа поиска."""
+        return [item["attributes"]["title"] for item in self.included]
+
+    # пагинация поиска и каталога
+    @property
+    def total_pages(self):
+        """
+        Количество страниц из ['meta']['pagination'] (totalPages или
+        total_pages). Если пагинации в ответе нет, возвращает None.
+        """
+        pagination = self.json().get("meta", {}).get("pagination", {})
+        return pagination.get("totalPages", pagination.get("total_pages"))
+
+    def __repr__(self) -> str:
+        return f"<ApiResponse [{self.status_code}]>"
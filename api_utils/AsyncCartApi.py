@@ -0,0 +1,63 @@
+from api_utils.ApiResponse import ApiResponse
+from api_utils.AsyncTransport import AsyncTransport
+
+
+class AsyncCartApi:
+    """
+    Асинхронный вариант 'CartApi': те же методы работы с корзиной,
+    выполняемые как корутины поверх общего пула соединений.
+    - Очистка корзины товаров,
+    - Получение кратких данных о составе корзины,
+    - Получение информации о содержимом корзины,
+    - Добавление товара в корзину по артикулу (id),
+    - Удаление товара из корзины по id,
+    - Изменение количества единиц товара.
+    """
+
+    def __init__(self, cart_url: str, cart_short_url: str,
+                 params: dict, transport: AsyncTransport) -> None:
+        """
+        Инициализация метода 'AsyncCartApi'.
+        cart_url: str - основной URL для работы с корзиной,
+        cart_short_url: str - URL для получения краткой информации
+                        о содержимом корзины,
+        params: dict - заголовки с данными для авторизации,
+        transport: AsyncTransport - асинхронный транспорт.
+        """
+        self.cart_url = cart_url
+        self.cart_short_url = cart_short_url
+        self.params = params
+        self.transport = transport
+
+    async def cart_delete_all(self) -> ApiResponse:
+        path = self.cart_url
+        resp = await self.transport.delete(path, headers=self.params)
+        return ApiResponse.from_response(resp)
+
+    async def cart_short(self) -> ApiResponse:
+        path = self.cart_short_url
+        resp = await self.transport.get(path, headers=self.params)
+        return ApiResponse.from_response(resp, "cart_short")
+
+    async def cart_info(self) -> ApiResponse:
+        path = self.cart_url
+        resp = await self.transport.get(path, headers=self.params)
+        return ApiResponse.from_response(resp, "cart")
+
+    async def add_to_cart(self, add_id: dict) -> ApiResponse:
+        path = self.cart_url + "/product"
+        resp = await self.transport.post(
+            path, headers=self.params, json=add_id)
+        return ApiResponse.from_response(resp)
+
+    async def del_from_cart(self, del_id: str) -> ApiResponse:
+        path = self.cart_url + "/product/" + del_id
+        resp = await self.transport.delete(path, headers=self.params)
+        return ApiResponse.from_response(resp)
+
+    async def change_product_quantity(self,
+                                      quantity_id: list) -> ApiResponse:
+        path = self.cart_url
+        resp = await self.transport.put(
+            path, headers=self.params, json=quantity_id)
+        return ApiResponse.from_response(resp, "cart")
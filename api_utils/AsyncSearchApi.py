@@ -0,0 +1,29 @@
+from api_utils.ApiResponse import ApiResponse
+from api_utils.AsyncTransport import AsyncTransport
+from api_utils.SearchApi import SearchApi
+
+
+class AsyncSearchApi:
+    """
+    Асинхронный вариант 'SearchApi': поиск товара как корутина
+    поверх общего пула соединений.
+    """
+
+    def __init__(self, search_url: str, params: dict,
+                 transport: AsyncTransport) -> None:
+        """
+        Инициализация метода 'AsyncSearchApi'.
+            search_url: str - основной URL для работы с поиском,
+            params: dict - заголовки с данными для авторизации,
+            transport: AsyncTransport - асинхронный транспорт.
+        """
+        self.search_url = search_url
+        self.params = params
+        self.transport = transport
+
+    text_conversion = SearchApi.text_conversion
+
+    async def search_by_phrase(self, parameters: str) -> ApiResponse:
+        path = self.search_url
+        return ApiResponse.from_response(await self.transport.get(
+            path, headers=self.params, params=parameters), "search")
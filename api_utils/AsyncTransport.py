@@ -0,0 +1,91 @@
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from api_utils.Transport import Transport, get_transport
+from configuration.ConfigProvider import ConfigProvider
+
+
+class AsyncTransport:
+    """
+    Асинхронная обертка над общим транспортом:
+    - Запросы выполняются как корутины поверх того же пула соединений
+      (в потоках ThreadPoolExecutor, а не в асинхронном пуле),
+    - Число одновременных запросов ограничено настройкой concurrency
+      секции [api] и размером пула соединений pool_maxsize: при
+      pool_maxsize=10 - не более 10 запросов одновременно.
+    """
+
+    def __init__(self, transport: Transport = None,
+                 max_workers: int = None) -> None:
+        """
+        Инициализация асинхронного транспорта.
+            transport: Transport - транспорт с пулом соединений
+                       (по умолчанию - общий пул соединений),
+            max_workers: int - число потоков для выполнения запросов
+                         (по умолчанию - concurrency секции [api]);
+                         не больше размера пула соединений на хост -
+                         лишние потоки ждали бы свободного соединения.
+        """
+        self.transport = transport or get_transport()
+        if max_workers is None:
+            max_workers = ConfigProvider().getint("api", "concurrency") or \
+                self.transport.pool_maxsize
+        max_workers = max(min(max_workers, self.transport.pool_maxsize), 1)
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="async-api")
+
+    async def request(self, method: str, url: str,
+                      **kwargs) -> requests.Response:
+        """
+        Выполняет HTTP-запрос, не блокируя цикл событий.
+        """
+        loop = asyncio.get_running_loop()
+        call = functools.partial(
+            self.transport.request, method, url, **kwargs)
+        return await loop.run_in_executor(self.executor, call)
+
+    async def get(self, url: str, **kwargs) -> requests.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> requests.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def put(self, url: str, **kwargs) -> requests.Response:
+        return await self.request("PUT", url, **kwargs)
+
+    async def delete(self, url: str, **kwargs) -> requests.Response:
+        return await self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+
+
+async def gather_limited(factories: list, limit: int = 10,
+                         return_exceptions: bool = False) -> list:
+    """
+    Запускает корутины одновременно, но не более 'limit' за раз.
+        factories: list - функции без аргументов, возвращающие корутину
+                   (например, lambda: api.search_by_phrase(param)),
+        limit: int - максимальное число одновременных запросов,
+        return_exceptions: bool - вернуть исключения в списке результатов
+                           вместо их проброса.
+        return: list - результаты в порядке переданных функций.
+    """
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(factory):
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(run(factory) for factory in factories),
+                                return_exceptions=return_exceptions)
+
+
+def run_concurrently(factories: list, limit: int = 10,
+                     return_exceptions: bool = False) -> list:
+    """
+    Синхронная точка входа для gather_limited - для вызова из тестов.
+    """
+    return asyncio.run(
+        gather_limited(factories, limit, return_exceptions))
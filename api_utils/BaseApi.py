@@ -1,5 +1,5 @@
-import requests
 import allure
+from api_utils.Transport import Transport, get_transport
 
 
 class BaseApi:
@@ -10,7 +10,8 @@ class BaseApi:
     """
     @allure.step("""BaseApi. URL:{base_url}, {track_url},
                  параметры для авторизации: {params}""")
-    def __init__(self, base_url: str, track_url: str, params: dict) -> None:
+    def __init__(self, base_url: str, track_url: str, params: dict,
+                 transport: Transport = None) -> None:
         """
         Инициализация метода 'BaseApi'.
         Определяет сущность класса 'BaseApi' и формирует
@@ -21,15 +22,18 @@ class BaseApi:
                         содержит ключи:
                         - token: str,
                         - user_agent: str,
-                        - content_type: str.
+                        - content_type: str,
+        transport: Transport - общий транспорт для запросов
+                        (по умолчанию - общий пул соединений).
         """
         self.base_url = base_url
         self.track_url = track_url
         self.params = params
+        self.transport = transport or get_transport()
 
     @allure.step("Получить текущий URL вида https://www.chitai-gorod.ru...")
     def current_url(self) -> str:
         path = self.track_url
-        resp = requests.get(path, headers=self.params)
-        current_url = resp['requestUri']
+        resp = self.transport.get(path, headers=self.params)
+        current_url = resp.json()['requestUri']
         return current_url
@@ -1,5 +1,7 @@
-import requests
 import allure
+from concurrent.futures import ThreadPoolExecutor
+from api_utils.ApiResponse import ApiResponse
+from api_utils.Transport import Transport, get_transport
 
 
 class CartApi:
@@ -10,12 +12,15 @@ class CartApi:
     - Получение кратких данных о составе корзины,
     - Получение информации о содержимом корзины,
     - Добавление товара в корзину по артикулу (id)б
-    - Удаление товара из корзины по id.
+    - Удаление товара из корзины по id,
+    - Проверка, что корзина пуста,
+    - Пакетные операции: добавление, изменение количества и удаление
+      множества товаров.
     """
     @allure.step("""CartApi. URL:{cart_url}, {cart_short_url},
                  параметры для авторизации: {params}""")
     def __init__(self, cart_url: str, cart_short_url: str,
-                 params: dict) -> None:
+                 params: dict, transport: Transport = None) -> None:
         """
         Инициализация метода 'CartApi'.
         Определяет сущность класса 'CartApi' и формирует
@@ -27,44 +32,144 @@ class CartApi:
                         содержит ключи:
                         - token: str,
                         - user_agent: str,
-                        - content_type: str.
+                        - content_type: str,
+        transport: Transport - общий транспорт для запросов
+                        (по умолчанию - общий пул соединений).
         """
         self.cart_url = cart_url
         self.cart_short_url = cart_short_url
         self.params = params
+        self.transport = transport or get_transport()
 
     @allure.step("Очистить корзину товаров")
-    def cart_delete_all(self) -> dict:
+    def cart_delete_all(self) -> ApiResponse:
         path = self.cart_url
-        resp = requests.delete(path, headers=self.params)
-        return resp
+        resp = self.transport.delete(path, headers=self.params)
+        return ApiResponse.from_response(resp)
 
     @allure.step("Получить краткие данные о составе корзины")
-    def cart_short(self) -> dict:
+    def cart_short(self) -> ApiResponse:
         path = self.cart_short_url
-        resp = requests.get(path, headers=self.params)
-        return resp
+        resp = self.transport.get(path, headers=self.params)
+        return ApiResponse.from_response(resp, "cart_short")
 
     @allure.step("Получить полную информацию о содержимом корзины")
-    def cart_info(self) -> dict:
+    def cart_info(self) -> ApiResponse:
         path = self.cart_url
-        resp = requests.get(path, headers=self.params)
-        return resp
+        resp = self.transport.get(path, headers=self.params)
+        return ApiResponse.from_response(resp, "cart")
+
+    @allure.step("Проверить, что корзина пуста (при необходимости очистить)")
+    def ensure_empty(self) -> bool:
+        """
+        Проверяет состояние корзины по краткой информации; непустую
+        корзину очищает и проверяет повторно.
+            return: bool - корзина пуста.
+        """
+        short = self.cart_short()
+        if short.ok and not short.quantity:
+            return True
+        self.cart_delete_all()
+        short = self.cart_short()
+        return short.ok and not short.quantity
 
     @allure.step("Добавить в корзину товар по артикулу: {add_id}.")
-    def add_to_cart(self, add_id: dict) -> dict:
+    def add_to_cart(self, add_id: dict) -> ApiResponse:
         path = self.cart_url + "/product"
-        resp = requests.post(path, headers=self.params, json=add_id)
-        return resp
+        resp = self.transport.post(path, headers=self.params, json=add_id)
+        return ApiResponse.from_response(resp)
 
     @allure.step("Удалить из корзины товар по id: {del_id}.")
-    def del_from_cart(self, del_id: str) -> dict:
+    def del_from_cart(self, del_id: str) -> ApiResponse:
         path = self.cart_url + "/product/" + del_id
-        resp = requests.delete(path, headers=self.params)
-        return resp
+        resp = self.transport.delete(path, headers=self.params)
+        return ApiResponse.from_response(resp)
 
     @allure.step("Изменить количество единиц товара: {quantity_id}.")
-    def change_product_quantity(self, quantity_id: dict) -> dict:
+    def change_product_quantity(self, quantity_id: dict) -> ApiResponse:
+        path = self.cart_url
+        resp = self.transport.put(path, headers=self.params, json=quantity_id)
+        return ApiResponse.from_response(resp, "cart")
+
+    @allure.step("Добавить в корзину товары по артикулам: {add_ids}.")
+    def add_many(self, add_ids: list) -> list:
+        """
+        Добавляет в корзину множество товаров.
+        API принимает только один товар за запрос, поэтому запросы
+        выполняются одновременно поверх общего пула соединений.
+            add_ids: list - артикулы (id) товаров,
+            return: list - результат по каждому товару (см. _item_result).
+        """
+        path = self.cart_url + "/product"
+        return self._run_many(
+            add_ids, lambda add_id: self.transport.post(
+                path, headers=self.params, json={"id": add_id}))
+
+    @allure.step("Изменить количество единиц товаров: {quantities}.")
+    def set_quantities(self, quantities: dict,
+                       chunk_size: int = 100) -> list:
+        """
+        Изменяет количество единиц множества товаров пакетными
+        PUT-запросами (по 'chunk_size' товаров в запросе).
+            quantities: dict - словарь {id товара в корзине: количество},
+            chunk_size: int - количество товаров в одном запросе,
+            return: list - результат по каждому товару (см. _item_result).
+        """
+        items = [{"id": product_id, "quantity": quantity}
+                 for product_id, quantity in quantities.items()]
+        chunks = [items[i:i + chunk_size]
+                  for i in range(0, len(items), chunk_size)]
         path = self.cart_url
-        resp = requests.put(path, headers=self.params, json=quantity_id)
-        return resp
+        chunk_results = self._run_many(
+            chunks, lambda chunk: self.transport.put(
+                path, headers=self.params, json=chunk))
+        results = []
+        for chunk, chunk_result in zip(chunks, chunk_results):
+            for item in chunk:
+                results.append(dict(chunk_result, id=item["id"]))
+        return results
+
+    @allure.step("Удалить из корзины товары по id: {del_ids}.")
+    def remove_many(self, del_ids: list) -> list:
+        """
+        Удаляет из корзины множество товаров одновременными запросами.
+            del_ids: list - id товаров в корзине,
+            return: list - результат по каждому товару (см. _item_result).
+        """
+        path = self.cart_url + "/product/"
+        return self._run_many(
+            del_ids, lambda del_id: self.transport.delete(
+                path + str(del_id), headers=self.params))
+
+    def _run_many(self, items: list, send) -> list:
+        """
+        Выполняет запрос 'send' для каждого элемента одновременно,
+        не более размера пула соединений за раз.
+            return: list - результаты в порядке элементов 'items'.
+        """
+        if not items:
+            return []
+        workers = min(len(items), self.transport.pool_maxsize)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(send, item) for item in items]
+            return [self._item_result(item, future)
+                    for item, future in zip(items, futures)]
+
+    @staticmethod
+    def _item_result(item, future) -> dict:
+        """
+        Формирует результат по одному элементу пакетной операции:
+            id - элемент запроса,
+            ok: bool - запрос выполнен успешно (Status Code 2xx),
+            status_code: int | None - код ответа,
+            response - ответ API (или None при ошибке соединения),
+            error: Exception | None - ошибка соединения.
+        """
+        try:
+            response = ApiResponse.from_response(future.result())
+        except Exception as e:
+            return {"id": item, "ok": False, "status_code": None,
+                    "response": None, "error": e}
+        return {"id": item, "ok": 200 <= response.status_code < 300,
+                "status_code": response.status_code,
+                "response": response, "error": None}
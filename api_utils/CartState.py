@@ -0,0 +1,161 @@
+import allure
+from api_utils.ApiResponse import ApiResponse
+from api_utils.CartApi import CartApi
+
+
+class CartModel:
+    """
+    Локальная модель корзины: {артикул товара (goodsId):
+    {"id": id товара в корзине или None, "quantity": количество}}.
+    known = False - состояние корзины неизвестно (нужно перечитать).
+    """
+
+    def __init__(self, items: dict = None, known: bool = True) -> None:
+        self.items = items or {}
+        self.known = known
+
+    @classmethod
+    def from_products(cls, products: list) -> "CartModel":
+        """Модель по списку товаров ответа cart_info."""
+        return cls({item["goodsId"]: {"id": item["id"],
+                                      "quantity": item["quantity"]}
+                    for item in products})
+
+    def copy(self) -> "CartModel":
+        return CartModel({goods_id: dict(item)
+                          for goods_id, item in self.items.items()},
+                         self.known)
+
+    def count(self) -> int:
+        """Количество позиций (разных товаров) в корзине."""
+        return len(self.items)
+
+    def quantities(self) -> dict:
+        return {goods_id: item["quantity"]
+                for goods_id, item in self.items.items()}
+
+
+class TrackedCart:
+    """
+    Клиент корзины с локальной моделью состояния:
+    - Операции CartApi выполняются через TrackedCart и обновляют модель
+      без дополнительных запросов,
+    - Ответы cart_info и изменения количества синхронизируют модель,
+    - restore возвращает корзину к снимку минимальным набором запросов.
+    """
+
+    def __init__(self, cart: CartApi, model: CartModel = None) -> None:
+        """
+        Инициализация.
+            cart: CartApi - клиент корзины,
+            model: CartModel - известное состояние корзины
+                   (None - состояние будет прочитано cart_info).
+        """
+        self.cart = cart
+        self.model = model if model is not None else CartModel(known=False)
+
+    def _sync(self, response: ApiResponse) -> ApiResponse:
+        if response.ok:
+            self.model = CartModel.from_products(response.products)
+        else:
+            self.model.known = False
+        return response
+
+    def _unknown_on_error(self, response: ApiResponse) -> bool:
+        """
+        Ошибки 4xx не меняют корзину; после 5xx состояние неизвестно.
+            return: bool - запрос выполнен успешно.
+        """
+        if response.status_code >= 500:
+            self.model.known = False
+        return response.ok
+
+    def refresh(self) -> CartModel:
+        """Читает корзину, если ее состояние неизвестно."""
+        if not self.model.known:
+            self._sync(self.cart.cart_info())
+        return self.model
+
+    def snapshot(self) -> CartModel:
+        """Снимок текущего состояния корзины."""
+        return self.refresh().copy()
+
+    def info(self) -> ApiResponse:
+        return self._sync(self.cart.cart_info())
+
+    def short(self) -> ApiResponse:
+        return self.cart.cart_short()
+
+    def add(self, goods_id) -> ApiResponse:
+        response = self.cart.add_to_cart({"id": goods_id})
+        if self._unknown_on_error(response):
+            item = self.model.items.setdefault(
+                goods_id, {"id": None, "quantity": 0})
+            item["quantity"] += 1
+        return response
+
+    def remove(self, item_id) -> ApiResponse:
+        response = self.cart.del_from_cart(str(item_id))
+        if self._unknown_on_error(response):
+            self.model.items = {
+                goods_id: item
+                for goods_id, item in self.model.items.items()
+                if str(item["id"]) != str(item_id)}
+        return response
+
+    def change_quantity(self, items: list) -> ApiResponse:
+        response = self.cart.change_product_quantity(items)
+        if response.ok and "products" in (response.json() or {}):
+            return self._sync(response)
+        self.model.known = False
+        return response
+
+    def clear(self) -> ApiResponse:
+        response = self.cart.cart_delete_all()
+        if self._unknown_on_error(response):
+            self.model = CartModel()
+        return response
+
+    @allure.step("Восстановить состояние корзины по снимку")
+    def restore(self, snapshot: CartModel) -> None:
+        """
+        Возвращает корзину к снимку минимальным набором запросов:
+        - Без запросов, если модель совпадает со снимком,
+        - Одна очистка, если снимок пуст,
+        - Иначе удаление лишних товаров, добавление недостающих
+          и одно пакетное изменение количества.
+        """
+        current = self.model.quantities() if self.model.known else None
+        target = snapshot.quantities()
+        if current == target:
+            return
+        if not target:
+            self.clear()
+            return
+        if not self.model.known or any(
+                item["id"] is None for item in self.model.items.values()):
+            self.info()
+        current = self.model.quantities()
+        extra = [self.model.items[goods_id]["id"]
+                 for goods_id in current if goods_id not in target]
+        missing = [goods_id for goods_id in target
+                   if goods_id not in current]
+        results = []
+        if extra:
+            results += self.cart.remove_many(extra)
+        if missing:
+            results += self.cart.add_many(missing)
+            # id новых товаров в корзине известны только после чтения
+            self.info()
+        changes = {item["id"]: target[goods_id]
+                   for goods_id, item in self.model.items.items()
+                   if goods_id in target and
+                   item["quantity"] != target[goods_id]}
+        if changes:
+            results += self.cart.set_quantities(changes)
+        ids = {goods_id: item["id"]
+               for goods_id, item in self.model.items.items()}
+        self.model = CartModel({goods_id: {"id": ids.get(goods_id),
+                                           "quantity": quantity}
+                                for goods_id, quantity in target.items()},
+                               known=all(result["ok"] for result in results))
@@ -0,0 +1,183 @@
+import base64
+import hashlib
+import json
+import mmap
+import os
+import threading
+from urllib.parse import parse_qsl, urlencode, urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+class CassetteMiss(LookupError):
+    """Запрос не найден в кассете в режиме воспроизведения."""
+
+
+class Cassette:
+    """
+    Кассета HTTP-обменов для режимов записи и воспроизведения:
+    - record - ответы сохраняются в файл (по строке на обмен),
+    - replay - ответы выдаются из файла без обращения к сети.
+    Запросы индексируются по ключу: метод + путь относительно базового
+    URL API (без схемы, хоста и порта) + отсортированные параметры +
+    хэш тела запроса - кассета воспроизводится на любом адресе API
+    (например, на стенде со случайным портом). Один и тот же ключ
+    воспроизводится в порядке записи (последний ответ повторяется).
+    """
+    MODES = ("off", "record", "replay")
+
+    def __init__(self, path: str, mode: str, base_url: str = None) -> None:
+        """
+        Инициализация кассеты.
+            path: str - путь к файлу кассеты,
+            mode: str - режим работы: 'record' или 'replay',
+            base_url: str - базовый URL API: путь запроса в ключе
+                      берется относительно него.
+        """
+        if mode not in ("record", "replay"):
+            raise ValueError(f"Неизвестный режим кассеты: '{mode}'")
+        self.path = path
+        self.mode = mode
+        self.base_url = base_url
+        self._lock = threading.Lock()
+        self._records = []
+        self._index = None
+        self._cursors = {}
+        self._mmap = None
+        self._file = None
+
+    @staticmethod
+    def make_key(method: str, url: str, params=None, body=None,
+                 base_url: str = None) -> str:
+        """
+        Формирует ключ запроса: метод, путь URL без схемы и хоста
+        (относительно пути base_url, если запрос к нему относится),
+        отсортированные параметры запроса и sha1 тела запроса.
+            params: str | dict | None - параметры запроса,
+            body: bytes | None - тело запроса,
+            base_url: str - базовый URL API.
+        """
+        parts = urlsplit(url)
+        path = parts.path
+        if base_url:
+            base_path = urlsplit(base_url).path.rstrip("/")
+            if base_path and (path == base_path or
+                              path.startswith(base_path + "/")):
+                path = path[len(base_path):] or "/"
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if isinstance(params, str):
+            query += parse_qsl(params, keep_blank_values=True)
+        elif params:
+            query += [(str(k), str(v)) for k, v in dict(params).items()]
+        body_hash = hashlib.sha1(body or b"").hexdigest()[:16]
+        return (f"{method.upper()} {path}?{urlencode(sorted(query))} "
+                f"{body_hash}")
+
+    def key(self, method: str, url: str, params=None, body=None) -> str:
+        """Ключ запроса относительно базового URL кассеты."""
+        return self.make_key(method, url, params, body, self.base_url)
+
+    @staticmethod
+    def request_body(kwargs: dict) -> bytes:
+        """Тело запроса из аргументов requests в нормализованном виде."""
+        if kwargs.get("json") is not None:
+            return json.dumps(kwargs["json"], sort_keys=True,
+                              ensure_ascii=False).encode("utf-8")
+        data = kwargs.get("data")
+        if isinstance(data, str):
+            return data.encode("utf-8")
+        return data or b""
+
+    def record(self, key: str, response: requests.Response) -> None:
+        """Запоминает ответ для записи в файл при закрытии кассеты."""
+        entry = {
+            "status": response.status_code,
+            "reason": response.reason,
+            "url": response.url,
+            "encoding": response.encoding,
+            "headers": {"Content-Type":
+                        response.headers.get("Content-Type", "")},
+        }
+        try:
+            entry["text"] = response.content.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["b64"] = base64.b64encode(response.content).decode("ascii")
+        line = "\t".join(
+            [key, json.dumps(entry, separators=(",", ":"),
+                             ensure_ascii=False)])
+        with self._lock:
+            self._records.append(line)
+
+    def play(self, key: str) -> requests.Response:
+        """
+        Возвращает записанный ответ по ключу.
+        В случае отсутствия ключа выбрасывается исключение CassetteMiss.
+        """
+        with self._lock:
+            if self._index is None:
+                self._load_index()
+            offsets = self._index.get(key)
+            if not offsets:
+                raise CassetteMiss(
+                    f"Запрос '{key}' не найден в кассете {self.path}")
+            position = self._cursors.get(key, 0)
+            self._cursors[key] = position + 1
+            start, end = offsets[min(position, len(offsets) - 1)]
+            line = self._mmap[start:end].decode("utf-8")
+        entry = json.loads(line.split("\t", 1)[1])
+        return self._build_response(entry)
+
+    def _load_index(self) -> None:
+        """
+        Отображает файл кассеты в память и строит индекс
+        ключ -> смещения строк, не разбирая JSON ответов.
+        """
+        self._index = {}
+        if not os.path.exists(self.path) or not os.path.getsize(self.path):
+            return
+        self._file = open(self.path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+        start = 0
+        size = len(self._mmap)
+        while start < size:
+            end = self._mmap.find(b"\n", start)
+            if end == -1:
+                end = size
+            tab = self._mmap.find(b"\t", start, end)
+            if tab != -1:
+                key = self._mmap[start:tab].decode("utf-8")
+                self._index.setdefault(key, []).append((start, end))
+            start = end + 1
+
+    @staticmethod
+    def _build_response(entry: dict) -> requests.Response:
+        response = requests.Response()
+        response.status_code = entry["status"]
+        response.reason = entry["reason"]
+        response.url = entry["url"]
+        response.headers = CaseInsensitiveDict(entry["headers"])
+        if "text" in entry:
+            response._content = entry["text"].encode("utf-8")
+        else:
+            response._content = base64.b64decode(entry["b64"])
+        response._content_consumed = True
+        response.encoding = entry.get("encoding")
+        return response
+
+    def close(self) -> None:
+        """
+        Сохраняет записанные обмены (режим record) и освобождает файл.
+        """
+        with self._lock:
+            if self.mode == "record" and self._records:
+                os.makedirs(os.path.dirname(self.path) or ".",
+                            exist_ok=True)
+                with open(self.path, "w", encoding="utf-8") as file:
+                    file.write("\n".join(self._records) + "\n")
+                self._records = []
+            if self._mmap is not None:
+                self._mmap.close()
+                self._file.close()
+                self._mmap = None
+                self._file = None
@@ -0,0 +1,100 @@
+import threading
+
+
+class Histogram:
+    """
+    Гистограмма задержек в стиле HDR Histogram:
+    логарифмически-линейные корзины с фиксированной относительной
+    точностью, память не зависит от количества замеров.
+    - Запись значения,
+    - Перцентили (p50/p95/p99 и любые другие),
+    - Объединение гистограмм,
+    - Выгрузка в словарь для JSON.
+    """
+
+    def __init__(self, precision_bits: int = 7) -> None:
+        """
+        Инициализация гистограммы.
+            precision_bits: int - число значащих бит значения
+                            (7 бит - относительная погрешность < 1%).
+        """
+        self.precision_bits = precision_bits
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self._lock = threading.Lock()
+
+    def _bucket(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.precision_bits)
+        return (value >> shift) << shift
+
+    def record(self, value: float) -> None:
+        """
+        Записывает значение (целое, например, задержку в микросекундах).
+        """
+        value = max(int(value), 0)
+        bucket = self._bucket(value)
+        with self._lock:
+            self.counts[bucket] = self.counts.get(bucket, 0) + 1
+            self.count += 1
+            self.total += value
+            self.min = value if self.min is None else min(self.min, value)
+            self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other: "Histogram") -> None:
+        """Добавляет к гистограмме значения другой гистограммы."""
+        with self._lock:
+            for bucket, count in other.counts.items():
+                self.counts[bucket] = self.counts.get(bucket, 0) + count
+            self.count += other.count
+            self.total += other.total
+            if other.count:
+                self.min = other.min if self.min is None else min(
+                    self.min, other.min)
+                self.max = other.max if self.max is None else max(
+                    self.max, other.max)
+
+    def percentile(self, percent: float) -> int:
+        """
+        Возвращает значение, не превышаемое 'percent' процентами замеров
+        (с точностью до ширины корзины).
+        """
+        with self._lock:
+            if not self.count:
+                return 0
+            threshold = max(1, round(self.count * percent / 100))
+            seen = 0
+            for bucket in sorted(self.counts):
+                seen += self.counts[bucket]
+                if seen >= threshold:
+                    return min(self._upper(bucket), self.max)
+            return self.max
+
+    def _upper(self, bucket: int) -> int:
+        shift = max(0, bucket.bit_length() - self.precision_bits)
+        return bucket + (1 << shift) - 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self, scale: float = 1.0) -> dict:
+        """
+        Сводка гистограммы для выгрузки в JSON.
+            scale: float - множитель для значений (например, 0.001 для
+                   перевода микросекунд в миллисекунды).
+        """
+        return {
+            "count": self.count,
+            "total": self.total * scale,
+            "min": (self.min or 0) * scale,
+            "mean": round(self.mean * scale, 3),
+            "p50": self.percentile(50) * scale,
+            "p95": self.percentile(95) * scale,
+            "p99": self.percentile(99) * scale,
+            "max": (self.max or 0) * scale,
+            "buckets": {str(bucket): count
+                        for bucket, count in sorted(self.counts.items())},
+        }
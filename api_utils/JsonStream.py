@@ -0,0 +1,147 @@
+import codecs
+import json
+import re
+
+_STRUCTURAL = re.compile(r'[{}\[\]",:]')
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r'[,\]\s]')
+_NOT_SEPARATOR = re.compile(r'[^\s,]')
+
+
+class _Reader:
+    """
+    Буфер поверх потока фрагментов текста: читает следующий фрагмент
+    только когда он нужен и отбрасывает уже разобранную часть.
+    """
+
+    def __init__(self, chunks) -> None:
+        self.chunks = iter(chunks)
+        self.decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+
+    def more(self) -> bool:
+        for chunk in self.chunks:
+            if isinstance(chunk, bytes):
+                chunk = self.decoder.decode(chunk)
+            if chunk:
+                self.buffer += chunk
+                return True
+        return False
+
+    def search(self, pattern: re.Pattern):
+        """Индекс следующего совпадения с 'pattern' или None в конце."""
+        while True:
+            match = pattern.search(self.buffer, self.pos)
+            if match is not None:
+                return match.start()
+            if not self.more():
+                return None
+
+    def string_end(self) -> int:
+        """
+        Пропускает строку JSON (self.pos - после открывающей кавычки).
+        Возвращает индекс закрывающей кавычки.
+        """
+        while True:
+            index = self.search(_STRING_SPECIAL)
+            if index is None:
+                raise ValueError("Незавершенная строка JSON")
+            if self.buffer[index] == '"':
+                self.pos = index + 1
+                return index
+            self.pos = index + 2
+            while self.pos > len(self.buffer):
+                if not self.more():
+                    raise ValueError("Незавершенная строка JSON")
+
+    def compact(self) -> None:
+        """
+        Отбрасывает разобранную часть буфера, когда она превышает
+        половину буфера (копирование остается линейным).
+        """
+        if self.pos > 4096 and self.pos * 2 > len(self.buffer):
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+
+
+def iter_array_items(chunks, key: str, loads=json.loads):
+    """
+    Разбирает JSON-документ по мере чтения и возвращает генератор
+    элементов массива верхнего уровня по ключу 'key'
+    (например, 'included' в ответе поиска).
+    Память ограничена размером одного элемента: документ целиком
+    не загружается, чтение прекращается при остановке генератора.
+        chunks - итератор фрагментов документа (bytes или str),
+        key: str - ключ массива в объекте верхнего уровня,
+        loads - функция разбора одного элемента.
+    """
+    reader = _Reader(chunks)
+    depth = 0
+    expect_key = False
+    last_key = None
+    value_key = None
+
+    # поиск ключа в объекте верхнего уровня
+    while True:
+        index = reader.search(_STRUCTURAL)
+        if index is None:
+            return
+        char = reader.buffer[index]
+        reader.pos = index + 1
+        if char == '"':
+            end = reader.string_end()
+            if depth == 1 and expect_key:
+                last_key = json.loads(reader.buffer[index:end + 1])
+        elif char == ":":
+            if depth == 1:
+                expect_key = False
+                value_key = last_key
+        elif char == ",":
+            if depth == 1:
+                expect_key = True
+                value_key = None
+        elif char in "{[":
+            if depth == 1 and char == "[" and value_key == key:
+                reader.compact()
+                break
+            depth += 1
+            expect_key = depth == 1 and char == "{"
+        else:
+            depth -= 1
+        reader.compact()
+
+    # разбор элементов найденного массива
+    while True:
+        start = reader.search(_NOT_SEPARATOR)
+        if start is None:
+            raise ValueError(f"Незавершенный массив JSON '{key}'")
+        char = reader.buffer[start]
+        if char == "]":
+            return
+        reader.pos = start + 1
+        if char == '"':
+            end = reader.string_end() + 1
+        elif char in "{[":
+            nesting = 1
+            while nesting:
+                index = reader.search(_STRUCTURAL)
+                if index is None:
+                    raise ValueError(f"Незавершенный элемент '{key}'")
+                inner = reader.buffer[index]
+                reader.pos = index + 1
+                if inner == '"':
+                    reader.string_end()
+                elif inner in "{[":
+                    nesting += 1
+                elif inner in "}]":
+                    nesting -= 1
+            end = reader.pos
+        else:
+            end = reader.search(_SCALAR_END)
+            if end is None:
+                raise ValueError(f"Незавершенный элемент '{key}'")
+            reader.pos = end
+        item = loads(reader.buffer[start:end])
+        reader.compact()
+        yield item
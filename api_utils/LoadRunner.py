@@ -0,0 +1,297 @@
+import argparse
+import json
+import random
+import threading
+import time
+from api_utils import Scenarios
+from api_utils.ApiClientFactory import ApiClientFactory
+from api_utils.CartState import CartModel, TrackedCart
+from api_utils.Histogram import Histogram
+from api_utils.ProductCatalog import ProductCatalog
+from api_utils.SearchApi import SearchApi
+from api_utils.Transport import (Transport, close_transport,
+                                 endpoint_template, get_transport)
+from configuration.ConfigProvider import ConfigProvider
+from testdata.DataProvider import DataProvider
+
+
+class VirtualUser:
+    """
+    Виртуальный пользователь нагрузочного прогона:
+    собственные клиенты корзины (TrackedCart) и поиска поверх общего
+    транспорта и тестовые данные для сценариев.
+    cart_lock - блокировка корзины токена: пользователи с общим токеном
+    выполняют сценарии корзины по очереди.
+    """
+
+    def __init__(self, number: int, cart: TrackedCart,
+                 api_search: SearchApi, product_id: int,
+                 phrases: list, cart_lock: threading.Lock = None) -> None:
+        self.number = number
+        self.cart = cart
+        self.cart_lock = cart_lock or threading.Lock()
+        self.api_search = api_search
+        self.product_id = product_id
+        self.phrases = phrases
+        self.random = random.Random(number)
+
+
+def _cart_scenario(scenario):
+    """
+    Сценарий корзины под блокировкой корзины токена: одновременные
+    добавления и удаления в одной корзине искажали бы проверки.
+    """
+    def run(user: VirtualUser) -> None:
+        with user.cart_lock:
+            scenario(user.cart, user.product_id)
+    return run
+
+
+CART_SCENARIOS = ("cart", "cart_clear")
+SCENARIOS = {
+    "cart": _cart_scenario(Scenarios.cart_add_info_delete),
+    "cart_clear": _cart_scenario(Scenarios.cart_add_clear),
+    "search": lambda user: Scenarios.search_phrase(
+        user.api_search, user.random.choice(user.phrases)),
+}
+
+
+class Pacer:
+    """
+    Задает общий темп итераций для всех виртуальных пользователей:
+    не более 'rate' запусков сценариев в секунду (0 - без ограничения).
+    """
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1 / rate if rate else 0
+        self.next_slot = time.perf_counter()
+        self.lock = threading.Lock()
+
+    def wait(self, deadline: float) -> bool:
+        """
+        Ожидает очередной слот. Возвращает False, если слот
+        наступает позже окончания прогона.
+        """
+        if not self.interval:
+            return time.perf_counter() < deadline
+        with self.lock:
+            slot = max(self.next_slot, time.perf_counter())
+            self.next_slot = slot + self.interval
+        if slot >= deadline:
+            return False
+        delay = slot - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        return True
+
+
+class LoadRunner:
+    """
+    Нагрузочный прогон API-сценариев функциональных тестов:
+    - Заданное число виртуальных пользователей с плавным стартом,
+    - Общий целевой темп итераций,
+    - Пропускная способность и p50/p95/p99 задержек по эндпоинтам,
+    - Выгрузка результатов в JSON.
+    """
+
+    def __init__(self, users: list, scenarios: dict, rate: float = 0,
+                 ramp_up: float = 0, duration: float = 10,
+                 transport: Transport = None) -> None:
+        """
+        Инициализация прогона.
+            users: list - виртуальные пользователи (VirtualUser),
+            scenarios: dict - {имя сценария: вес} из SCENARIOS,
+            rate: float - целевое число итераций в секунду (0 - максимум),
+            ramp_up: float - время запуска всех пользователей (сек.),
+            duration: float - длительность прогона (сек.),
+            transport: Transport - транспорт клиентов пользователей,
+                       на нем измеряются задержки запросов.
+        """
+        self.users = users
+        self.scenario_names = list(scenarios)
+        self.weights = [scenarios[name] for name in self.scenario_names]
+        self.pacer = Pacer(rate)
+        self.ramp_up = ramp_up
+        self.duration = duration
+        self.transport = transport
+        self.lock = threading.Lock()
+        self.endpoints = {}
+        self.iterations = {}
+
+    def _stats(self, table: dict, name: str) -> dict:
+        with self.lock:
+            if name not in table:
+                table[name] = {"histogram": Histogram(), "errors": 0,
+                               "statuses": {}}
+            return table[name]
+
+    def observe(self, method: str, url: str, response,
+                elapsed: float) -> None:
+        """Наблюдатель транспорта: учитывает задержку запроса."""
+        stats = self._stats(self.endpoints, endpoint_template(method, url))
+        stats["histogram"].record(elapsed * 1_000_000)
+        status = str(response.status_code) if response is not None \
+            else "error"
+        with self.lock:
+            stats["statuses"][status] = stats["statuses"].get(status, 0) + 1
+            if response is None or response.status_code >= 400:
+                stats["errors"] += 1
+
+    def _user_loop(self, user: VirtualUser, start_delay: float,
+                   deadline: float) -> None:
+        time.sleep(start_delay)
+        while self.pacer.wait(deadline):
+            name = user.random.choices(self.scenario_names,
+                                       self.weights)[0]
+            stats = self._stats(self.iterations, name)
+            started = time.perf_counter()
+            try:
+                SCENARIOS[name](user)
+            except Exception:
+                with self.lock:
+                    stats["errors"] += 1
+            stats["histogram"].record(
+                (time.perf_counter() - started) * 1_000_000)
+
+    def run(self) -> dict:
+        """
+        Выполняет прогон и возвращает отчет (см. report).
+        """
+        self.transport.observers.append(self.observe)
+        started = time.perf_counter()
+        deadline = started + self.duration
+        step = self.ramp_up / len(self.users) if self.users else 0
+        threads = [threading.Thread(
+            target=self._user_loop, args=(user, number * step, deadline),
+            name=f"virtual-user-{number}", daemon=True)
+            for number, user in enumerate(self.users)]
+        try:
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            self.transport.observers.remove(self.observe)
+        return self.report(time.perf_counter() - started)
+
+    def report(self, elapsed: float) -> dict:
+        """
+        Отчет прогона: по каждому эндпоинту и сценарию - количество,
+        ошибки, пропускная способность (в секунду) и задержки (мс).
+        """
+        def summary(table: dict) -> dict:
+            result = {}
+            for name, stats in sorted(table.items()):
+                histogram = stats["histogram"]
+                result[name] = {
+                    "throughput": round(histogram.count / elapsed, 2),
+                    "errors": stats["errors"],
+                    "statuses": stats["statuses"],
+                    "latency_ms": histogram.to_dict(scale=0.001),
+                }
+            return result
+
+        return {
+            "users": len(self.users),
+            "duration": round(elapsed, 3),
+            "endpoints": summary(self.endpoints),
+            "scenarios": summary(self.iterations),
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Нагрузочный прогон API-сценариев тестов")
+    parser.add_argument("--users", type=int, default=10,
+                        help="количество виртуальных пользователей")
+    parser.add_argument("--rate", type=float, default=0,
+                        help="целевое число итераций в секунду (0 - max)")
+    parser.add_argument("--ramp-up", type=float, default=0,
+                        help="время запуска всех пользователей (сек.)")
+    parser.add_argument("--duration", type=float, default=10,
+                        help="длительность прогона (сек.)")
+    parser.add_argument("--scenario", action="append",
+                        help="сценарий с весом, например cart=1 search=3; "
+                             f"доступные: {', '.join(SCENARIOS)}")
+    parser.add_argument("--stand-in", action="store_true",
+                        help="запустить прогон на локальном стенде web-gate")
+    parser.add_argument("--output", default="load-results.json",
+                        help="файл для выгрузки результатов в JSON")
+    args = parser.parse_args()
+
+    scenarios = {}
+    for item in args.scenario or ["cart=1", "search=1"]:
+        name, _, weight = item.partition("=")
+        if name not in SCENARIOS:
+            parser.error(f"Неизвестный сценарий: '{name}'")
+        scenarios[name] = float(weight or 1)
+
+    config = ConfigProvider()
+    data = DataProvider()
+    server = None
+    base_url = config.get("api", "base_url")
+    if args.stand_in:
+        from stand_in.WebGateServer import WebGateServer
+        server = WebGateServer(
+            catalog_size=config.getint("stand_in", "catalog_size"),
+            seed=config.getint("stand_in", "seed")).start()
+        base_url = server.base_url
+
+    # общий транспорт и фабрика клиентов - те же, что в тестах:
+    # пул соединений [api] и ограничения [throttle] test_config.ini
+    transport = get_transport()
+    limit = min(transport.pool_maxsize,
+                config.getint("throttle", "max_concurrency") or args.users)
+    if args.users > limit:
+        print(f"Одновременных запросов не больше {limit} (pool_maxsize "
+              f"[api], max_concurrency [throttle]; переопределяются "
+              f"CG_API_POOL_MAXSIZE, CG_THROTTLE_MAX_CONCURRENCY)")
+    factory = ApiClientFactory.from_config(base_url, transport)
+    product_id = ProductCatalog.fetch(
+        factory.urls["for_data"], factory.headers(), pages=1,
+        transport=transport).pick(in_stock=True, purchasable=True)["id"]
+    phrases = data.get_list("search_phrase_positive")
+    tokens = data.get_tokens()
+
+    if (server is None and len(tokens) < args.users and
+            any(name in CART_SCENARIOS for name in scenarios)):
+        print(f"Токенов {len(tokens)} меньше, чем пользователей "
+              f"{args.users}: сценарии корзины пользователей с общим "
+              f"токеном выполняются по очереди (список tokens "
+              f"в test_data.json или CG_DATA_TOKENS)")
+
+    users = []
+    cart_locks = {}
+    for number in range(args.users):
+        if server is not None:
+            # на стенде у каждого пользователя своя (пустая) корзина
+            token, model = f"{factory.token}-{number}", CartModel()
+        else:
+            token, model = tokens[number % len(tokens)], None
+        users.append(VirtualUser(
+            number, TrackedCart(factory.cart(token), model),
+            factory.search(token), product_id, phrases,
+            cart_locks.setdefault(token, threading.Lock())))
+
+    try:
+        report = LoadRunner(users, scenarios, args.rate, args.ramp_up,
+                            args.duration, transport).run()
+    finally:
+        factory.close()
+        close_transport()
+        if server is not None:
+            server.stop()
+
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, ensure_ascii=False, indent=2)
+    for section in ("endpoints", "scenarios"):
+        for name, stats in report[section].items():
+            latency = stats["latency_ms"]
+            print(f"{name:40} {stats['throughput']:>9}/s "
+                  f"errors={stats['errors']:<5} p50={latency['p50']:.1f} "
+                  f"p95={latency['p95']:.1f} p99={latency['p99']:.1f} ms")
+    print(f"Результаты сохранены: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
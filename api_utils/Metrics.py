@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+from api_utils.Histogram import Histogram
+from api_utils.Transport import endpoint_template
+
+
+class RequestMetrics:
+    """
+    Сбор метрик API-запросов через наблюдатель транспорта:
+    - Записи по каждому запросу текущего теста (эндпоинт, статус,
+      размер ответа, время выполнения),
+    - Агрегаты за прогон по эндпоинтам,
+    - Выгрузка в формате Prometheus (text exposition) и JSON.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.records = []
+        self.endpoints = {}
+
+    def observe(self, method: str, url: str, response,
+                elapsed: float) -> None:
+        """Наблюдатель транспорта: учитывает выполненный запрос."""
+        template = endpoint_template(method, url)
+        status = str(response.status_code) if response is not None \
+            else "error"
+        size = self._response_size(response)
+        with self.lock:
+            self.records.append({"endpoint": template, "status": status,
+                                 "bytes": size,
+                                 "elapsed_ms": round(elapsed * 1000, 3)})
+            stats = self.endpoints.get(template)
+            if stats is None:
+                stats = self.endpoints[template] = {
+                    "histogram": Histogram(), "statuses": {}, "bytes": 0}
+            stats["statuses"][status] = stats["statuses"].get(status, 0) + 1
+            stats["bytes"] += size
+        stats["histogram"].record(elapsed * 1_000_000)
+
+    @staticmethod
+    def _response_size(response) -> int:
+        if response is None:
+            return 0
+        # потоковый ответ: байты, прочитанные до конца тела
+        streamed = getattr(response, "body_bytes", None)
+        if streamed is not None:
+            return streamed
+        length = response.headers.get("Content-Length")
+        if length is not None and length.isdigit():
+            return int(length)
+        content = getattr(response, "_content", None)
+        return len(content) if isinstance(content, bytes) else 0
+
+    def take_records(self) -> list:
+        """
+        Возвращает записи о запросах с момента предыдущего вызова
+        (например, за время текущего теста) и очищает их.
+        """
+        with self.lock:
+            records, self.records = self.records, []
+        return records
+
+    @staticmethod
+    def records_table(records: list) -> str:
+        """Таблица записей о запросах в формате CSV (для Allure)."""
+        lines = ["endpoint,status,bytes,elapsed_ms"]
+        for record in records:
+            lines.append(f"\"{record['endpoint']}\",{record['status']},"
+                         f"{record['bytes']},{record['elapsed_ms']}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> dict:
+        """Агрегаты за прогон по эндпоинтам (задержки в мс)."""
+        with self.lock:
+            endpoints = dict(self.endpoints)
+        return {name: {"statuses": dict(stats["statuses"]),
+                       "bytes": stats["bytes"],
+                       "latency_ms": stats["histogram"].to_dict(0.001)}
+                for name, stats in sorted(endpoints.items())}
+
+    def to_prometheus(self) -> str:
+        """Агрегаты за прогон в формате Prometheus text exposition."""
+        lines = [
+            "# HELP api_requests_total API requests by endpoint and status.",
+            "# TYPE api_requests_total counter",
+        ]
+        summary = self.to_dict()
+        for name, stats in summary.items():
+            labels = self._labels(name)
+            for status, count in sorted(stats["statuses"].items()):
+                lines.append(f'api_requests_total{{{labels},'
+                             f'status="{status}"}} {count}')
+        lines += [
+            "# HELP api_response_bytes_total API response body bytes.",
+            "# TYPE api_response_bytes_total counter",
+        ]
+        for name, stats in summary.items():
+            lines.append(f"api_response_bytes_total{{{self._labels(name)}}}"
+                         f" {stats['bytes']}")
+        lines += [
+            "# HELP api_request_duration_seconds API request wall time.",
+            "# TYPE api_request_duration_seconds summary",
+        ]
+        for name, stats in summary.items():
+            labels = self._labels(name)
+            latency = stats["latency_ms"]
+            for quantile, key in (("0.5", "p50"), ("0.95", "p95"),
+                                  ("0.99", "p99")):
+                lines.append(f'api_request_duration_seconds{{{labels},'
+                             f'quantile="{quantile}"}} '
+                             f'{latency[key] / 1000:.6f}')
+            # точная сумма замеров, а не округленное среднее * количество
+            total = latency["total"] / 1000
+            lines.append(f"api_request_duration_seconds_sum{{{labels}}} "
+                         f"{total:.6f}")
+            lines.append(f"api_request_duration_seconds_count{{{labels}}} "
+                         f"{latency['count']}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(name: str) -> str:
+        method, _, path = name.partition(" ")
+        return f'method="{method}",endpoint="{path}"'
+
+    def write(self, directory: str, suffix: str = "") -> None:
+        """
+        Сохраняет агрегаты прогона в файлы api-metrics{suffix}.prom
+        и api-metrics{suffix}.json в каталоге 'directory'.
+        """
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, f"api-metrics{suffix}")
+        with open(base + ".prom", "w", encoding="utf-8") as file:
+            file.write(self.to_prometheus())
+        with open(base + ".json", "w", encoding="utf-8") as file:
+            json.dump(self.to_dict(), file, ensure_ascii=False, indent=2)
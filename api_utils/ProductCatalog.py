@@ -0,0 +1,204 @@
+import json
+import os
+import random
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from api_utils.ApiResponse import ApiResponse
+from api_utils.Cassette import Cassette
+from api_utils.Transport import Transport, get_transport
+
+
+class ProductCatalog:
+    """
+    Каталог товаров (/v2/products) на сессию тестов:
+    - Страницы каталога загружаются один раз, одновременно,
+    - Товары индексируются по id, цене, наличию и категории,
+    - Каталог можно сохранить на диск и использовать повторно
+      в течение заданного времени (TTL),
+    - Выбор товаров по критериям (в наличии, доступен для покупки,
+      диапазон цены, категория).
+    """
+    PAGE_PARAM = "page"
+    PAGE_SIZE_PARAM = "per-page"
+    PURCHASABLE = frozenset(("canBuy",))
+
+    def __init__(self, products: list) -> None:
+        """
+        Инициализация каталога.
+            products: list - атрибуты товаров (['data'][i]['attributes']).
+        """
+        self.products = products
+        self.by_id = {}
+        self.by_category = {}
+        self.in_stock = set()
+        self.purchasable = set()
+        priced = []
+        for product in products:
+            product_id = product["id"]
+            self.by_id[product_id] = product
+            category = (product.get("category") or {}).get("id")
+            self.by_category.setdefault(category, []).append(product_id)
+            if self._stock(product) > 0:
+                self.in_stock.add(product_id)
+            if product.get("status") in self.PURCHASABLE:
+                self.purchasable.add(product_id)
+            if product.get("price") is not None:
+                priced.append((product["price"], product_id))
+        priced.sort()
+        self.prices = [price for price, _ in priced]
+        self.price_ids = [product_id for _, product_id in priced]
+
+    @staticmethod
+    def _stock(product: dict) -> int:
+        """
+        Остаток товара: 'stock' или 'quantity'; если остаток
+        не передается - по статусу товара.
+        """
+        for key in ("stock", "quantity"):
+            if isinstance(product.get(key), int):
+                return product[key]
+        return 1 if product.get("status") in ProductCatalog.PURCHASABLE \
+            else 0
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def get(self, product_id) -> dict:
+        return self.by_id.get(product_id)
+
+    def select(self, in_stock: bool = True, purchasable: bool = True,
+               min_price: float = None, max_price: float = None,
+               category=None, exclude=()) -> list:
+        """
+        Возвращает товары, удовлетворяющие критериям, в порядке каталога.
+            in_stock: bool - только товары в наличии,
+            purchasable: bool - только товары, доступные для покупки,
+            min_price, max_price: float - границы цены (включительно),
+            category - id категории товара,
+            exclude - id товаров, которые не нужно выбирать.
+        """
+        ids = None
+        if min_price is not None or max_price is not None:
+            low = 0 if min_price is None else bisect_left(self.prices,
+                                                          min_price)
+            high = len(self.prices) if max_price is None else \
+                bisect_right(self.prices, max_price)
+            ids = set(self.price_ids[low:high])
+        for enabled, index in ((in_stock, self.in_stock),
+                               (purchasable, self.purchasable)):
+            if enabled:
+                ids = set(index) if ids is None else ids & index
+        if category is not None:
+            members = set(self.by_category.get(category, ()))
+            ids = members if ids is None else ids & members
+        excluded = set(exclude)
+        return [product for product in self.products
+                if (ids is None or product["id"] in ids) and
+                product["id"] not in excluded]
+
+    def pick(self, seed: int = None, **criteria) -> dict:
+        """
+        Возвращает один товар, удовлетворяющий критериям (см. select):
+        первый по каталогу или случайный при заданном 'seed'.
+        Если подходящих товаров нет, выбрасывается исключение LookupError.
+        """
+        products = self.select(**criteria)
+        if not products:
+            raise LookupError(f"В каталоге нет товаров по критериям: "
+                              f"{criteria or 'по умолчанию'}")
+        if seed is None:
+            return products[0]
+        return random.Random(seed).choice(products)
+
+    @classmethod
+    def fetch(cls, url: str, headers: dict, pages: int = 5,
+              page_size: int = 48,
+              transport: Transport = None) -> "ProductCatalog":
+        """
+        Загружает каталог: первая страница определяет количество
+        страниц, остальные (не более 'pages') загружаются одновременно.
+            url: str - URL эндпоинта каталога (/v2/products),
+            headers: dict - заголовки для авторизации,
+            pages: int - максимальное количество загружаемых страниц,
+            page_size: int - количество товаров на странице.
+        """
+        transport = transport or get_transport()
+
+        def fetch_page(page: int) -> ApiResponse:
+            response = transport.get(url, headers=headers, params={
+                cls.PAGE_PARAM: page, cls.PAGE_SIZE_PARAM: page_size})
+            response.raise_for_status()
+            return ApiResponse.from_response(response, "for_data")
+
+        first = fetch_page(1)
+        total_pages = first.total_pages or 1
+        rest = range(2, min(total_pages, pages) + 1)
+        responses = [first]
+        if rest:
+            workers = min(len(rest), transport.pool_maxsize)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                responses += list(executor.map(fetch_page, rest))
+        products = [item["attributes"] for response in responses
+                    for item in response.json()["data"]]
+        return cls(products)
+
+    @classmethod
+    def for_session(cls, url: str, headers: dict, cache_path: str = None,
+                    ttl: float = 0, cassette: Cassette = None,
+                    transport: Transport = None,
+                    **options) -> "ProductCatalog":
+        """
+        Каталог на сессию тестов.
+        С кассетой (record/replay) страницы каталога записываются
+        в кассету или воспроизводятся из нее без обращения к сети,
+        файл cache_path при этом не используется. Без кассеты каталог
+        читается из файла cache_path, если он моложе 'ttl' секунд,
+        иначе загружается (см. fetch) и сохраняется в файл.
+            cassette: Cassette - кассета сессии (закрывает вызывающий),
+            options - параметры fetch (pages, page_size).
+        """
+        transport = transport or get_transport()
+        if cassette is not None:
+            previous, transport.cassette = transport.cassette, cassette
+            try:
+                return cls.fetch(url, headers, transport=transport,
+                                 **options)
+            finally:
+                transport.cassette = previous
+        catalog = cls.load(cache_path, ttl, url) if cache_path else None
+        if catalog is None:
+            catalog = cls.fetch(url, headers, transport=transport, **options)
+            if cache_path:
+                catalog.save(cache_path, url)
+        return catalog
+
+    def save(self, path: str, source: str = None) -> None:
+        """
+        Сохраняет каталог в файл JSON.
+            source: str - URL каталога (проверяется при загрузке).
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp = f"{path}.{os.getpid()}.tmp"
+        with open(temp, "w", encoding="utf-8") as file:
+            json.dump({"created": time.time(), "source": source,
+                       "products": self.products}, file, ensure_ascii=False)
+        os.replace(temp, path)
+
+    @classmethod
+    def load(cls, path: str, ttl: float, source: str = None):
+        """
+        Загружает каталог из файла, если он моложе 'ttl' секунд
+        и получен из того же источника. Иначе возвращает None.
+        """
+        try:
+            with open(path, encoding="utf-8") as file:
+                cached = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if (time.time() - cached.get("created", 0) > ttl or
+                cached.get("source") != source):
+            return None
+        return cls(cached["products"])
@@ -0,0 +1,123 @@
+import operator
+from functools import lru_cache
+from itertools import chain, repeat
+
+# разделитель строк пакета: не пробельный символ, не меняется casefold
+SEPARATOR = "\x00"
+
+
+@lru_cache(maxsize=65536)
+def normalize(text: str) -> str:
+    """
+    Нормализует текст для сравнения: лишние пробелы удаляются,
+    регистр приводится casefold, буква 'ё' заменяется на 'е'.
+    """
+    return " ".join(text.split()).casefold().replace("ё", "е")
+
+
+def normalize_many(texts: list) -> list:
+    """
+    Нормализует список текстов за один проход: тексты объединяются
+    в одну строку через разделитель, пробелы, casefold и замена 'ё'
+    обрабатываются для всей строки сразу.
+    Результат совпадает с normalize для каждого текста.
+    """
+    if not texts:
+        return []
+    joined = SEPARATOR.join(texts)
+    if joined.count(SEPARATOR) != len(texts) - 1:
+        return [normalize(text) for text in texts]
+    joined = " ".join(joined.split())
+    joined = joined.replace(" " + SEPARATOR, SEPARATOR).replace(
+        SEPARATOR + " ", SEPARATOR)
+    return joined.casefold().replace("ё", "е").split(SEPARATOR)
+
+
+class RelevanceReport:
+    """
+    Результат оценки релевантности поиска по корпусу фраз:
+        ranks: list - позиция первого релевантного результата
+               для каждой фразы (1..k) или None,
+        hits: list - количество релевантных результатов в первых k,
+        returned: list - количество результатов в первых k.
+    """
+
+    def __init__(self, phrases: list, k: int, ranks: list, hits: list,
+                 returned: list) -> None:
+        self.phrases = phrases
+        self.k = k
+        self.ranks = ranks
+        self.hits = hits
+        self.returned = returned
+
+    def _mean(self, values) -> float:
+        return sum(values) / len(self.phrases) if self.phrases else 0.0
+
+    def hit_at(self, k: int) -> float:
+        """Доля фраз с релевантным результатом в первых k (k <= self.k)."""
+        return self._mean(1 for rank in self.ranks
+                          if rank is not None and rank <= k)
+
+    def precision(self) -> float:
+        """Средняя точность в первых k: релевантные / возвращенные."""
+        return self._mean(hits / returned for hits, returned
+                          in zip(self.hits, self.returned) if returned)
+
+    def mrr(self) -> float:
+        """Средний обратный ранг первого релевантного результата."""
+        return self._mean(1 / rank for rank in self.ranks
+                          if rank is not None)
+
+    def misses(self) -> list:
+        """Фразы без релевантных результатов в первых k."""
+        return [phrase for phrase, rank in zip(self.phrases, self.ranks)
+                if rank is None]
+
+    def to_dict(self) -> dict:
+        return {"phrases": len(self.phrases), "k": self.k,
+                "hit@1": self.hit_at(1), f"hit@{self.k}": self.hit_at(self.k),
+                f"precision@{self.k}": self.precision(), "mrr": self.mrr(),
+                "misses": self.misses()}
+
+
+class RelevanceAnalyzer:
+    """
+    Пакетная оценка релевантности результатов поиска: результат
+    релевантен, если нормализованное наименование товара содержит
+    нормализованную фразу поиска.
+    - Наименования нормализуются одним проходом (normalize_many),
+      фразы - с кэшированием (normalize),
+    - Проверка вхождения выполняется одним проходом map по всем парам
+      фраза/наименование, флаги совпадений собираются в bytes,
+    - Ранг и количество совпадений фразы считаются bytes.find/count.
+    """
+
+    def __init__(self, k: int = 10) -> None:
+        """
+        Инициализация.
+            k: int - количество первых результатов для оценки.
+        """
+        self.k = k
+
+    def score(self, phrases: list, results: list) -> RelevanceReport:
+        """
+        Оценивает результаты поиска по корпусу фраз.
+            phrases: list - фразы поиска,
+            results: list - для каждой фразы список наименований
+                     найденных товаров в порядке выдачи.
+        """
+        top = [titles[:self.k] for titles in results]
+        counts = [len(titles) for titles in top]
+        titles = normalize_many(list(chain.from_iterable(top)))
+        repeated = chain.from_iterable(
+            map(repeat, map(normalize, phrases), counts))
+        flags = bytes(map(operator.contains, titles, repeated))
+        ranks, hits = [], []
+        start = 0
+        for count in counts:
+            end = start + count
+            first = flags.find(1, start, end)
+            ranks.append(first - start + 1 if first != -1 else None)
+            hits.append(flags.count(1, start, end) if first != -1 else 0)
+            start = end
+        return RelevanceReport(phrases, self.k, ranks, hits, counts)
@@ -0,0 +1,136 @@
+import allure
+import requests
+from api_utils.CartState import TrackedCart
+from api_utils.SearchApi import SearchApi
+
+
+class ScenarioError(AssertionError):
+    """
+    Проверка сценария не выполнена. Выбрасывается явно, поэтому
+    проверки сохраняются и при запуске python -O.
+    """
+
+
+def check(condition, message: str) -> None:
+    """
+    Проверка сценария.
+    В случае невыполнения условия выбрасывается исключение ScenarioError.
+    """
+    if not condition:
+        raise ScenarioError(message)
+
+
+# Сценарии - общий код функциональных API-тестов (test/test_api.py)
+# и нагрузочного прогона (api_utils.LoadRunner).
+
+def cart_add_clear(cart: TrackedCart, product_id) -> None:
+    """
+    Сценарий test_cart_clear: добавить товар в корзину, очистить
+    корзину и проверить, что она пуста.
+        cart: TrackedCart - клиент корзины с моделью состояния,
+        product_id - артикул товара для добавления.
+    В случае ошибки выбрасывается исключение ScenarioError.
+    """
+    added = cart.add(product_id)
+
+    before = cart.info()
+    before_count = len(before.products) if before.ok else 0
+
+    delete = cart.clear()
+
+    after = cart.short()
+
+    with allure.step("Проверки Status Code."):
+        with allure.step("Запрос: добавление товара: Status Code = 200"):
+            check(added.status_code == 200, f"""Ошибка при обработке
+ запроса на добавление товара в корзину: {added.status_code}""")
+        with allure.step("""Запрос: получение информации о корзине
+ до удаления. Status Code = 200"""):
+            check(before.status_code == 200, f"""Ошибка при обработке
+ запроса на получение информации о корзине до удаления:
+ {before.status_code}""")
+        with allure.step("Проверка: количество товаров до удаления > 0"):
+            check(before_count > 0, "Перед удалением корзина пуста.")
+        with allure.step("""Запрос: удаление товара из корзины.
+ Status Code = 204"""):
+            check(delete.status_code == 204, f"""Ошибка при обработке
+ запроса на удаление товара из корзины: {delete.status_code}""")
+        with allure.step("""Запрос: получение информации о корзине
+ после удаления. Status Code = 200"""):
+            check(after.status_code == 200, f"""Ошибка при обработке запроса
+ на получение информации о корзине после удаления: {after.status_code}""")
+    with allure.step("Проверка: количество товаров после удаления =0"):
+        check(after.quantity == 0, "После удаления корзина не пуста")
+
+
+def cart_add_info_delete(cart: TrackedCart, product_id) -> None:
+    """
+    Сценарий test_delete_from_cart: добавить товар в корзину,
+    получить содержимое корзины, удалить добавленный товар по id
+    и проверить, что количество товаров уменьшилось на 1.
+        cart: TrackedCart - клиент корзины с моделью состояния,
+        product_id - артикул товара для добавления.
+    В случае ошибки выбрасывается исключение ScenarioError.
+    """
+    added = cart.add(product_id)
+    check(added.status_code == 200, f"""Ошибка при добавлении товара
+ в корзину: {added.status_code}""")
+
+    before = cart.info()
+    check(before.status_code == 200, f"""Ошибка при обработке
+ запроса на получение информации о корзине до удаления:
+ {before.status_code}""")
+    before_count = len(before.products)
+
+    item = cart.model.items.get(product_id)
+    check(item is not None, f"Товар {product_id} не найден в корзине")
+
+    delete = cart.remove(item["id"])
+
+    after = cart.short()
+
+    with allure.step("Проверки Status Code."):
+        with allure.step("""Запрос: удаление товара из корзины.
+ Status Code = 204"""):
+            check(delete.status_code == 204, f"""Ошибка при обработке
+ запроса на удаление товара из корзины: {delete.status_code}""")
+        with allure.step("""Запрос: получение информации о корзине
+ после удаления. Status Code = 200"""):
+            check(after.status_code == 200, f"""Ошибка при обработке запроса
+ на получение информации о корзине после удаления: {after.status_code}""")
+    with allure.step("Проверка: количество товаров уменьшилось на 1"):
+        subtraction = before_count - after.quantity
+        check(subtraction == 1, f"""Ошибка:
+разница в количестве товара до и после удаления : {subtraction}""")
+
+
+def search_phrase(api_search: SearchApi, phrase: str) -> None:
+    """
+    Сценарий test_search_positive: поиск по фразе и проверка,
+    что первый результат содержит фразу поиска.
+    Ответ разбирается потоково - чтение прекращается после первого
+    товара.
+    В случае ошибки выбрасывается исключение ScenarioError.
+    """
+    with allure.step("""Запрос на получение ответа о результатах поиска:
+ Status Code = 200"""):
+        try:
+            items = api_search.search_by_phrase(
+                "phrase=" + phrase, stream=True, until=lambda item: True)
+        except requests.HTTPError as e:
+            raise ScenarioError(f"""Ошибка при обработке запроса
+ на получение ответа о результатах поиска:
+ Status Code = {e.response.status_code}""") from e
+        try:
+            first = next(items, None)
+        finally:
+            # соединение возвращается в пул без дочитывания ответа
+            items.close()
+    check(first is not None, f"Нет результатов поиска: {phrase}")
+
+    search_conversion = api_search.text_conversion(phrase)
+    with allure.step(f"""Проверка: результат содержит фразу поиска
+     {search_conversion}."""):
+        title = first["attributes"]["title"]
+        check(search_conversion in title.lower(), f"""В результатах поиска
+ нет фразы: {search_conversion}.""")
@@ -0,0 +1,167 @@
+import warnings
+from configuration.ConfigProvider import ConfigProvider
+
+
+class SchemaError(AssertionError):
+    """Ответ API не соответствует схеме эндпоинта."""
+
+
+MISSING = object()
+
+
+TYPES = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+
+def _types(schema: dict) -> tuple:
+    """Допустимые типы Python и признак, что bool не допускается."""
+    names = schema.get("type")
+    if isinstance(names, str):
+        names = [names]
+    types = tuple(t for name in names or () for t in TYPES[name])
+    # bool - подкласс int: True не считается числом
+    no_bool = bool(names) and "boolean" not in names
+    return types, no_bool, "|".join(names or ())
+
+
+def _type_error(path: str, expected: str, value) -> SchemaError:
+    return SchemaError(f"{path}: ожидается {expected}, получено "
+                       f"{type(value).__name__}")
+
+
+def compile_schema(schema: dict, path: str = "$"):
+    """
+    Компилирует схему (подмножество JSON Schema: type, properties,
+    required, items) в функцию проверки значения. Схема разбирается
+    один раз: проверки простых полей выполняются внутри проверки
+    объекта без отдельных вызовов, вложенные объекты и массивы -
+    собственными функциями.
+    При несоответствии функция выбрасывает исключение SchemaError
+    с путем к значению (например, $.data.quantity).
+    """
+    types, no_bool, expected = _types(schema)
+    required = frozenset(schema.get("required", ()))
+    # поля: (имя, обязательное, типы, без bool, ожидаемое, путь, проверка)
+    fields = []
+    for name, sub in schema.get("properties", {}).items():
+        field_path = f"{path}.{name}"
+        nested = compile_schema(sub, field_path) \
+            if "properties" in sub or "items" in sub else None
+        fields.append((name, name in required, *_types(sub), field_path,
+                       nested))
+    item_check = compile_schema(schema["items"], f"{path}[]") \
+        if "items" in schema else None
+
+    def check(value):
+        if types and (not isinstance(value, types) or
+                      no_bool and value.__class__ is bool):
+            raise _type_error(path, expected, value)
+        if fields and value.__class__ is dict:
+            for (name, is_required, field_types, field_no_bool,
+                 field_expected, field_path, nested) in fields:
+                field = value.get(name, MISSING)
+                if field is MISSING:
+                    if is_required:
+                        raise SchemaError(f"{path}: нет обязательного "
+                                          f"поля '{name}'")
+                    continue
+                if field_types and (
+                        not isinstance(field, field_types) or
+                        field_no_bool and field.__class__ is bool):
+                    raise _type_error(field_path, field_expected, field)
+                if nested is not None:
+                    nested(field)
+        if item_check is not None and value.__class__ is list:
+            for item in value:
+                item_check(item)
+    return check
+
+
+ID = {"type": ["integer", "string"]}
+CART_PRODUCT = {
+    "type": "object",
+    "required": ["id", "goodsId", "quantity"],
+    "properties": {"id": ID, "goodsId": ID,
+                   "quantity": {"type": "integer"},
+                   "title": {"type": ["string", "null"]},
+                   "cost": {"type": ["number", "null"]}},
+}
+PRODUCT = {
+    "type": "object",
+    "required": ["id", "attributes"],
+    "properties": {
+        "id": ID,
+        "attributes": {
+            "type": "object",
+            "required": ["id", "title"],
+            "properties": {"id": ID, "title": {"type": "string"},
+                           "price": {"type": ["number", "null"]},
+                           "status": {"type": ["string", "null"]}}}},
+}
+PAGINATION = {
+    "type": "object",
+    "properties": {"pagination": {"type": "object"}},
+}
+
+# схемы ответов эндпоинтов (ключи - имена эндпоинтов секции [api])
+SCHEMAS = {
+    "cart": {
+        "type": "object",
+        "required": ["products"],
+        "properties": {"products": {"type": "array",
+                                    "items": CART_PRODUCT},
+                       "quantity": {"type": "integer"},
+                       "cost": {"type": "number"}},
+    },
+    "cart_short": {
+        "type": "object",
+        "required": ["data"],
+        "properties": {"data": {
+            "type": "object",
+            "required": ["quantity"],
+            "properties": {"quantity": {"type": "integer"}}}},
+    },
+    "search": {
+        "type": "object",
+        "required": ["data"],
+        "properties": {"data": {"type": "object"},
+                       "included": {"type": "array", "items": PRODUCT},
+                       "meta": PAGINATION},
+    },
+    "search_item": PRODUCT,
+    "for_data": {
+        "type": "object",
+        "required": ["data"],
+        "properties": {"data": {"type": "array", "items": PRODUCT},
+                       "meta": PAGINATION},
+    },
+}
+
+# проверки компилируются один раз при импорте модуля
+VALIDATORS = {name: compile_schema(schema, f"{name}:$")
+              for name, schema in SCHEMAS.items()}
+
+
+def validate(name: str, data) -> None:
+    """
+    Проверяет данные ответа по схеме эндпоинта 'name' с учетом
+    режима schema_validation секции [api]:
+    strict - выбросить SchemaError, warn - предупреждение (по умолчанию),
+    off - без проверки.
+    """
+    mode = ConfigProvider().get("api", "schema_validation") or "warn"
+    if mode == "off":
+        return
+    try:
+        VALIDATORS[name](data)
+    except SchemaError as e:
+        if mode == "strict":
+            raise
+        warnings.warn(str(e))
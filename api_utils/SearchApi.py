@@ -1,16 +1,29 @@
-import requests
 import allure
 import re
+from concurrent.futures import ThreadPoolExecutor
+from api_utils.ApiResponse import ApiResponse
+from api_utils.JsonStream import iter_array_items
+from api_utils.Schema import validate
+from api_utils.Transport import Transport, get_transport
+
+SPACES = re.compile(r"\s+")
 
 
 class SearchApi:
     """
     Класс с методами для API-запросов при работе со страницей поиска.
-    - Поиск товара
+    - Поиск товара,
+    - Потоковый разбор результатов поиска,
+    - Обход всех страниц результатов поиска.
     """
+    PAGE_PARAM = "products[page]"
+    PAGE_SIZE_PARAM = "products[per-page]"
+    PAGE_SIZE = 48
+
     @allure.step("""SearchApi. URL: {search_url},
                  параметры для авторизации: {params}""")
-    def __init__(self, search_url: str, params: dict) -> None:
+    def __init__(self, search_url: str, params: dict,
+                 transport: Transport = None) -> None:
         """
         Инициализация метода 'SearchApi'.
         Определяет сущность класса 'SearchApi' и формирует
@@ -20,10 +33,13 @@ class SearchApi:
                             содержит ключи:
                             - token: str,
                             - user_agent: str,
-                            - content_type: str.
+                            - content_type: str,
+            transport: Transport - общий транспорт для запросов
+                            (по умолчанию - общий пул соединений).
         """
         self.search_url = search_url
         self.params = params
+        self.transport = transport or get_transport()
 
     @allure.step("Преобразование текстов - удаление лишних пробелов")
     def text_conversion(self, text: str) -> str:
@@ -33,13 +49,104 @@ class SearchApi:
             text: str - исходный текст.
             returns: ыек - преобразованный текст.
         """
-        text = re.sub(r'\s+', ' ', text)
-        text = text.strip()
-        return text.lower()
+        return SPACES.sub(" ", text).strip().lower()
 
     @allure.step("Поиск товара на главной странице сайта")
-    def search_by_phrase(self, parameters: str):
+    def search_by_phrase(self, parameters: str, stream: bool = False,
+                         until=None, chunk_size: int = 16384):
+        """
+        Выполняет поиск товара по параметрам запроса.
+            parameters: str - параметры запроса (например, 'phrase=...'),
+            stream: bool - потоковый режим: ответ разбирается по мере
+                    чтения, возвращается генератор товаров ['included'],
+            until - функция-условие для потокового режима: после первого
+                    товара, для которого она вернула True, чтение ответа
+                    прекращается,
+            chunk_size: int - размер фрагмента чтения в потоковом режиме.
+            return: ApiResponse | генератор товаров из ['included'].
+        В потоковом режиме при ошибке запроса (Status Code 4xx/5xx)
+        выбрасывается исключение requests.HTTPError.
+        """
         path = self.search_url
-        response_search = requests.get(
-            path, headers=self.params, params=parameters)
-        return response_search
+        response_search = self.transport.get(
+            path, headers=self.params, params=parameters, stream=stream)
+        if not stream:
+            return ApiResponse.from_response(response_search, "search")
+        try:
+            response_search.raise_for_status()
+        except Exception:
+            response_search.close()
+            raise
+        return self._iter_included(response_search, until, chunk_size)
+
+    @staticmethod
+    def _iter_included(response, until, chunk_size: int):
+        try:
+            for item in iter_array_items(
+                    response.iter_content(chunk_size), "included"):
+                validate("search_item", item)
+                yield item
+                if until is not None and until(item):
+                    return
+        finally:
+            response.close()
+
+    def iter_search_results(self, phrase: str, page_size: int = None,
+                            max_items: int = None):
+        """
+        Генератор товаров ['included'] со всех страниц результатов поиска.
+        Пока обрабатывается текущая страница, следующая загружается
+        в фоне.
+            phrase: str - фраза поиска,
+            page_size: int - количество товаров на странице
+                       (по умолчанию PAGE_SIZE),
+            max_items: int - максимальное количество товаров
+                       (по умолчанию - все найденные).
+        В случае ошибки запроса страницы (Status Code 4xx/5xx)
+        выбрасывается исключение requests.HTTPError.
+        Шаг Allure открывается на ожидание каждой страницы: страница,
+        загруженная в фоне, получается без задержки (декоратор
+        allure.step у генератора дал бы пустой шаг).
+        При закрытии генератора загрузка в фоне дожидается завершения,
+        чтобы запрос не выполнялся после теста.
+        """
+        page_size = page_size or self.PAGE_SIZE
+        executor = ThreadPoolExecutor(max_workers=1,
+                                      thread_name_prefix="search-prefetch")
+        try:
+            page = 1
+            future = executor.submit(self._fetch_page, phrase, page,
+                                     page_size)
+            returned = 0
+            while future is not None:
+                with allure.step(f"""Страница {page} результатов поиска
+ по фразе '{phrase}'"""):
+                    response = future.result()
+                items = response.included
+                total_pages = response.total_pages
+                last = (not items or len(items) < page_size or
+                        (total_pages is not None and page >= total_pages) or
+                        (max_items is not None and
+                         returned + len(items) >= max_items))
+                future = None
+                if not last:
+                    page += 1
+                    future = executor.submit(self._fetch_page, phrase,
+                                             page, page_size)
+                for item in items:
+                    if max_items is not None and returned >= max_items:
+                        return
+                    returned += 1
+                    yield item
+        finally:
+            # незапущенная загрузка отменяется, выполняемая - дожидается
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _fetch_page(self, phrase: str, page: int,
+                    page_size: int) -> ApiResponse:
+        params = {"phrase": phrase, self.PAGE_PARAM: page,
+                  self.PAGE_SIZE_PARAM: page_size}
+        response = self.transport.get(
+            self.search_url, headers=self.params, params=params)
+        response.raise_for_status()
+        return ApiResponse.from_response(response, "search")
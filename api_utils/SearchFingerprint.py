@@ -0,0 +1,326 @@
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from api_utils.ApiClientFactory import ApiClientFactory
+from api_utils.Schema import SchemaError
+from api_utils.SearchApi import SearchApi
+from api_utils.Transport import Transport
+from configuration.ConfigProvider import ConfigProvider
+from testdata.DataProvider import DataProvider
+
+HASH_SIZE = 8
+ATTRIBUTES = ("title", "price", "status")
+
+
+def fingerprint(items: list, attributes=ATTRIBUTES) -> tuple:
+    """
+    Отпечаток результатов поиска по фразе:
+        ids: str - id товаров в порядке выдачи через запятую,
+        hashes: bytes - хэши ключевых атрибутов товаров
+                (по HASH_SIZE байт на товар, в том же порядке).
+        items: list - товары ['included'] ответа поиска,
+        attributes - ключевые атрибуты товара.
+    """
+    ids, hashes = [], []
+    for item in items:
+        attrs = item.get("attributes", item)
+        ids.append(str(item.get("id", attrs.get("id"))))
+        key = json.dumps([attrs.get(name) for name in attributes],
+                         ensure_ascii=False, separators=(",", ":"))
+        hashes.append(hashlib.blake2b(key.encode("utf-8"),
+                                      digest_size=HASH_SIZE).digest())
+    return ",".join(ids), b"".join(hashes)
+
+
+def _split(ids: str, hashes: bytes) -> tuple:
+    id_list = ids.split(",") if ids else []
+    return id_list, [hashes[i:i + HASH_SIZE]
+                     for i in range(0, len(hashes), HASH_SIZE)]
+
+
+def diff_fingerprints(baseline: tuple, current: tuple) -> dict:
+    """
+    Сравнивает отпечатки результатов поиска по одной фразе.
+        baseline, current: tuple - отпечатки (ids, hashes),
+        return: dict -
+            rank_shifts: list - [id, позиция в эталоне, позиция сейчас]
+                         для товаров, сменивших позицию,
+            dropped: list - товары, пропавшие из выдачи,
+            new: list - товары, появившиеся в выдаче,
+            changed: list - товары с изменившимися атрибутами.
+    """
+    base_ids, base_hashes = _split(*baseline)
+    cur_ids, cur_hashes = _split(*current)
+    base_rank = {product_id: rank for rank, product_id
+                 in enumerate(base_ids, 1)}
+    base_hash = dict(zip(base_ids, base_hashes))
+    cur_set = set(cur_ids)
+    shifts, new, changed = [], [], []
+    for rank, (product_id, hashed) in enumerate(
+            zip(cur_ids, cur_hashes), 1):
+        old_rank = base_rank.get(product_id)
+        if old_rank is None:
+            new.append(product_id)
+            continue
+        if old_rank != rank:
+            shifts.append([product_id, old_rank, rank])
+        if base_hash[product_id] != hashed:
+            changed.append(product_id)
+    return {"rank_shifts": shifts,
+            "dropped": [product_id for product_id in base_ids
+                        if product_id not in cur_set],
+            "new": new, "changed": changed}
+
+
+class FingerprintStore:
+    """
+    Хранилище отпечатков результатов поиска в SQLite:
+    - Прогон (run) - именованный набор отпечатков по фразам корпуса,
+    - Отпечаток - упорядоченные id товаров и хэши ключевых атрибутов,
+    - Фраза с ошибкой поиска хранится с текстом ошибки (error) вместо
+      отпечатка и в сравнении выдачи не участвует,
+    - Сравнение прогона с эталоном: изменившиеся фразы отбираются
+      запросом SQL, разбираются только они.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS runs (
+                id INTEGER PRIMARY KEY,
+                name TEXT UNIQUE NOT NULL,
+                created REAL NOT NULL,
+                meta TEXT);
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                run_id INTEGER NOT NULL REFERENCES runs(id)
+                    ON DELETE CASCADE,
+                phrase TEXT NOT NULL,
+                ids TEXT NOT NULL,
+                hashes BLOB NOT NULL,
+                error TEXT,
+                PRIMARY KEY (run_id, phrase)) WITHOUT ROWID;
+        """)
+        columns = {row[1] for row in
+                   self.db.execute("PRAGMA table_info(fingerprints)")}
+        if "error" not in columns:
+            # хранилище, созданное до учета ошибок поиска
+            with self.db:
+                self.db.execute(
+                    "ALTER TABLE fingerprints ADD COLUMN error TEXT")
+
+    def begin_run(self, name: str, meta: dict = None) -> int:
+        """
+        Создает прогон (прогон с тем же именем заменяется)
+        и возвращает его id.
+        """
+        with self.db:
+            self.db.execute("PRAGMA foreign_keys=ON")
+            self.db.execute("DELETE FROM runs WHERE name = ?", (name,))
+            cursor = self.db.execute(
+                "INSERT INTO runs (name, created, meta) VALUES (?, ?, ?)",
+                (name, time.time(), json.dumps(meta or {},
+                                               ensure_ascii=False)))
+        return cursor.lastrowid
+
+    def run_id(self, name: str) -> int:
+        row = self.db.execute("SELECT id FROM runs WHERE name = ?",
+                              (name,)).fetchone()
+        if row is None:
+            raise LookupError(f"Прогон '{name}' не найден в {self.path}")
+        return row[0]
+
+    def runs(self) -> list:
+        return [{"name": name, "created": created, "phrases": count,
+                 "errors": errors}
+                for name, created, count, errors in self.db.execute(
+                    "SELECT r.name, r.created, COUNT(f.phrase), "
+                    "COUNT(f.error) FROM runs r "
+                    "LEFT JOIN fingerprints f ON f.run_id = r.id "
+                    "GROUP BY r.id ORDER BY r.created")]
+
+    def put_many(self, run_id: int, rows) -> None:
+        """
+        Сохраняет отпечатки прогона одной транзакцией.
+            rows - тройки (фраза, отпечаток (ids, hashes), ошибка);
+                   ошибка - None или текст ошибки поиска (отпечаток
+                   при этом не сохраняется).
+        """
+        with self.db:
+            self.db.executemany(
+                "INSERT OR REPLACE INTO fingerprints "
+                "(run_id, phrase, ids, hashes, error) "
+                "VALUES (?, ?, ?, ?, ?)",
+                ((run_id, phrase, "", b"", error) if error is not None
+                 else (run_id, phrase, ids, hashes, None)
+                 for phrase, (ids, hashes), error in rows))
+
+    def diff(self, baseline: str, run: str) -> dict:
+        """
+        Сравнивает прогон 'run' с эталоном 'baseline'.
+            return: dict - количество фраз, пропавшие и новые фразы,
+                    изменения выдачи по фразам (см. diff_fingerprints),
+                    ошибки поиска по фразам в эталоне и в прогоне
+                    (такие фразы не сравниваются).
+        """
+        base_id, run_id = self.run_id(baseline), self.run_id(run)
+        changes = {}
+        for phrase, base_ids, base_hashes, ids, hashes in self.db.execute(
+                "SELECT b.phrase, b.ids, b.hashes, c.ids, c.hashes "
+                "FROM fingerprints b JOIN fingerprints c "
+                "ON c.phrase = b.phrase AND c.run_id = ? "
+                "WHERE b.run_id = ? AND b.error IS NULL AND "
+                "c.error IS NULL AND (b.ids != c.ids OR "
+                "b.hashes != c.hashes)", (run_id, base_id)):
+            changes[phrase] = diff_fingerprints((base_ids, base_hashes),
+                                                (ids, hashes))
+        only = ("SELECT phrase FROM fingerprints WHERE run_id = ? EXCEPT "
+                "SELECT phrase FROM fingerprints WHERE run_id = ?")
+        errors = ("SELECT phrase, error FROM fingerprints "
+                  "WHERE run_id = ? AND error IS NOT NULL ORDER BY phrase")
+        total = self.db.execute(
+            "SELECT COUNT(*) FROM fingerprints WHERE run_id = ?",
+            (run_id,)).fetchone()[0]
+        return {"baseline": baseline, "run": run, "phrases": total,
+                "changed": len(changes),
+                "errors": {"baseline": dict(self.db.execute(errors,
+                                                            (base_id,))),
+                           "run": dict(self.db.execute(errors, (run_id,)))},
+                "missing": [row[0] for row in
+                            self.db.execute(only, (base_id, run_id))],
+                "added": [row[0] for row in
+                          self.db.execute(only, (run_id, base_id))],
+                "changes": changes}
+
+    def close(self) -> None:
+        self.db.close()
+
+
+def collect(api_search: SearchApi, phrases, workers: int = 10,
+            attributes=ATTRIBUTES):
+    """
+    Выполняет поиск по фразам корпуса (не более 'workers' запросов
+    одновременно) и возвращает тройки (фраза, отпечаток, ошибка)
+    первой страницы результатов в порядке корпуса.
+    Корпус читается по мере выполнения: в очереди не более
+    2 * 'workers' фраз. Ошибка поиска по фразе (Status Code 4xx/5xx,
+    ошибка соединения, ответ не по схеме) возвращается текстом вместо
+    отпечатка и не прерывает сбор.
+    """
+    def search(phrase: str) -> tuple:
+        try:
+            response = api_search.search_by_phrase({"phrase": phrase})
+            if not response.ok:
+                return phrase, fingerprint([]), \
+                    f"Status Code {response.status_code}"
+            items = response.json().get("included", [])
+        except (requests.RequestException, SchemaError, ValueError) as e:
+            return phrase, fingerprint([]), f"{type(e).__name__}: {e}"
+        return phrase, fingerprint(items, attributes), None
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        window = deque()
+        for phrase in phrases:
+            window.append(executor.submit(search, phrase))
+            if len(window) >= 2 * workers:
+                yield window.popleft().result()
+        while window:
+            yield window.popleft().result()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Отпечатки результатов поиска и сравнение прогонов")
+    parser.add_argument("--db", default=None,
+                        help="файл SQLite (по умолчанию - db из секции "
+                             "[fingerprints] test_config.ini)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    collect_parser = commands.add_parser(
+        "collect", help="собрать отпечатки поиска по корпусу фраз")
+    collect_parser.add_argument("--run", required=True, help="имя прогона")
+    collect_parser.add_argument("--dataset", default="search_phrase_positive",
+                                help="набор фраз из test_data.json")
+    collect_parser.add_argument("--stand-in", action="store_true",
+                                help="собрать на локальном стенде web-gate")
+    diff_parser = commands.add_parser(
+        "diff", help="сравнить прогон с эталоном")
+    diff_parser.add_argument("--baseline", required=True,
+                             help="эталонный прогон")
+    diff_parser.add_argument("--run", required=True, help="прогон")
+    diff_parser.add_argument("--output", default=None,
+                             help="файл для выгрузки результата в JSON")
+    commands.add_parser("runs", help="список прогонов")
+    args = parser.parse_args()
+
+    config = ConfigProvider()
+    store = FingerprintStore(args.db or config.get("fingerprints", "db"))
+    try:
+        if args.command == "runs":
+            for run in store.runs():
+                print(f"{run['name']}: {run['phrases']} фраз, "
+                      f"ошибок {run['errors']}, "
+                      f"{time.ctime(run['created'])}")
+        elif args.command == "collect":
+            _collect(args, config, store)
+        else:
+            report = store.diff(args.baseline, args.run)
+            if args.output:
+                with open(args.output, "w", encoding="utf-8") as file:
+                    json.dump(report, file, ensure_ascii=False, indent=2)
+            print(f"{args.run} / {args.baseline}: фраз {report['phrases']}, "
+                  f"изменено {report['changed']}, пропало "
+                  f"{len(report['missing'])}, добавлено "
+                  f"{len(report['added'])}, ошибок поиска (не сравнивались) "
+                  f"{len(report['errors']['run'])} / "
+                  f"{len(report['errors']['baseline'])}")
+            for phrase, change in report["changes"].items():
+                print(f"  '{phrase}': сдвигов {len(change['rank_shifts'])}, "
+                      f"пропало {len(change['dropped'])}, новых "
+                      f"{len(change['new'])}, изменено "
+                      f"{len(change['changed'])}")
+    finally:
+        store.close()
+
+
+def _collect(args, config: ConfigProvider, store: FingerprintStore) -> None:
+    data = DataProvider()
+    server = None
+    base_url = config.get("api", "base_url")
+    if args.stand_in:
+        from stand_in.WebGateServer import WebGateServer
+        server = WebGateServer(
+            catalog_size=config.getint("stand_in", "catalog_size"),
+            seed=config.getint("stand_in", "seed")).start()
+        base_url = server.base_url
+    # клиент поиска - из той же фабрики, что в тестах и LoadRunner
+    transport = Transport.from_config()
+    factory = ApiClientFactory.from_config(base_url, transport)
+    attributes = tuple(config.get("fingerprints", "attributes").split(","))
+    try:
+        api_search = factory.search()
+        run_id = store.begin_run(args.run, {"base_url": base_url,
+                                            "dataset": args.dataset})
+        store.put_many(run_id, collect(
+            api_search, data.iter_dataset(args.dataset),
+            config.getint("api", "concurrency"), attributes))
+    finally:
+        factory.close()
+        transport.close()
+        if server is not None:
+            server.stop()
+    run = next(run for run in store.runs() if run["name"] == args.run)
+    print(f"{args.run}: {run['phrases']} фраз, ошибок {run['errors']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from configuration.ConfigProvider import ConfigProvider
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """Запрос не отправлен: автомат эндпоинта разомкнут."""
+
+
+class TokenBucket:
+    """
+    Ограничение темпа запросов: не более 'rate' запросов в секунду
+    с допустимым всплеском 'burst'. Ответ Retry-After приостанавливает
+    выдачу токенов до указанного момента.
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Ожидает и забирает один токен."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if self.rate:
+                    self.tokens = min(
+                        self.capacity,
+                        self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                delay = self.blocked_until - now
+                if delay <= 0:
+                    if not self.rate:
+                        return
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+    def block(self, seconds: float) -> None:
+        """Приостанавливает выдачу токенов на 'seconds' секунд."""
+        with self.lock:
+            self.blocked_until = max(self.blocked_until,
+                                     time.monotonic() + seconds)
+
+
+class AdaptiveConcurrency:
+    """
+    Адаптивное ограничение числа одновременных запросов (AIMD):
+    при 429/503 лимит уменьшается вдвое, при успешных ответах
+    плавно растет до максимума.
+    """
+
+    def __init__(self, maximum: int, minimum: int = 1) -> None:
+        self.maximum = maximum
+        self.minimum = minimum
+        self.limit = float(maximum)
+        self.in_flight = 0
+        self.condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self.condition:
+            while self.in_flight >= int(self.limit):
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool) -> None:
+        with self.condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(self.minimum, self.limit / 2)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self.condition.notify_all()
+
+
+class CircuitBreaker:
+    """
+    Автомат эндпоинта: после 'failures' ошибок подряд (5xx или ошибки
+    соединения) запросы не отправляются 'reset' секунд, затем
+    пропускается один пробный запрос.
+    """
+
+    def __init__(self, failures: int = 5, reset: float = 30) -> None:
+        self.threshold = failures
+        self.reset = reset
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    def before(self, name: str) -> None:
+        """
+        Проверяет, можно ли отправить запрос.
+        Если автомат разомкнут, выбрасывается исключение CircuitOpenError.
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return
+            if (time.monotonic() - self.opened_at >= self.reset and
+                    not self.trial):
+                self.trial = True
+                return
+        raise CircuitOpenError(
+            f"Эндпоинт {name} временно недоступен: {self.failures} "
+            f"ошибок подряд, повтор через {self.reset} сек.")
+
+    def record(self, success: bool) -> None:
+        with self.lock:
+            self.trial = False
+            if success:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+
+class Throttle:
+    """
+    Защита API-клиентов от перегрузки сервиса и ложных падений тестов:
+    - Ограничение темпа запросов по эндпоинтам (TokenBucket),
+    - Адаптивное число одновременных запросов (AdaptiveConcurrency),
+    - Повторы идемпотентных запросов (GET/PUT/DELETE) при 429/5xx
+      с учетом Retry-After,
+    - Автомат отключения эндпоинта при серии ошибок (CircuitBreaker).
+    """
+    IDEMPOTENT = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE"))
+    THROTTLED = frozenset((429, 503))
+    RETRY_STATUSES = frozenset((429, 502, 503, 504))
+
+    def __init__(self, rates: dict = None, default_rate: float = 0,
+                 burst: int = 10, max_concurrency: int = 10,
+                 min_concurrency: int = 1, max_retries: int = 3,
+                 backoff: float = 0.5, breaker_failures: int = 5,
+                 breaker_reset: float = 30) -> None:
+        """
+        Инициализация защиты.
+            rates: dict - {путь эндпоинта (например, '/v1/cart'):
+                   запросов в секунду}, 0 - без ограничения,
+            default_rate: float - темп для остальных эндпоинтов,
+            burst: int - допустимый всплеск запросов,
+            max_concurrency, min_concurrency: int - границы числа
+                   одновременных запросов,
+            max_retries: int - количество повторов идемпотентных запросов,
+            backoff: float - базовая пауза между повторами (сек.),
+            breaker_failures: int - ошибок подряд до размыкания автомата,
+            breaker_reset: float - время до пробного запроса (сек.).
+        """
+        self.rates = sorted((rates or {}).items(),
+                            key=lambda item: len(item[0]), reverse=True)
+        self.patterns = [(re.compile(re.escape(path) + r"(?=/|$)"), path)
+                         for path, _ in self.rates]
+        self.default_rate = default_rate
+        self.burst = burst
+        self.concurrency = AdaptiveConcurrency(max_concurrency,
+                                               min_concurrency)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.breaker_failures = breaker_failures
+        self.breaker_reset = breaker_reset
+        self.buckets = {}
+        self.breakers = {}
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        """
+        Создает защиту по секциям [throttle] и [rate_limits] файла
+        test_config.ini. Возвращает None, если защита выключена.
+        Ключи [rate_limits] - имена эндпоинтов секции [api]
+        (cart, search, ...), значения - запросов в секунду.
+        """
+        config = ConfigProvider()
+        if not config.getboolean("throttle", "enabled"):
+            return None
+        rates = {config.get("api", name): float(value)
+                 for name, value in config.items("rate_limits")}
+        return cls(rates,
+                   default_rate=config.getfloat("throttle", "rate"),
+                   burst=config.getint("throttle", "burst"),
+                   max_concurrency=config.getint("throttle",
+                                                 "max_concurrency"),
+                   min_concurrency=config.getint("throttle",
+                                                 "min_concurrency"),
+                   max_retries=config.getint("throttle", "max_retries"),
+                   backoff=config.getfloat("throttle", "backoff"),
+                   breaker_failures=config.getint("throttle",
+                                                  "breaker_failures"),
+                   breaker_reset=config.getfloat("throttle",
+                                                 "breaker_reset"))
+
+    def _endpoint(self, url: str) -> tuple:
+        """Эндпоинт запроса и его TokenBucket/CircuitBreaker."""
+        path = urlsplit(url).path
+        name, rate = path, self.default_rate
+        for (pattern, endpoint), (_, endpoint_rate) in zip(self.patterns,
+                                                           self.rates):
+            if pattern.search(path):
+                name, rate = endpoint, endpoint_rate
+                break
+        with self.lock:
+            if name not in self.buckets:
+                self.buckets[name] = TokenBucket(rate, self.burst)
+                self.breakers[name] = CircuitBreaker(
+                    self.breaker_failures, self.breaker_reset)
+            return name, self.buckets[name], self.breakers[name]
+
+    def call(self, method: str, url: str, send) -> requests.Response:
+        """
+        Выполняет запрос 'send()' с ограничением темпа, адаптивной
+        конкурентностью, повторами и автоматом отключения.
+        """
+        name, bucket, breaker = self._endpoint(url)
+        retries = self.max_retries if method.upper() in self.IDEMPOTENT \
+            else 0
+        attempt = 0
+        while True:
+            breaker.before(name)
+            status = None
+            try:
+                bucket.acquire()
+                self.concurrency.acquire()
+                try:
+                    response = send()
+                    status = response.status_code
+                finally:
+                    self.concurrency.release(
+                        throttled=status in self.THROTTLED)
+            except requests.RequestException:
+                if attempt >= retries:
+                    raise
+            else:
+                throttled = status in self.THROTTLED
+                retry_after = self._retry_after(response) if throttled \
+                    else None
+                if retry_after is not None:
+                    bucket.block(retry_after)
+                if status not in self.RETRY_STATUSES or attempt >= retries:
+                    return response
+                response.close()
+                if retry_after is not None:
+                    # паузу выдерживает TokenBucket эндпоинта
+                    attempt += 1
+                    continue
+            finally:
+                # результат учитывается при любом исключении, иначе
+                # пробный запрос оставит автомат полуразомкнутым
+                breaker.record(success=status is not None and status < 500)
+            time.sleep(self.backoff * 2 ** attempt)
+            attempt += 1
+
+    @staticmethod
+    def _retry_after(response):
+        """Пауза из заголовка Retry-After (в секундах), если он есть."""
+        if response is None:
+            return None
+        value = response.headers.get("Retry-After", "")
+        try:
+            return max(float(value), 0)
+        except ValueError:
+            return None
@@ -0,0 +1,203 @@
+import re
+import threading
+import time
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from api_utils.Cassette import Cassette
+from api_utils.Throttle import Throttle
+from configuration.ConfigProvider import ConfigProvider
+
+
+class Transport:
+    """
+    Общий транспорт для API-запросов на базе постоянной сессии requests:
+    - Переиспользование TCP/TLS-соединений (keep-alive),
+    - Пул соединений заданного размера на каждый хост,
+    - Таймауты на подключение и чтение ответа,
+    - Запись и воспроизведение обменов через кассету (Cassette),
+    - Наблюдатели (observers) за каждым выполненным запросом,
+    - Ограничение темпа, повторы и автомат отключения (Throttle).
+    """
+
+    def __init__(self, pool_connections: int = 4, pool_maxsize: int = 10,
+                 connect_timeout: float = 5, read_timeout: float = 30) -> None:
+        """
+        Инициализация транспорта.
+            pool_connections: int - количество хостов, для которых
+                              хранятся пулы соединений,
+            pool_maxsize: int - максимальное число соединений на хост,
+            connect_timeout: float - таймаут на подключение (сек.),
+            read_timeout: float - таймаут на чтение ответа (сек.).
+        """
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_maxsize = pool_maxsize
+        self.cassette = None
+        self.observers = []
+        self.throttle = None
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections,
+                              pool_maxsize=pool_maxsize,
+                              pool_block=True)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_config(cls) -> "Transport":
+        """
+        Создает транспорт с настройками из секции [api] файла
+        test_config.ini (pool_connections, pool_maxsize,
+        connect_timeout, read_timeout) и защитой из секции [throttle].
+        """
+        config = ConfigProvider()
+        transport = cls(
+            pool_connections=config.getint("api", "pool_connections"),
+            pool_maxsize=config.getint("api", "pool_maxsize"),
+            connect_timeout=config.getfloat("api", "connect_timeout"),
+            read_timeout=config.getfloat("api", "read_timeout"))
+        transport.throttle = Throttle.from_config()
+        return transport
+
+    def request(self, method: str, url: str,
+                **kwargs) -> requests.Response:
+        """
+        Выполняет HTTP-запрос через общую сессию.
+        Если таймаут не передан явно, используются таймауты транспорта.
+        Если подключена кассета, ответ записывается в нее (record)
+        или берется из нее без обращения к сети (replay).
+        После запроса вызываются наблюдатели вида
+        observer(method, url, response, elapsed), где response - None
+        при ошибке соединения, elapsed - время запроса в секундах.
+        Потоковый ответ (stream=True) учитывается после чтения тела
+        или закрытия ответа, размер прочитанного тела - в body_bytes.
+        Ответы из кассеты (replay) наблюдателям не передаются: их время
+        не отражает работу API.
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        cassette = self.cassette
+        if not self.observers or (cassette is not None and
+                                  cassette.mode == "replay"):
+            return self._send(method, url, kwargs)
+        started = time.perf_counter()
+
+        def notify(response) -> None:
+            elapsed = time.perf_counter() - started
+            for observer in list(self.observers):
+                observer(method, url, response, elapsed)
+
+        try:
+            response = self._send(method, url, kwargs)
+        except BaseException:
+            notify(None)
+            raise
+        if kwargs.get("stream") and not response._content_consumed:
+            _observe_body(response, notify)
+        else:
+            notify(response)
+        return response
+
+    def _send(self, method: str, url: str,
+              kwargs: dict) -> requests.Response:
+        cassette = self.cassette
+        if cassette is None:
+            return self._network(method, url, kwargs)
+        key = cassette.key(method, url, kwargs.get("params"),
+                           Cassette.request_body(kwargs))
+        if cassette.mode == "replay":
+            return cassette.play(key)
+        response = self._network(method, url, kwargs)
+        cassette.record(key, response)
+        return response
+
+    def _network(self, method: str, url: str,
+                 kwargs: dict) -> requests.Response:
+        if self.throttle is None:
+            return self.session.request(method, url, **kwargs)
+        return self.throttle.call(
+            method, url, lambda: self.session.request(method, url, **kwargs))
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        self.session.close()
+
+
+def _observe_body(response: requests.Response, notify) -> None:
+    """
+    Откладывает вызов notify(response) потокового ответа до конца
+    чтения тела (iter_content, iter_lines, content) или закрытия ответа;
+    прочитанные байты считаются в response.body_bytes.
+    """
+    iter_content = response.iter_content
+    close = response.close
+    done = threading.Lock()
+
+    def finish() -> None:
+        if done.acquire(blocking=False):
+            notify(response)
+
+    def counting(*args, **kwargs):
+        for chunk in iter_content(*args, **kwargs):
+            if isinstance(chunk, bytes):
+                response.body_bytes += len(chunk)
+            yield chunk
+        finish()
+
+    def closing() -> None:
+        try:
+            close()
+        finally:
+            finish()
+
+    response.body_bytes = 0
+    response.iter_content = counting
+    response.close = closing
+
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_template(method: str, url: str) -> str:
+    """
+    Возвращает шаблон эндпоинта для группировки запросов:
+    метод и путь без query-строки, числовые сегменты заменены на {id}
+    (например, 'DELETE /api/v1/cart/product/{id}').
+    """
+    path = _ID_SEGMENT.sub("/{id}", urlsplit(url).path)
+    return f"{method.upper()} {path}"
+
+
+_shared_transport = None
+_shared_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """
+    Возвращает общий для всех API-клиентов транспорт,
+    создавая его при первом обращении.
+    """
+    global _shared_transport
+    if _shared_transport is None:
+        with _shared_lock:
+            if _shared_transport is None:
+                _shared_transport = Transport.from_config()
+    return _shared_transport
+
+
+def close_transport() -> None:
+    """Закрывает общий транспорт и освобождает соединения."""
+    global _shared_transport
+    with _shared_lock:
+        if _shared_transport is not None:
+            _shared_transport.close()
+            _shared_transport = None
@@ -1,16 +1,97 @@
 import configparser
+import os
+import threading
+from pathlib import Path
 
-global_config = configparser.ConfigParser()
-global_config.read("test_config.ini")
+CONFIG_PATH = Path(__file__).resolve().parent.parent / "test_config.ini"
+ENV_PREFIX = "CG_"
+
+
+class _Settings:
+    """
+    Настройки проекта, загружаемые из test_config.ini при первом
+    обращении (один раз на процесс), с кэшем типизированных значений.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.config = None
+        self.profile = None
+        self.cache = {}
+
+    def load(self) -> configparser.ConfigParser:
+        if self.config is None:
+            with self.lock:
+                if self.config is None:
+                    config = configparser.ConfigParser()
+                    path = os.environ.get(ENV_PREFIX + "CONFIG",
+                                          CONFIG_PATH)
+                    config.read(path, encoding="utf-8")
+                    self.profile = self.profile or os.environ.get(
+                        ENV_PREFIX + "PROFILE", "prod")
+                    self.config = config
+        return self.config
+
+    def reset(self, profile: str = None) -> None:
+        with self.lock:
+            self.config = None
+            self.profile = profile
+            self.cache = {}
+
+
+_settings = _Settings()
 
 
 class ConfigProvider:
     """
-    Класс настройки конфигурации проекта
+    Класс настройки конфигурации проекта.
+    Файл test_config.ini читается при первом обращении, путь к нему
+    не зависит от текущего каталога.
+    Порядок поиска значения:
+    - переменная окружения CG_<СЕКЦИЯ>_<СВОЙСТВО>
+      (например, CG_API_BASE_URL),
+    - секция профиля [<секция>:<профиль>] (профиль задается
+      переменной CG_PROFILE или use_profile, например, local),
+    - секция [<секция>].
     """
 
     def __init__(self):
-        self.config = global_config
+        self.settings = _settings
+
+    @property
+    def config(self) -> configparser.ConfigParser:
+        return self.settings.load()
+
+    @staticmethod
+    def use_profile(profile: str) -> None:
+        """
+        Переключает профиль настроек (prod, local, ...) и сбрасывает
+        кэш значений.
+        """
+        _settings.reset(profile)
+
+    @property
+    def profile(self) -> str:
+        self.settings.load()
+        return self.settings.profile
+
+    def _raw(self, section: str, prop: str):
+        env = f"{ENV_PREFIX}{section}_{prop}".upper()
+        if env in os.environ:
+            return os.environ[env]
+        config = self.config
+        profile_section = f"{section}:{self.settings.profile}"
+        if config.has_option(profile_section, prop):
+            return config.get(profile_section, prop)
+        return config[section].get(prop)
+
+    def _cached(self, kind: str, section: str, prop: str, convert):
+        key = (kind, section, prop)
+        cache = self.settings.cache
+        if key not in cache:
+            value = self._raw(section, prop)
+            cache[key] = value if value is None else convert(value)
+        return cache[key]
 
     def get(self, section: str, prop: str):
         """
@@ -20,21 +101,52 @@ class ConfigProvider:
             prop: str - свойство для настройки работы
                     (напр., URL, endpoint, timeout)
         """
-        return self.config[section].get(prop)
+        return self._cached("str", section, prop, str)
 
     def getint(self, section: str, prop: int):
-        return self.config[section].getint(prop)
+        return self._cached("int", section, prop, int)
+
+    def getfloat(self, section: str, prop: str) -> float:
+        return self._cached("float", section, prop, float)
+
+    def getboolean(self, section: str, prop: str) -> bool:
+        return self._cached("bool", section, prop, self._to_bool)
+
+    @staticmethod
+    def _to_bool(value: str) -> bool:
+        states = configparser.ConfigParser.BOOLEAN_STATES
+        if value.lower() not in states:
+            raise ValueError(f"Не логическое значение: '{value}'")
+        return states[value.lower()]
+
+    def items(self, section: str) -> list:
+        """Все пары (свойство, значение) секции с учетом профиля."""
+        key = ("items", section, None)
+        cache = self.settings.cache
+        if key not in cache:
+            config = self.config
+            props = list(config[section])
+            profile_section = f"{section}:{self.settings.profile}"
+            if config.has_section(profile_section):
+                props += [prop for prop in config[profile_section]
+                          if prop not in props]
+            cache[key] = tuple((prop, self._raw(section, prop))
+                               for prop in props)
+        return list(cache[key])
 
     # специальные методы
     # UI: создание URL для перехода по страницам сайта
     def get_ui_url(self, url) -> str:
-        return self.config["ui"].get(url)
+        return self.get("ui", url)
 
     # API: base_url
     def get_api_url(self, endpoint: None) -> str:
-        base_url = self.config["api"].get("base_url")
-        if endpoint is None:
-            resp = base_url
-        else:
-            resp = base_url + self.config["api"].get(endpoint)
-        return resp
+        key = ("api_url", "api", endpoint)
+        cache = self.settings.cache
+        if key not in cache:
+            base_url = self.get("api", "base_url")
+            if endpoint is None:
+                cache[key] = base_url
+            else:
+                cache[key] = base_url + self.get("api", endpoint)
+        return cache[key]
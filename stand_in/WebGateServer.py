@@ -0,0 +1,395 @@
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class Catalog:
+    """
+    Засеянный каталог товаров для локального стенда:
+    - Список товаров с ценой, наличием и категорией,
+    - Поиск товаров по фразе в наименовании.
+    """
+    FIXED_TITLES = [
+        "Над пропастью во ржи",
+        "Портрет Дориана Грея",
+        "Портрет художника в юности",
+        "Manga Art. Рисуем мангу",
+        "1905 год. Первая русская революция",
+        "Мастер и Маргарита",
+        "Преступление и наказание",
+    ]
+    WORDS = ["Тайна", "Город", "Сад", "Море", "Дорога", "История", "Ночь",
+             "Зима", "Сказки", "Легенды", "Остров", "Время", "Путь", "Дом"]
+    ADJECTIVES = ["Северный", "Старый", "Забытый", "Последний", "Новый",
+                  "Белый", "Тихий", "Большой", "Дальний", "Золотой"]
+    CATEGORIES = [(110001, "Художественная литература"),
+                  (110002, "Комиксы и манга"),
+                  (110003, "История"),
+                  (110004, "Детская литература")]
+
+    def __init__(self, size: int = 500, seed: int = 1) -> None:
+        """
+        Инициализация каталога.
+            size: int - количество товаров,
+            seed: int - зерно генератора для воспроизводимости данных.
+        """
+        rnd = random.Random(seed)
+        self.products = []
+        titles = list(self.FIXED_TITLES)
+        while len(titles) < size:
+            titles.append(f"{rnd.choice(self.ADJECTIVES)} "
+                          f"{rnd.choice(self.WORDS).lower()}")
+        for number, title in enumerate(titles[:size]):
+            product_id = 2000000 + number
+            category_id, category = rnd.choice(self.CATEGORIES)
+            # первый товар всегда доступен для покупки
+            stock = rnd.choice([0, 3, 10, 25]) if number else 10
+            price = rnd.randrange(150, 3000, 10)
+            self.products.append({
+                "id": product_id,
+                "code": str(product_id),
+                "title": title,
+                "price": price,
+                "oldPrice": price + rnd.randrange(0, 500, 10),
+                "stock": stock,
+                "status": "canBuy" if stock else "notAvailable",
+                "category": {"id": category_id, "title": category},
+            })
+        self.by_id = {product["id"]: product for product in self.products}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", text).strip().lower()
+
+    def search(self, phrase: str) -> list:
+        """
+        Возвращает товары, в наименовании которых есть фраза.
+        Товары, наименование которых начинается с фразы, идут первыми.
+        """
+        phrase = self.normalize(phrase)
+        if len(phrase) < 2:
+            return []
+        found = [product for product in self.products
+                 if phrase in product["title"].lower()]
+        found.sort(key=lambda product:
+                   not product["title"].lower().startswith(phrase))
+        return found
+
+
+class CartStore:
+    """
+    Корзины товаров в памяти, отдельная корзина на каждый токен
+    авторизации.
+    """
+
+    def __init__(self, catalog: Catalog) -> None:
+        self.catalog = catalog
+        self.carts = {}
+        self.lock = threading.Lock()
+        self.next_item_id = 1
+
+    def _cart(self, token: str) -> dict:
+        return self.carts.setdefault(token, {})
+
+    def products(self, token: str) -> list:
+        with self.lock:
+            return [dict(item) for item in self._cart(token).values()]
+
+    def add(self, token: str, goods_id: int) -> bool:
+        product = self.catalog.by_id.get(goods_id)
+        if product is None or not product["stock"]:
+            return False
+        with self.lock:
+            cart = self._cart(token)
+            for item in cart.values():
+                if item["goodsId"] == goods_id:
+                    item["quantity"] += 1
+                    return True
+            item_id = self.next_item_id
+            self.next_item_id += 1
+            cart[item_id] = {"id": item_id, "goodsId": goods_id,
+                             "title": product["title"],
+                             "quantity": 1, "cost": product["price"]}
+            return True
+
+    def remove(self, token: str, item_id: int) -> bool:
+        with self.lock:
+            return self._cart(token).pop(item_id, None) is not None
+
+    def clear(self, token: str) -> None:
+        with self.lock:
+            self._cart(token).clear()
+
+    def set_quantities(self, token: str, items: list) -> None:
+        with self.lock:
+            cart = self._cart(token)
+            for change in items:
+                item = cart.get(int(change["id"]))
+                if item is None:
+                    continue
+                if int(change["quantity"]) > 0:
+                    item["quantity"] = int(change["quantity"])
+                else:
+                    cart.pop(item["id"])
+
+
+class WebGateHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик запросов локального стенда web-gate.
+    Реализует эндпоинты из секции [api] файла test_config.ini.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server_version = "WebGateStandIn/1.0"
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        self._dispatch("GET")
+
+    def do_POST(self) -> None:
+        self._dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self._dispatch("PUT")
+
+    def do_DELETE(self) -> None:
+        self._dispatch("DELETE")
+
+    def _dispatch(self, method: str) -> None:
+        server = self.server
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        parts = urlsplit(self.path)
+        path = parts.path
+        if path.startswith(server.prefix):
+            path = path[len(server.prefix):]
+        query = {key: values[-1]
+                 for key, values in parse_qs(parts.query).items()}
+
+        if server.latency:
+            time.sleep(server.latency + server.random.uniform(
+                0, server.jitter))
+        if server.error_rate and server.random.random() < server.error_rate:
+            return self._send(503, {"message": "Service Unavailable"},
+                              {"Retry-After": "1"})
+
+        token = self.headers.get("Authorization")
+        if path.startswith("/v1/cart") and not token:
+            return self._send(401, {"message": "Unauthorized"})
+
+        route = ROUTES.get((method, path))
+        if route is None and method == "DELETE" and \
+                path.startswith("/v1/cart/product/"):
+            route = WebGateHandler.cart_delete_product
+        if route is None:
+            return self._send(404, {"message": "Not Found"})
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            return self._send(400, {"message": "Bad Request"})
+        return route(self, token, path, query, payload)
+
+    def _send(self, status: int, payload=None, headers: dict = None) -> None:
+        data = b"" if payload is None else json.dumps(
+            payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _cart_payload(self, token: str) -> dict:
+        products = self.server.carts.products(token)
+        return {"products": products,
+                "cost": sum(item["cost"] * item["quantity"]
+                            for item in products),
+                "quantity": len(products)}
+
+    def cart_info(self, token, path, query, payload) -> None:
+        self._send(200, self._cart_payload(token))
+
+    def cart_short(self, token, path, query, payload) -> None:
+        products = self.server.carts.products(token)
+        self._send(200, {"data": {"quantity": len(products)}})
+
+    def cart_clear(self, token, path, query, payload) -> None:
+        self.server.carts.clear(token)
+        self._send(204)
+
+    def cart_add_product(self, token, path, query, payload) -> None:
+        goods_id = (payload or {}).get("id")
+        try:
+            added = self.server.carts.add(token, int(goods_id))
+        except (TypeError, ValueError):
+            added = False
+        if not added:
+            return self._send(422, {"message": "Товар недоступен"})
+        self._send(200, {})
+
+    def cart_delete_product(self, token, path, query, payload) -> None:
+        try:
+            item_id = int(path.rsplit("/", 1)[-1])
+        except ValueError:
+            return self._send(404, {"message": "Not Found"})
+        if not self.server.carts.remove(token, item_id):
+            return self._send(404, {"message": "Not Found"})
+        self._send(204)
+
+    def cart_change_quantity(self, token, path, query, payload) -> None:
+        if not isinstance(payload, list):
+            return self._send(400, {"message": "Bad Request"})
+        self.server.carts.set_quantities(token, payload)
+        self._send(200, self._cart_payload(token))
+
+    @staticmethod
+    def _page(items: list, query: dict, page_key: str,
+              size_key: str) -> tuple:
+        """
+        Страница элементов и ['meta'] с пагинацией.
+        В случае нечислового номера или размера страницы выбрасывается
+        исключение ValueError.
+        """
+        page = max(int(query.get(page_key, 1)), 1)
+        size = max(int(query.get(size_key, 48)), 1)
+        total_pages = max((len(items) + size - 1) // size, 1)
+        meta = {"pagination": {"currentPage": page, "perPage": size,
+                               "totalPages": total_pages,
+                               "total": len(items)}}
+        return items[(page - 1) * size:page * size], meta
+
+    def search(self, token, path, query, payload) -> None:
+        found = self.server.catalog.search(query.get("phrase", ""))
+        try:
+            page, meta = self._page(found, query, "products[page]",
+                                    "products[per-page]")
+        except ValueError:
+            return self._send(400, {"message": "Bad Request"})
+        included = [{"type": "product", "id": str(product["id"]),
+                     "attributes": product} for product in page]
+        self._send(200, {
+            "data": {"type": "search", "id": query.get("phrase", ""),
+                     "relationships": {"products": {"data": [
+                         {"type": "product", "id": item["id"]}
+                         for item in included]}}},
+            "included": included,
+            "meta": meta})
+
+    def products(self, token, path, query, payload) -> None:
+        try:
+            page, meta = self._page(self.server.catalog.products, query,
+                                    "page", "per-page")
+        except ValueError:
+            return self._send(400, {"message": "Bad Request"})
+        self._send(200, {
+            "data": [{"type": "product", "id": str(product["id"]),
+                      "attributes": product} for product in page],
+            "meta": meta})
+
+    def track_visit(self, token, path, query, payload) -> None:
+        self._send(200, {"requestUri": "https://www.chitai-gorod.ru/"})
+
+
+ROUTES = {
+    ("GET", "/v1/cart"): WebGateHandler.cart_info,
+    ("DELETE", "/v1/cart"): WebGateHandler.cart_clear,
+    ("PUT", "/v1/cart"): WebGateHandler.cart_change_quantity,
+    ("GET", "/v1/cart/short"): WebGateHandler.cart_short,
+    ("POST", "/v1/cart/product"): WebGateHandler.cart_add_product,
+    ("GET", "/v2/search/product"): WebGateHandler.search,
+    ("GET", "/v2/products"): WebGateHandler.products,
+    ("GET", "/v1/track-visit"): WebGateHandler.track_visit,
+    ("POST", "/v1/track-visit"): WebGateHandler.track_visit,
+}
+
+
+class WebGateServer(ThreadingHTTPServer):
+    """
+    Локальный стенд web-gate для API-тестов без сети и живого токена:
+    - Корзины в памяти по токену авторизации,
+    - Засеянный каталог товаров и поиск,
+    - Настраиваемая задержка ответов и доля ошибок (503).
+    """
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 prefix: str = "/api", latency_ms: float = 0,
+                 jitter_ms: float = 0, error_rate: float = 0,
+                 catalog_size: int = 500, seed: int = 1) -> None:
+        """
+        Инициализация стенда.
+            host: str, port: int - адрес сервера (port=0 - свободный порт),
+            prefix: str - префикс пути, как в base_url ('/api'),
+            latency_ms: float - задержка каждого ответа (мс),
+            jitter_ms: float - случайная добавка к задержке (мс),
+            error_rate: float - доля ответов 503 (от 0 до 1),
+            catalog_size: int - количество товаров в каталоге,
+            seed: int - зерно генератора каталога и ошибок.
+        """
+        super().__init__((host, port), WebGateHandler)
+        self.prefix = prefix
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+        self.catalog = Catalog(catalog_size, seed)
+        self.carts = CartStore(self.catalog)
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{self.prefix}"
+
+    def start(self) -> "WebGateServer":
+        """Запускает сервер в фоновом потоке."""
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="web-gate-stand-in",
+            daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Останавливает сервер и закрывает сокет."""
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Локальный стенд web-gate для API-тестов")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--error-rate", type=float, default=0)
+    parser.add_argument("--catalog-size", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    server = WebGateServer(args.host, args.port,
+                           latency_ms=args.latency_ms,
+                           jitter_ms=args.jitter_ms,
+                           error_rate=args.error_rate,
+                           catalog_size=args.catalog_size, seed=args.seed)
+    print(f"web-gate stand-in: {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
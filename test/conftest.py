@@ -1,82 +1,392 @@
+import hashlib
+import os
+import re
+import warnings
 import allure
 import pytest
-import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service as ChromeService
-from webdriver_manager.chrome import ChromeDriverManager
+from api_utils.AccountPool import AccountPool
+from api_utils.ApiClientFactory import ApiClientFactory
 from api_utils.CartApi import CartApi
+from api_utils.CartState import CartModel, TrackedCart
 from api_utils.BaseApi import BaseApi
 from api_utils.SearchApi import SearchApi
+from api_utils.AsyncCartApi import AsyncCartApi
+from api_utils.AsyncSearchApi import AsyncSearchApi
+from api_utils.Cassette import Cassette
+from api_utils.Metrics import RequestMetrics
+from api_utils.ProductCatalog import ProductCatalog
+from stand_in.WebGateServer import WebGateServer
+from api_utils.Transport import Transport, get_transport, close_transport
 from configuration.ConfigProvider import ConfigProvider
 from testdata.DataProvider import DataProvider
+from testdata.Dataset import select_indices
+from ui_pages.BrowserLauncher import ChromeProfile, DriverResolver
+from ui_pages.BrowserPool import BrowserPool
+from ui_pages.RequestBlocker import RequestBlocker
+from ui_pages.Waiter import Waiter
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--api-cassette", action="store", default=None,
+        choices=Cassette.MODES,
+        help="""Режим кассет для API-запросов: off - без кассет,
+ record - запись обменов, replay - воспроизведение без сети.
+ По умолчанию - значение cassette_mode из test_config.ini""")
+    parser.addoption(
+        "--api-stand-in", action="store_true", default=False,
+        help="""Запускать API-тесты на локальном стенде web-gate
+ (настройки - секция [stand_in] файла test_config.ini)""")
+    parser.addoption(
+        "--api-load", action="store_true", default=False,
+        help="""Запускать нагрузочные API-тесты (маркер load): поиск
+ по всему набору фраз одновременно""")
+    parser.addoption(
+        "--dataset-sample", action="store", default=None, type=int,
+        help="""Случайная выборка из N записей каждого набора данных
+ (по умолчанию - sample из секции [data] test_config.ini, 0 - все)""")
+    parser.addoption(
+        "--dataset-seed", action="store", default=None, type=int,
+        help="Зерно выборки записей наборов данных")
+    parser.addoption(
+        "--dataset-shard", action="store", default=None,
+        help="""Часть наборов данных вида K/N для запуска: каждая N-я
+ запись, начиная с K-й""")
+
+
+def _browser_pool_size() -> int:
+    """
+    Наибольший размер пула браузеров воркера: общий бюджет
+    browser_budget делится между воркерами xdist (не меньше 1 браузера
+    на воркер), без бюджета - 1 браузер на воркер. Браузеры запускаются
+    при аренде, поэтому лишние браузеры не запускаются.
+    """
+    budget = ConfigProvider().getint("ui", "browser_budget") or 0
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 1))
+    return max(budget // workers, 1)
+
+
+@pytest.fixture(scope="session")
+def browser_pool() -> BrowserPool:
+    """
+    Фикстура запускает пул браузеров воркера на всю сессию (бюджет
+    браузеров, количество аренд до перезапуска, chromedriver и профиль
+    быстрого запуска - секция [ui] test_config.ini) и закрывает
+    браузеры по окончании тестов.
+    """
+    config = ConfigProvider()
+    with allure.step("Найти chromedriver"):
+        driver_path = DriverResolver.from_config().resolve()
+    profile = ChromeProfile.from_config()
+    # журнал событий CDP для подсчета заблокированных запросов
+    profile.capabilities.update(RequestBlocker.from_config().capabilities())
+    with allure.step("Подготовить профиль браузера"):
+        profile.warm(driver_path)
+
+    # без неявного ожидания: страницы используют только явные ожидания
+    # (ui_pages.Waiter), неявное ожидание удлиняло бы каждую проверку
+    with allure.step("Запустить пул браузеров"):
+        pool = BrowserPool(lambda: profile.launch(driver_path),
+                           size=_browser_pool_size(),
+                           max_uses=config.getint("ui", "browser_max_uses"),
+                           origins=[config.get("ui", "base_url")])
+    yield pool
+    with allure.step("Закрыть браузеры"):
+        pool.close()
+
+
+@pytest.fixture
+def browser(browser_pool: BrowserPool):
+    """
+    Фикстура берет браузер из пула на время теста; после теста
+    браузер сбрасывается (cookies, данные сайта, вкладки)
+    и возвращается в пул. Сторонние запросы страниц блокируются
+    (секция [ui] test_config.ini); время ожиданий элементов
+    и заблокированные запросы прикрепляются к отчету Allure.
+    """
+    with allure.step("Получить браузер из пула"):
+        browser = browser_pool.lease()
+        blocker = RequestBlocker.for_driver(browser)
+        blocker.collect(browser)
+    yield browser
+    blocked = blocker.collect(browser)
+    if blocked:
+        allure.attach(RequestBlocker.report(blocked),
+                      name="Заблокированные запросы",
+                      attachment_type=allure.attachment_type.TEXT)
+    waiter = Waiter.for_driver(browser)
+    if waiter.history:
+        allure.attach(waiter.report(), name="Ожидания элементов",
+                      attachment_type=allure.attachment_type.TEXT)
+        waiter.history.clear()
+    with allure.step("Вернуть браузер в пул"):
+        browser_pool.release(browser)
+
+
+@pytest.fixture(scope="session")
+def api_transport() -> Transport:
+    """
+    Фикстура возвращает общий транспорт (пул соединений) для всех
+    API-клиентов сессии и закрывает его по окончании тестов.
+    """
+    yield get_transport()
+    close_transport()
+
+
+@pytest.fixture(scope="session")
+def api_base_url(request) -> str:
+    """
+    Фикстура возвращает базовый URL API: адрес локального стенда
+    web-gate при запуске с --api-stand-in, иначе base_url из
+    test_config.ini.
+    """
+    if not request.config.getoption("--api-stand-in"):
+        yield ConfigProvider().get("api", "base_url")
+        return
+
+    with allure.step("Запустить локальный стенд web-gate"):
+        config = ConfigProvider()
+        server = WebGateServer(
+            host=config.get("stand_in", "host"),
+            port=config.getint("stand_in", "port"),
+            latency_ms=config.getfloat("stand_in", "latency_ms"),
+            jitter_ms=config.getfloat("stand_in", "jitter_ms"),
+            error_rate=config.getfloat("stand_in", "error_rate"),
+            catalog_size=config.getint("stand_in", "catalog_size"),
+            seed=config.getint("stand_in", "seed")).start()
+    yield server.base_url
+    with allure.step("Остановить локальный стенд web-gate"):
+        server.stop()
+
+
+@pytest.fixture(scope="session")
+def api_metrics(request, api_transport: Transport) -> RequestMetrics:
+    """
+    Фикстура подключает сбор метрик ко всем запросам общего транспорта.
+    По окончании сессии агрегаты сохраняются в каталог metrics_dir
+    в форматах Prometheus и JSON.
+    """
+    metrics = RequestMetrics()
+    api_transport.observers.append(metrics.observe)
+    yield metrics
+    api_transport.observers.remove(metrics.observe)
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    metrics.write(os.path.join(str(request.config.rootpath),
+                               ConfigProvider().get("api", "metrics_dir")),
+                  f"-{worker}" if worker else "")
+
+
+@pytest.fixture(autouse=True)
+def api_request_metrics(request):
+    """
+    Фикстура прикрепляет к отчету Allure таблицу API-запросов теста:
+    эндпоинт, статус, размер ответа и время выполнения.
+    """
+    if "api_transport" not in request.fixturenames:
+        yield None
+        return
+
+    metrics = request.getfixturevalue("api_metrics")
+    metrics.take_records()
+    yield metrics
+    records = metrics.take_records()
+    if records:
+        allure.attach(RequestMetrics.records_table(records),
+                      name="API-запросы теста",
+                      attachment_type=allure.attachment_type.CSV)
+
+
+def _cassette_mode(config) -> str:
+    return (config.getoption("--api-cassette") or
+            ConfigProvider().get("api", "cassette_mode"))
+
+
+@pytest.fixture(autouse=True)
+def api_cassette(request):
+    """
+    Фикстура подключает к общему транспорту кассету текущего теста
+    (режимы record/replay), если тест использует API-клиенты.
+    Кассеты хранятся в каталоге cassette_dir, по файлу на тест.
+    """
+    mode = _cassette_mode(request.config)
+    if mode == "off" or "api_transport" not in request.fixturenames:
+        yield None
+        return
+
+    transport = request.getfixturevalue("api_transport")
+    base_url = request.getfixturevalue("api_base_url")
+    nodeid = request.node.nodeid
+    name = re.sub(r"[^\w.-]+", "_", nodeid.split("::", 1)[-1])
+    suffix = hashlib.sha1(nodeid.encode("utf-8")).hexdigest()[:8]
+    path = os.path.join(str(request.config.rootpath),
+                        ConfigProvider().get("api", "cassette_dir"),
+                        f"{name}-{suffix}.cassette")
+    # ключи относительно base_url: кассета стенда (случайный порт)
+    # воспроизводится на другом порту и без стенда
+    cassette = Cassette(path, mode, base_url)
+    transport.cassette = cassette
+    yield cassette
+    transport.cassette = None
+    cassette.close()
+
+
+@pytest.fixture(scope="session")
+def api_factory(api_transport: Transport,
+                api_base_url: str) -> ApiClientFactory:
+    """
+    Фикстура возвращает фабрику API-клиентов на всю сессию:
+    URL и заголовки формируются один раз, клиенты используют
+    общий транспорт.
+    """
+    with allure.step("Создание фабрики API-клиентов"):
+        factory = ApiClientFactory.from_config(api_base_url, api_transport)
+    yield factory
+    factory.close()
+
+
+@pytest.fixture
+def api_token(request):
+    """
+    Фикстура возвращает токен для API-клиентов теста: значение маркера
+    @pytest.mark.api_token("Bearer ...") или None (токен из
+    test_data.json).
+    """
+    marker = request.node.get_closest_marker("api_token")
+    return marker.args[0] if marker else None
+
+
+def _account_tokens(config) -> list:
+    """
+    Токены пула аккаунтов: 'tokens' из test_data.json (или единственный
+    'token'), на локальном стенде - по одному на воркер xdist.
+    """
+    if config.getoption("--api-stand-in"):
+        count = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 1))
+        return [f"Bearer stand-in-{number}" for number in range(count)]
+    return DataProvider().get_tokens()
 
 
 @pytest.fixture(scope="session")
-def browser():
-    with allure.step("Открыть и настроить браузер"):
-        timeout = ConfigProvider().getint("ui", "timeout")
-        browser = webdriver.Chrome(
-            service=ChromeService(ChromeDriverManager().install()))
-        browser.implicitly_wait(timeout)
-        browser.maximize_window()
-        yield browser
+def api_account_pool(request, api_base_url: str) -> AccountPool:
+    """
+    Фикстура возвращает пул аккаунтов для изоляции корзин тестов:
+    токены 'tokens' из test_data.json (или единственный 'token').
+    На локальном стенде токены создаются по одному на воркер xdist.
+    """
+    pool = AccountPool(
+        _account_tokens(request.config),
+        timeout=ConfigProvider().getfloat("accounts", "lease_timeout"))
+    yield pool
+    pool.close()
 
-    with allure.step("Закрыть браузер"):
-        browser.quit()
+
+@pytest.fixture(scope="session")
+def api_cart_models() -> dict:
+    """
+    Фикстура возвращает известные состояния корзин аккаунтов сессии:
+    {токен: CartModel}.
+    """
+    return {}
+
+
+def _account_lease_scope(fixture_name, config) -> str:
+    """
+    Область аренды аккаунта (lease в секции [accounts]):
+    worker - аккаунт на весь xdist-воркер, test - на каждый тест.
+    Если токенов меньше, чем воркеров, аккаунт берется на каждый тест:
+    при аренде на воркер лишние воркеры ждали бы аккаунт до конца
+    запуска и завершались бы по LeaseTimeout.
+    """
+    lease = ConfigProvider().get("accounts", "lease")
+    workers = int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 1))
+    if lease == "worker" and len(set(_account_tokens(config))) >= workers:
+        return "session"
+    return "function"
+
+
+@pytest.fixture(scope=_account_lease_scope)
+def api_account(request, api_factory: ApiClientFactory,
+                api_account_pool: AccountPool,
+                api_cart_models: dict) -> str:
+    """
+    Фикстура берет аккаунт из пула в аренду и возвращает его токен.
+    Корзина аккаунта проверяется при выдаче и при возврате в пул:
+    непустая корзина очищается, а аккаунт, корзину которого очистить
+    не удалось, исключается из пула. В режиме replay кассет проверки
+    не выполняются (запросы вне теста не записаны).
+    """
+    if request.scope == "session":
+        owner = os.environ.get("PYTEST_XDIST_WORKER", "master")
+    else:
+        owner = request.node.nodeid
+    verify = _cassette_mode(request.config) != "replay"
+    with allure.step("Взять аккаунт из пула"):
+        token = api_account_pool.lease(owner)
+        if verify and not api_factory.cart(token).ensure_empty():
+            api_account_pool.retire(token)
+            pytest.fail(f"Не удалось очистить корзину аккаунта "
+                        f"при выдаче из пула ({owner})")
+    api_cart_models[token] = CartModel()
+    yield token
+    api_cart_models.pop(token, None)
+    with allure.step("Вернуть аккаунт в пул"):
+        if not verify or api_factory.cart(token).ensure_empty():
+            api_account_pool.release(token)
+        else:
+            api_account_pool.retire(token)
+            warnings.warn(f"Корзина аккаунта не очищена после {owner}: "
+                          f"аккаунт исключен из пула")
+
+
+@pytest.fixture
+def api_base(api_factory: ApiClientFactory, api_token) -> BaseApi:
+    return api_factory.base(api_token)
+
+
+@pytest.fixture
+def api_cart(request, api_factory: ApiClientFactory,
+             api_token) -> CartApi:
+    """
+    Фикстура возвращает клиент корзины: с токеном маркера api_token
+    или с токеном аккаунта, арендованного из пула (api_account).
+    """
+    return api_factory.cart(api_token or
+                            request.getfixturevalue("api_account"))
+
+
+@pytest.fixture
+def api_cart_state(api_cart: CartApi, api_cart_models: dict) -> TrackedCart:
+    """
+    Фикстура возвращает клиент корзины с локальной моделью состояния.
+    Снимок корзины берется из известного состояния аккаунта (без
+    запросов) или одним чтением cart_info; после теста корзина
+    возвращается к снимку минимальным набором запросов.
+    """
+    token = api_cart.params["Authorization"]
+    cart = TrackedCart(api_cart, api_cart_models.get(token))
+    with allure.step("Снимок состояния корзины"):
+        snapshot = cart.snapshot()
+    yield cart
+    cart.restore(snapshot)
+    api_cart_models[token] = cart.model
 
 
 @pytest.fixture
-@allure.step("Создание базовых настроек для работы API-методов")
-def api_base() -> BaseApi:
-    base_url = (ConfigProvider().get("api", "base_url"))
-    track_url = (ConfigProvider().get("api", "base_url") +
-                 ConfigProvider().get("api", "track"))
-    token = DataProvider().get_token()
-    user_agent = DataProvider().get_user_agent()
-    content_type = DataProvider().get_content_type()
-    params = {
-        'Authorization': token,
-        'user-agent': user_agent,
-        'Content-Type': content_type
-    }
-    api_base = BaseApi(base_url, track_url, params)
-    return api_base
+def api_search(api_factory: ApiClientFactory, api_token) -> SearchApi:
+    return api_factory.search(api_token)
 
 
 @pytest.fixture
-@allure.step("Создание настроек для работы с корзиной (CartApi)")
-def api_cart() -> CartApi:
-    cart_url = (ConfigProvider().get("api", "base_url") +
-                ConfigProvider().get("api", "cart"))
-    cart_short_url = (ConfigProvider().get("api", "base_url") +
-                      ConfigProvider().get("api", "cart_short"))
-    token = DataProvider().get_token()
-    user_agent = DataProvider().get_user_agent()
-    content_type = DataProvider().get_content_type()
-    params = {
-        'Authorization': token,
-        'user-agent': user_agent,
-        'Content-Type': content_type
-    }
-    api_cart = CartApi(cart_url, cart_short_url, params)
-    return api_cart
+def api_cart_async(request, api_factory: ApiClientFactory,
+                   api_token) -> AsyncCartApi:
+    return api_factory.cart_async(api_token or
+                                  request.getfixturevalue("api_account"))
 
 
 @pytest.fixture
-@allure.step("Создание настроек для работы с поиском (SearchApi)")
-def api_search() -> SearchApi:
-    search_url = (ConfigProvider().get("api", "base_url") +
-                  ConfigProvider().get("api", "search"))
-    token = DataProvider().get_token()
-    user_agent = DataProvider().get_user_agent()
-    content_type = DataProvider().get_content_type()
-    params = {
-        'Authorization': token,
-        'user-agent': user_agent,
-        'Content-Type': content_type
-    }
-    api_search = SearchApi(search_url, params)
-    return api_search
+def api_search_async(api_factory: ApiClientFactory,
+                     api_token) -> AsyncSearchApi:
+    return api_factory.search_async(api_token)
 
 
 @pytest.fixture(scope="session")
@@ -85,46 +395,142 @@ def test_data():
     return DataProvider()
 
 
-@pytest.fixture(params=DataProvider().get_list("search_phrase_positive"))
+# фикстуры, параметризуемые наборами данных из test_data.json
+DATASET_FIXTURES = {
+    "search_positive": "search_phrase_positive",
+    "search_negative": "search_phrase_negative",
+    "number_phone_invalid": "number_phone_invalid",
+}
+
+
+def _dataset_option(config, name: str):
+    value = config.getoption("--dataset-" + name)
+    if value is None:
+        value = ConfigProvider().get("data", name)
+    return value
+
+
+def _dataset_indices(config, dataset) -> list:
+    """
+    Номера записей набора данных с учетом выборки (--dataset-sample,
+    --dataset-seed) и разделения набора (--dataset-shard=K/N).
+    """
+    return select_indices(
+        dataset.size(),
+        sample=int(_dataset_option(config, "sample") or 0),
+        seed=int(_dataset_option(config, "seed") or 1),
+        shard=_dataset_option(config, "shard") or None)
+
+
+def pytest_generate_tests(metafunc):
+    """
+    Параметризует фикстуры DATASET_FIXTURES номерами записей наборов
+    данных: при сборе тестов считается только количество записей,
+    сама запись читается при выполнении теста. Поддерживаются выборка
+    (--dataset-sample, --dataset-seed) и разделение набора между
+    запусками (--dataset-shard=K/N).
+    """
+    for fixture, prop in DATASET_FIXTURES.items():
+        if fixture not in metafunc.fixturenames:
+            continue
+        dataset = DataProvider().dataset(prop)
+        indices = _dataset_indices(metafunc.config, dataset)
+        metafunc.parametrize(fixture, indices, indirect=True,
+                             ids=[dataset.item_id(i) for i in indices])
+
+
+def pytest_collection_modifyitems(config, items):
+    """Нагрузочные тесты (маркер load) выполняются только с --api-load."""
+    if config.getoption("--api-load"):
+        return
+    skip = pytest.mark.skip(reason="нагрузочный тест: запуск с --api-load")
+    for item in items:
+        if "load" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+def search_positive_phrases(request) -> list:
+    """
+    Фикстура возвращает фразы набора 'search_phrase_positive'
+    с той же выборкой и частью набора, что и параметризация
+    search_positive; записи читаются из набора по номерам.
+    """
+    dataset = DataProvider().dataset("search_phrase_positive")
+    return [dataset.item(index)
+            for index in _dataset_indices(request.config, dataset)]
+
+
+@pytest.fixture
 def search_positive(request):
     """
-    Фикстура возвращает список с данными из test_data.json,
+    Фикстура возвращает запись набора данных test_data.json
     по ключу 'search_phrase_positive'.
     """
-    return request.param
+    return DataProvider().dataset("search_phrase_positive").item(
+        request.param)
 
 
-@pytest.fixture(params=DataProvider().get_list("search_phrase_negative"))
+@pytest.fixture
 def search_negative(request):
     """
-    Фикстура возвращает список с данными из test_data.json,
+    Фикстура возвращает запись набора данных test_data.json
     по ключу 'search_phrase_negative'.
     """
-    return request.param
+    return DataProvider().dataset("search_phrase_negative").item(
+        request.param)
 
 
-@pytest.fixture(params=DataProvider().get_list("number_phone_invalid"))
+@pytest.fixture
 def number_phone_invalid(request):
-    return request.param
+    return DataProvider().dataset("number_phone_invalid").item(
+        request.param)
+
+
+@pytest.fixture(scope="session")
+def api_catalog(request, api_factory: ApiClientFactory) -> ProductCatalog:
+    """
+    Фикстура возвращает каталог товаров на всю сессию: страницы
+    /v2/products загружаются один раз (одновременно) или читаются
+    из файла cache_file секции [catalog], если он моложе ttl секунд.
+    В режимах record/replay каталог записывается в кассету сессии
+    api_catalog.cassette (каталог cassette_dir) или воспроизводится
+    из нее - файл cache_file не используется.
+    """
+    config = ConfigProvider()
+    root = str(request.config.rootpath)
+    url = api_factory.urls["for_data"]
+    cache_file = config.get("catalog", "cache_file")
+    mode = _cassette_mode(request.config)
+    cassette = None
+    if mode != "off":
+        cassette_dir = config.get("api", "cassette_dir")
+        cassette = Cassette(os.path.join(root, cassette_dir,
+                                         "api_catalog.cassette"), mode,
+                            api_factory.base_url)
+    with allure.step("Загрузить каталог товаров"):
+        try:
+            return ProductCatalog.for_session(
+                url, api_factory.headers(),
+                cache_path=os.path.join(root, cache_file)
+                if cache_file else None,
+                ttl=config.getfloat("catalog", "ttl"),
+                cassette=cassette,
+                pages=config.getint("catalog", "pages"),
+                page_size=config.getint("catalog", "page_size"),
+                transport=api_factory.transport)
+        finally:
+            if cassette is not None:
+                cassette.close()
 
 
 @pytest.fixture
 @allure.step("Получить данные о товаре для проведения тестов")
-def inside_test_data() -> dict:
+def inside_test_data(api_catalog: ProductCatalog) -> dict:
     """
     Фикстура формирует тестовые данные для использования в тестах.
 
-    return -> dict - словарь с атрибутами произвольного товара.
-    """
-    for_data_url = (ConfigProvider().get("api", "base_url") +
-                    ConfigProvider().get("api", "for_data"))
-    token = DataProvider().get_token()
-    user_agent = DataProvider().get_user_agent()
-    params = {
-        'Authorization': token,
-        'user-agent': user_agent
-    }
-    path = for_data_url
-    resp = requests.get(path, headers=params)
-    dict = resp.json()["data"][0]["attributes"]
-    return dict
+    return -> dict - словарь с атрибутами товара, который есть в наличии
+              и доступен для покупки.
+    """
+    return api_catalog.pick(in_stock=True, purchasable=True)
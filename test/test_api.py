@@ -1,8 +1,13 @@
+import json
 import pytest
 import allure
-from api_utils.CartApi import CartApi
+from api_utils import Scenarios
+from api_utils.CartState import TrackedCart
 from api_utils.SearchApi import SearchApi
-from selenium.common.exceptions import NoSuchElementException
+from api_utils.AsyncSearchApi import AsyncSearchApi
+from api_utils.AsyncTransport import run_concurrently
+from api_utils.Relevance import RelevanceAnalyzer
+from configuration.ConfigProvider import ConfigProvider
 
 
 @allure.severity(allure.severity_level.CRITICAL)
@@ -12,48 +17,22 @@ from selenium.common.exceptions import NoSuchElementException
 что корзина стала пустой.""")
 @allure.feature("API: Корзина товаров")
 @pytest.mark.api
-def test_cart_clear(api_cart: CartApi, inside_test_data: dict) -> None:
+def test_cart_clear(api_cart_state: TrackedCart,
+                    inside_test_data: dict) -> None:
     """
     Тест проверяет работу функционала полной очистки корзины товаров -
     имитация нажатия кнопки 'Очистить корзину'.
     Тест добавляет товар в корзину, затем удаляет все товары и проверяет,
     что корзина стала пустой.
     Параметры
-        api_cart: CartApi - сущность для работы класса 'CartApi'
+        api_cart_state: TrackedCart - клиент корзины с моделью состояния
+                                      (корзина восстанавливается после теста)
         inside_test_data: dict - тестовые данные для добавления
                                  тестового товара в корзину.
+    Шаги и проверки - сценарий Scenarios.cart_add_clear (общий
+    с нагрузочным прогоном LoadRunner).
     """
-    product_added_id = dict({'id': inside_test_data['id']})
-    added = api_cart.add_to_cart(product_added_id)
-
-    before = api_cart.cart_info()
-    before_count = len(before.json()['products'])
-
-    delete = api_cart.cart_delete_all()
-
-    after = api_cart.cart_short()
-    after_count = after.json()['data']['quantity']
-
-    with allure.step("Проверки Status Code."):
-        with allure.step("Запрос: добавление товара: Status Code = 200"):
-            assert added.status_code == 200, f"""Ошибка при обработке
- запроса на добавление товара в корзину: {added.status_code}"""
-        with allure.step("""Запрос: получение информации о корзине
- до удаления. Status Code = 200"""):
-            assert before.status_code == 200, f"""Ошибка при обработке
- запроса на получение информации о корзине до удаления: {before.status_code}"""
-        with allure.step("Проверка: количество товаров до удаления > 0"):
-            assert before_count > 0, "Перед удалением корзина пуста."
-        with allure.step("""Запрос: удаление товара из корзины.
- Status Code = 204"""):
-            assert delete.status_code == 204, f"""Ошибка при обработке
- запроса на удаление товара из корзины: {delete.status_code}"""
-        with allure.step("""Запрос: получение информации о корзине
- после удаления. Status Code = 200"""):
-            assert after.status_code == 200, f"""Ошибка при обработке запроса
- на получение информации о корзине после удаления: {delete.status_code}"""
-    with allure.step("Проверка: количество товаров после удаления =0"):
-        assert after_count == 0, "После удаления корзина не пуста"
+    Scenarios.cart_add_clear(api_cart_state, inside_test_data['id'])
 
 
 @allure.severity(allure.severity_level.CRITICAL)
@@ -63,38 +42,28 @@ def test_cart_clear(api_cart: CartApi, inside_test_data: dict) -> None:
  корзине до и после добавления""")
 @allure.feature("API: Корзина товаров")
 @pytest.mark.api
-def test_add_to_cart(api_cart: CartApi, inside_test_data: dict) -> None:
+def test_add_to_cart(api_cart_state: TrackedCart,
+                     inside_test_data: dict) -> None:
     """
     Тест проверяет работу функционала - добавление товара в корзину.
     Сверяется количество товара в корзине до и после добавления нового
  товара.
     Проверяется, что товар успешно добавлен и количество товаров в корзине
  увеличилось на 1.
+    Количество товара до добавления берется из модели состояния корзины.
     Параметры
-        api_cart: CartApi - сущность для работы класса 'CartApi'
+        api_cart_state: TrackedCart - клиент корзины с моделью состояния
+                                      (корзина восстанавливается после теста)
         inside_test_data: dict - тестовые данные для запросов (id товара)
     """
-    with allure.step("Перед тестированием."):
-        api_cart.cart_delete_all()
+    before_count = api_cart_state.snapshot().count()
 
-    before = api_cart.cart_short()
-    before_count = before.json()['data']['quantity']
+    added = api_cart_state.add(inside_test_data['id'])
 
-    product_added_id = dict({'id': inside_test_data['id']})
-    added = api_cart.add_to_cart(product_added_id)
-
-    after = api_cart.cart_info()
-    after_count = len(after.json()['products'])
-
-    with allure.step("После тестирования."):
-        api_cart.cart_delete_all()
+    after = api_cart_state.info()
+    after_count = len(after.products)
 
     with allure.step("Проверки Status Code."):
-        with allure.step(""""Запрос: получение информации о корзине
- до добавления. Status Code = 200"""):
-            assert before.status_code == 200, f"""Ошибка при обработке
- запроса на получение информации о корзине до добавления:
-   {before.status_code}"""
         with allure.step("""Запрос: добавление товара в корзину.
  Status Code = 200"""):
             assert added.status_code == 200, f"""Ошибка при обработке
@@ -116,55 +85,20 @@ def test_add_to_cart(api_cart: CartApi, inside_test_data: dict) -> None:
  нового товара""")
 @allure.feature("API: Корзина товаров")
 @pytest.mark.api
-def test_delete_from_cart(api_cart: CartApi, inside_test_data: dict):
+def test_delete_from_cart(api_cart_state: TrackedCart,
+                          inside_test_data: dict):
     """
     Тест проверяет работу функционала - удаление одного товара из корзины.
     Тест добавляет товар в корзину, затем удаляет его по ID и проверяет,
     что количество товаров уменьшилось на 1.
     Параметры:
-        api_cart: CartApi - сущность для работы класса 'CartApi'
+        api_cart_state: TrackedCart - клиент корзины с моделью состояния
+                                      (корзина восстанавливается после теста)
         inside_test_data: dict - тестовые данные
+    Шаги и проверки - сценарий Scenarios.cart_add_info_delete (общий
+    с нагрузочным прогоном LoadRunner).
     """
-    with allure.step("Перед тестированием."):
-        api_cart.cart_delete_all()
-
-    id_for_test = inside_test_data["id"]
-    id_add = dict({"id": id_for_test})
-
-    added = api_cart.add_to_cart(id_add)
-    assert added.status_code == 200, f"""Ошибка при добавлении товара
- в корзину: {added.status_code}"""
-
-    before = api_cart.cart_info()
-    before_count = len(before.json()['products'])
-
-    id_to_be_deleted = str(before.json()['products'][0]['id'])
-
-    delete = api_cart.del_from_cart(id_to_be_deleted)
-
-    after = api_cart.cart_short()
-    after_count = after.json()['data']['quantity']
-
-    with allure.step("После тестирования."):
-        api_cart.cart_delete_all()
-
-    subtraction = before_count - after_count
-    with allure.step("Проверки Status Code."):
-        with allure.step("""Запрос: получение информации о корзине
- до удаления. Status Code = 200"""):
-            assert before.status_code == 200, f"""Ошибка при обработке
- запроса на получение информации о корзине до удаления: {before.status_code}"""
-        with allure.step("""Запрос: удаление товара из корзины.
- Status Code = 204"""):
-            assert delete.status_code == 204, f"""Ошибка при обработке
- запроса на удаление товара из корзины: {delete.status_code}"""
-        with allure.step("""Запрос: получение информации о корзине
- после удаления. Status Code = 200"""):
-            assert after.status_code == 200, f"""Ошибка при обработке запроса
- на получение информации о корзине после удаления: {after.status_code}"""
-    with allure.step("Проверка: количество товаров уменьшилось на 1"):
-        assert before_count - after_count == 1, f"""Ошибка:
-разница в количестве товара до и после удаления : {subtraction}"""
+    Scenarios.cart_add_info_delete(api_cart_state, inside_test_data['id'])
 
 
 @allure.severity(allure.severity_level.CRITICAL)
@@ -173,39 +107,34 @@ def test_delete_from_cart(api_cart: CartApi, inside_test_data: dict):
  Тест проверяет количество единиц товара в корзине до и после изменения.""")
 @allure.feature("API: Корзина товаров")
 @pytest.mark.api
-def test_quantity_of_product(api_cart: CartApi, inside_test_data: dict):
+def test_quantity_of_product(api_cart_state: TrackedCart,
+                             inside_test_data: dict):
     """
     Тест проверяет работу функционала - изменение количества единиц товара.
     Тест добавляет товар в корзину, изменяет количество товара и проверяет,
     что количество единиц товара изменилось.
     Параметры:
-        api_cart: CartApi - сущность для работы класса 'CartApi'
+        api_cart_state: TrackedCart - клиент корзины с моделью состояния
+                                      (корзина восстанавливается после теста)
         inside_test_data: dict - тестовые данные
     """
-    with allure.step("Перед тестированием."):
-        api_cart.cart_delete_all()
-
     id_for_test = inside_test_data["id"]
-    id_add = dict({"id": id_for_test})
 
-    added = api_cart.add_to_cart(id_add)
+    added = api_cart_state.add(id_for_test)
     assert added.status_code == 200, f"""Ошибка при добавлении товара
     в корзину: {added.status_code}"""
 
-    before = api_cart.cart_info()
-    before_count = before.json()['products'][0]['quantity']
+    before = api_cart_state.info()
+    before_count = before.products[0]['quantity']
 
-    param_id = before.json()['products'][0]['id']
+    param_id = before.products[0]['id']
     param_quantity = before_count + 1
     param_for_requests = ([{'id': param_id, 'quantity': param_quantity}])
 
-    quantity = api_cart.change_product_quantity(param_for_requests)
+    quantity = api_cart_state.change_quantity(param_for_requests)
 
-    after = api_cart.cart_info()
-    after_count = after.json()['products'][0]['quantity']
-
-    with allure.step("После тестирования."):
-        api_cart.cart_delete_all()
+    after = api_cart_state.info()
+    after_count = after.products[0]['quantity']
 
     with allure.step("Проверки Status Code."):
         with allure.step("""Запрос: количество единиц товара до изменения.
@@ -241,28 +170,60 @@ def test_search_positive(api_search: SearchApi, search_positive):
     Тест осуществляет ввод валидных значений в поле строки поиска и проверяет,
     что результат запроса содержит запрошенный контент.
     Параметры:
-        api_cart: CartApi - сущность для работы класса 'CartApi'
+        api_search: SearchApi - клиент поиска
         search_positive - фикстура для получения фразы для теста
+    Ответ поиска разбирается потоково: чтение прекращается после первого
+    товара. Шаги и проверки - сценарий Scenarios.search_phrase (общий
+    с нагрузочным прогоном LoadRunner).
     """
-    param = "phrase=" + search_positive
-    response_search = api_search.search_by_phrase(param)
-    search_conversion = api_search.text_conversion(search_positive)
-    temp_include = response_search.json()["included"]
-    temp_phrase = temp_include[0]["attributes"]["title"]
+    Scenarios.search_phrase(api_search, search_positive)
 
-    with allure.step("Проверки выполнения запросов."):
-        with allure.step("""Запрос на получение ответа о результатах поиска:
- Status Code = 200"""):
-            assert response_search.status_code == 200, f"""Ошибка
- при обработке запроса на получение ответа о результатах поиска:
- Status Code = {response_search.status_code}"""
 
-        try:
-            with allure.step(f"""Проверка: результат содержит фразу поиска
-             {search_conversion}."""):
-                assert search_conversion in temp_phrase.lower()
-        except NoSuchElementException:
-            pytest.fail(
-                f"В результатах поиска нет фразы: {search_conversion}.")
-        except Exception as e:
-            pytest.fail(f"Не удалось обработать запрос,  ошибка : {e}")
+@allure.severity(allure.severity_level.NORMAL)
+@allure.title("""Проверка API: одновременный поиск по всем фразам
+(позитивные сценарии)""")
+@allure.description("""Проверка API: поиск товара по всем валидным фразам
+ из test_data.json одновременно, с ограничением числа параллельных запросов.
+ Тест проверяет, что каждый результат содержит запрошенный контент.""")
+@allure.feature("API: Поиск товара")
+@pytest.mark.api
+@pytest.mark.load
+def test_search_positive_concurrent(api_search_async: AsyncSearchApi,
+                                    search_positive_phrases: list):
+    """
+    Тест выполняет поиск по фразам 'search_phrase_positive' (с учетом
+    --dataset-sample/--dataset-shard) одновременно (не более
+    'concurrency' запросов за раз) и проверяет, что первый результат
+    поиска содержит фразу. Метрики релевантности (hit@k, precision, MRR)
+    прикрепляются к отчету Allure.
+    Запускается только с --api-load: те же фразы проверяет
+    test_search_positive.
+    Параметры:
+        api_search_async: AsyncSearchApi - асинхронный клиент поиска,
+        search_positive_phrases: list - выбранные фразы набора.
+    """
+    phrases = search_positive_phrases
+    limit = ConfigProvider().getint("api", "concurrency")
+
+    with allure.step(f"Одновременный поиск по {len(phrases)} фразам"):
+        responses = run_concurrently(
+            [lambda phrase=phrase: api_search_async.search_by_phrase(
+                "phrase=" + phrase) for phrase in phrases], limit)
+
+    for phrase, response in zip(phrases, responses):
+        with allure.step(f"Запрос поиска '{phrase}'. Status Code = 200"):
+            assert response.status_code == 200, f"""Ошибка при обработке
+ запроса поиска '{phrase}': Status Code = {response.status_code}"""
+
+    report = RelevanceAnalyzer(k=10).score(
+        phrases, [[item["attributes"]["title"] for item in response.included]
+                  for response in responses])
+    allure.attach(json.dumps(report.to_dict(), ensure_ascii=False,
+                             indent=2),
+                  name="Релевантность поиска",
+                  attachment_type=allure.attachment_type.JSON)
+    with allure.step("Проверка: первый результат содержит фразу поиска"):
+        missed = [phrase for phrase, rank in zip(phrases, report.ranks)
+                  if rank != 1]
+        assert not missed, f"""Первый результат поиска не содержит
+ фразы: {missed}."""
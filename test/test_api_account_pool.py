@@ -0,0 +1,83 @@
+import threading
+import time
+import allure
+import pytest
+from api_utils.AccountPool import AccountPool, LeaseTimeout
+
+
+@allure.title("AccountPool: аренда и возврат аккаунтов")
+@allure.feature("Пул аккаунтов")
+@pytest.mark.api
+def test_account_pool_lease_release(tmp_path) -> None:
+    """
+    Аккаунт выдается одному владельцу, в том числе между пулами
+    разных процессов с общим каталогом блокировок; после возврата
+    аккаунт снова доступен.
+    """
+    lock_dir = tmp_path / "accounts"
+    first = AccountPool(["a", "b", "a"], lock_dir, timeout=0, poll=0.01)
+    second = AccountPool(["a", "b"], lock_dir, timeout=0, poll=0.01)
+    assert first.tokens == ["a", "b"]
+    assert first.lease("gw0") == "a"
+    assert second.lease("gw1") == "b"
+    assert sorted(path.name for path in lock_dir.iterdir()) == [
+        "account-0.lock", "account-1.lock"]
+    with pytest.raises(LeaseTimeout):
+        second.lease("gw2")
+
+    first.release("a")
+    assert second.lease("gw2") == "a"
+    second.close()
+    first.close()
+    assert not lock_dir.exists()
+    with pytest.raises(ValueError):
+        AccountPool([], lock_dir)
+
+
+@allure.title("AccountPool: ожидание свободного аккаунта")
+@allure.feature("Пул аккаунтов")
+@pytest.mark.api
+def test_account_pool_waits(tmp_path) -> None:
+    """
+    Аренда ожидает освобождения аккаунта и завершается LeaseTimeout,
+    если аккаунт не освободился за 'timeout' секунд.
+    """
+    pool = AccountPool(["a"], tmp_path, timeout=1, poll=0.01)
+    token = pool.lease("first")
+    releaser = threading.Timer(0.1, pool.release, [token])
+    releaser.start()
+    started = time.monotonic()
+    assert pool.lease("second") == "a"
+    assert 0.05 < time.monotonic() - started < 1
+    releaser.join()
+
+    pool.timeout = 0.1
+    started = time.monotonic()
+    with pytest.raises(LeaseTimeout):
+        pool.lease("third")
+    assert time.monotonic() - started >= 0.1
+    pool.close()
+
+
+@allure.title("AccountPool: исключенный аккаунт не выдается до close()")
+@allure.feature("Пул аккаунтов")
+@pytest.mark.api
+def test_account_pool_retire(tmp_path) -> None:
+    """
+    Исключенный аккаунт не возвращается в пул до закрытия пула;
+    close() снимает блокировки процесса и удаляет каталог блокировок.
+    """
+    lock_dir = tmp_path / "accounts"
+    pool = AccountPool(["a", "b"], lock_dir, timeout=0)
+    other = AccountPool(["a", "b"], lock_dir, timeout=0)
+    assert pool.lease("gw0") == "a"
+    pool.retire("a")
+    pool.release("a")
+    assert other.lease("gw1") == "b"
+    with pytest.raises(LeaseTimeout):
+        other.lease("gw2")
+
+    pool.close()
+    assert other.lease("gw2") == "a"
+    other.close()
+    assert not lock_dir.exists()
@@ -0,0 +1,138 @@
+import allure
+import pytest
+from api_utils.ApiResponse import ApiResponse
+from api_utils.CartState import CartModel, TrackedCart
+
+
+class FakeCart:
+    """
+    Корзина без сети с интерфейсом CartApi: состояние
+    {goodsId: {"id", "quantity"}} и журнал выполненных операций.
+    """
+
+    def __init__(self, items: dict = None, fail: tuple = ()) -> None:
+        self.items = {goods_id: dict(item)
+                      for goods_id, item in (items or {}).items()}
+        self.fail = fail
+        self.calls = []
+        self.next_id = 900
+
+    def _response(self, data: dict) -> ApiResponse:
+        response = ApiResponse(200, b"")
+        response._data = data
+        return response
+
+    def cart_info(self) -> ApiResponse:
+        self.calls.append(("info",))
+        return self._response({"products": [
+            {"goodsId": goods_id, **item}
+            for goods_id, item in self.items.items()]})
+
+    def cart_delete_all(self) -> ApiResponse:
+        self.calls.append(("clear",))
+        self.items = {}
+        return self._response({})
+
+    def remove_many(self, del_ids: list) -> list:
+        self.calls.append(("remove", sorted(del_ids)))
+        self.items = {goods_id: item
+                      for goods_id, item in self.items.items()
+                      if item["id"] not in del_ids}
+        return [{"id": item_id, "ok": True} for item_id in del_ids]
+
+    def add_many(self, add_ids: list) -> list:
+        self.calls.append(("add", sorted(add_ids)))
+        for goods_id in add_ids:
+            self.next_id += 1
+            self.items[goods_id] = {"id": self.next_id, "quantity": 1}
+        return [{"id": goods_id, "ok": True} for goods_id in add_ids]
+
+    def set_quantities(self, quantities: dict) -> list:
+        self.calls.append(("quantity", dict(quantities)))
+        results = []
+        for goods_id, item in self.items.items():
+            if item["id"] in quantities:
+                ok = goods_id not in self.fail
+                if ok:
+                    item["quantity"] = quantities[item["id"]]
+                results.append({"id": item["id"], "ok": ok})
+        return results
+
+
+def _model(items: dict) -> CartModel:
+    return CartModel({goods_id: dict(item)
+                      for goods_id, item in items.items()})
+
+
+ITEMS = {1: {"id": 101, "quantity": 1}, 2: {"id": 102, "quantity": 3}}
+
+
+@allure.title("TrackedCart.restore: без запросов и одной очисткой")
+@allure.feature("API: Корзина товаров")
+@pytest.mark.api
+def test_restore_unchanged_and_empty() -> None:
+    """
+    Совпадающая со снимком корзина не запрашивается; к пустому снимку
+    корзина возвращается одной очисткой.
+    """
+    cart = FakeCart(ITEMS)
+    tracked = TrackedCart(cart, _model(ITEMS))
+    snapshot = tracked.snapshot()
+    tracked.restore(snapshot)
+    assert cart.calls == []
+
+    tracked.restore(CartModel())
+    assert cart.calls == [("clear",)]
+    assert cart.items == {}
+    assert tracked.model.known and tracked.model.items == {}
+
+
+@allure.title("TrackedCart.restore: удаление, добавление и количество")
+@allure.feature("API: Корзина товаров")
+@pytest.mark.api
+def test_restore_minimal_requests() -> None:
+    """
+    Лишний товар удаляется, недостающий добавляется (с чтением id),
+    количества меняются одним пакетным запросом; модель совпадает
+    с корзиной без дополнительного чтения.
+    """
+    cart = FakeCart({1: {"id": 101, "quantity": 2},
+                     3: {"id": 103, "quantity": 1}})
+    tracked = TrackedCart(cart)
+    tracked.restore(_model({1: {"id": 101, "quantity": 1},
+                            2: {"id": None, "quantity": 3}}))
+    assert cart.calls == [("info",), ("remove", [103]), ("add", [2]),
+                          ("info",), ("quantity", {101: 1, 901: 3})]
+    assert {goods_id: item["quantity"]
+            for goods_id, item in cart.items.items()} == {1: 1, 2: 3}
+    assert tracked.model.known
+    assert tracked.model.items == cart.items
+
+    cart.calls = []
+    tracked.restore(_model({1: {"id": 101, "quantity": 1},
+                            2: {"id": 901, "quantity": 3}}))
+    assert cart.calls == []
+
+
+@allure.title("TrackedCart.restore: ошибка изменения - состояние неизвестно")
+@allure.feature("API: Корзина товаров")
+@pytest.mark.api
+def test_restore_failure_marks_unknown() -> None:
+    """
+    При ошибке пакетного запроса модель помечается неизвестной
+    и следующий restore перечитывает корзину.
+    """
+    cart = FakeCart(ITEMS, fail=(2,))
+    tracked = TrackedCart(cart, _model(ITEMS))
+    tracked.restore(_model({1: {"id": 101, "quantity": 1},
+                            2: {"id": 102, "quantity": 5}}))
+    assert cart.calls == [("quantity", {102: 5})]
+    assert not tracked.model.known
+
+    cart.fail = ()
+    cart.calls = []
+    tracked.restore(_model({1: {"id": 101, "quantity": 1},
+                            2: {"id": 102, "quantity": 5}}))
+    assert cart.calls == [("info",), ("quantity", {102: 5})]
+    assert tracked.model.known
+    assert cart.items[2]["quantity"] == 5
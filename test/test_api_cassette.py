@@ -0,0 +1,75 @@
+import allure
+import pytest
+from api_utils.Cassette import Cassette, CassetteMiss
+from api_utils.Transport import Transport
+from stand_in.WebGateServer import WebGateServer
+
+
+@allure.title("Cassette: ключ запроса не зависит от адреса API")
+@allure.feature("Кассеты API-запросов")
+@pytest.mark.api
+def test_cassette_key() -> None:
+    """
+    Ключ - метод, путь относительно базового URL, отсортированные
+    параметры и хэш тела: хост, порт и порядок параметров не влияют.
+    """
+    first = Cassette.make_key(
+        "get", "http://127.0.0.1:4001/api/v2/products?page=2",
+        {"per-page": 8}, base_url="http://127.0.0.1:4001/api")
+    second = Cassette.make_key(
+        "GET", "https://web-gate.example/gate/v2/products",
+        "per-page=8&page=2", base_url="https://web-gate.example/gate")
+    assert first == second
+    assert first.startswith("GET /v2/products?page=2&per-page=8 ")
+    assert Cassette.make_key("POST", "http://a/api/v1/cart", body=b"1") != \
+        Cassette.make_key("POST", "http://a/api/v1/cart", body=b"2")
+
+
+@allure.title("Cassette: запись на одном порту, воспроизведение на другом")
+@allure.feature("Кассеты API-запросов")
+@pytest.mark.api
+def test_cassette_record_replay_other_port(tmp_path) -> None:
+    """
+    Обмены записываются на локальном стенде, стенд останавливается,
+    ответы воспроизводятся по адресу с другим портом без обращения
+    к сети; повторный запрос с тем же ключом получает ответы в порядке
+    записи, неизвестный запрос - CassetteMiss.
+    """
+    path = str(tmp_path / "test.cassette")
+    transport = Transport()
+    server = WebGateServer(catalog_size=10).start()
+    base_url = server.base_url
+    try:
+        cassette = Cassette(path, "record", base_url)
+        transport.cassette = cassette
+        token = {"Authorization": "Bearer cassette"}
+        before = transport.get(base_url + "/v1/cart/short", headers=token)
+        transport.post(base_url + "/v1/cart/product", headers=token,
+                       json={"id": 2000000})
+        after = transport.get(base_url + "/v1/cart/short", headers=token)
+        products = transport.get(base_url + "/v2/products",
+                                 params={"page": 1, "per-page": 5})
+        cassette.close()
+    finally:
+        transport.cassette = None
+        server.stop()
+
+    other = "http://127.0.0.1:1/api"
+    cassette = Cassette(path, "replay", other)
+    transport.cassette = cassette
+    try:
+        replayed = [transport.get(other + "/v1/cart/short"),
+                    transport.get(other + "/v1/cart/short"),
+                    transport.get(other + "/v1/cart/short")]
+        assert [response.json() for response in replayed] == [
+            before.json(), after.json(), after.json()]
+        page = transport.get(other + "/v2/products",
+                             params={"per-page": 5, "page": 1})
+        assert page.status_code == 200
+        assert page.json() == products.json()
+        with pytest.raises(CassetteMiss):
+            transport.get(other + "/v2/products", params={"page": 2})
+    finally:
+        transport.cassette = None
+        cassette.close()
+        transport.close()
@@ -0,0 +1,48 @@
+import allure
+import pytest
+from api_utils.Cassette import Cassette
+from api_utils.ProductCatalog import ProductCatalog
+from api_utils.Transport import Transport
+from stand_in.WebGateServer import WebGateServer
+
+
+@allure.title("Каталог товаров: воспроизведение из кассеты без кэша и сети")
+@allure.feature("Каталог товаров")
+@pytest.mark.api
+def test_catalog_replay_without_cache(tmp_path) -> None:
+    """
+    Каталог записывается в кассету сессии на локальном стенде,
+    затем стенд останавливается и каталог воспроизводится из кассеты:
+    каталога .catalog/ нет, запросы в сеть не отправляются.
+    """
+    cache_path = str(tmp_path / ".catalog" / "products.json")
+    cassette_path = str(tmp_path / "cassettes" / "api_catalog.cassette")
+    options = {"cache_path": cache_path, "ttl": 900, "pages": 5,
+               "page_size": 8}
+    transport = Transport()
+    server = WebGateServer(catalog_size=30).start()
+    url = server.base_url + "/v2/products"
+    try:
+        with allure.step("Запись каталога в кассету"):
+            cassette = Cassette(cassette_path, "record")
+            recorded = ProductCatalog.for_session(
+                url, {}, cassette=cassette, transport=transport, **options)
+            cassette.close()
+    finally:
+        server.stop()
+    assert len(recorded) == 30
+    assert transport.cassette is None
+    assert not (tmp_path / ".catalog").exists()
+
+    with allure.step("Воспроизведение каталога без стенда"):
+        cassette = Cassette(cassette_path, "replay")
+        try:
+            replayed = ProductCatalog.for_session(
+                url, {}, cassette=cassette, transport=transport, **options)
+        finally:
+            cassette.close()
+    assert replayed.products == recorded.products
+    assert replayed.pick(in_stock=True, purchasable=True) == \
+        recorded.pick(in_stock=True, purchasable=True)
+    assert not (tmp_path / ".catalog").exists()
+    transport.close()
@@ -0,0 +1,105 @@
+import allure
+import pytest
+from configuration.ConfigProvider import ConfigProvider
+
+CONFIG = """
+[api]
+base_url=https://web-gate.chitai-gorod.ru/api
+pool_maxsize=10
+read_timeout=30
+metrics=yes
+search=/v2/search/product
+
+[api:local]
+base_url=http://127.0.0.1:4001/api
+pool_maxsize=2
+stand_in_only=on
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch) -> ConfigProvider:
+    """
+    Фикстура подключает временный test_config.ini (CG_CONFIG) без
+    профиля; по окончании теста настройки загружаются заново.
+    """
+    path = tmp_path / "test_config.ini"
+    path.write_text(CONFIG, encoding="utf-8")
+    monkeypatch.setenv("CG_CONFIG", str(path))
+    monkeypatch.delenv("CG_PROFILE", raising=False)
+    for name in ("CG_API_BASE_URL", "CG_API_POOL_MAXSIZE",
+                 "CG_API_READ_TIMEOUT", "CG_API_METRICS"):
+        monkeypatch.delenv(name, raising=False)
+    ConfigProvider.use_profile(None)
+    yield ConfigProvider()
+    ConfigProvider.use_profile(None)
+
+
+@allure.title("ConfigProvider: значения секции и типы")
+@allure.feature("Настройки проекта")
+@pytest.mark.api
+def test_config_section_values(config_file: ConfigProvider) -> None:
+    """
+    Без профиля значения берутся из секции; отсутствующее свойство -
+    None для всех типов.
+    """
+    config = config_file
+    assert config.profile == "prod"
+    assert config.get("api", "base_url") == \
+        "https://web-gate.chitai-gorod.ru/api"
+    assert config.getint("api", "pool_maxsize") == 10
+    assert config.getfloat("api", "read_timeout") == 30.0
+    assert config.getboolean("api", "metrics") is True
+    assert config.getint("api", "absent") is None
+    assert config.getboolean("api", "absent") is None
+    assert config.get_api_url("search") == \
+        "https://web-gate.chitai-gorod.ru/api/v2/search/product"
+
+
+@allure.title("ConfigProvider: профиль заменяет значения секции")
+@allure.feature("Настройки проекта")
+@pytest.mark.api
+def test_config_profile(config_file: ConfigProvider,
+                        monkeypatch) -> None:
+    """
+    Секция [api:local] заменяет значения [api] (в том числе кэшированные
+    до переключения профиля) и добавляет собственные свойства;
+    профиль задается use_profile или переменной CG_PROFILE.
+    """
+    config = config_file
+    assert config.getint("api", "pool_maxsize") == 10
+    ConfigProvider.use_profile("local")
+    assert config.profile == "local"
+    assert config.getint("api", "pool_maxsize") == 2
+    assert config.get_api_url("search") == \
+        "http://127.0.0.1:4001/api/v2/search/product"
+    assert config.getboolean("api", "stand_in_only") is True
+    assert dict(config.items("api"))["read_timeout"] == "30"
+    assert dict(config.items("api"))["stand_in_only"] == "on"
+
+    monkeypatch.setenv("CG_PROFILE", "local")
+    ConfigProvider.use_profile(None)
+    assert config.profile == "local"
+    assert config.get("api", "base_url") == "http://127.0.0.1:4001/api"
+
+
+@allure.title("ConfigProvider: переменные окружения важнее профиля")
+@allure.feature("Настройки проекта")
+@pytest.mark.api
+def test_config_environment(config_file: ConfigProvider,
+                            monkeypatch) -> None:
+    """
+    CG_<СЕКЦИЯ>_<СВОЙСТВО> заменяет значения секции и профиля;
+    некорректное логическое значение - ValueError.
+    """
+    monkeypatch.setenv("CG_API_POOL_MAXSIZE", "32")
+    monkeypatch.setenv("CG_API_BASE_URL", "http://127.0.0.1:5000/api")
+    monkeypatch.setenv("CG_API_METRICS", "maybe")
+    ConfigProvider.use_profile("local")
+    config = config_file
+    assert config.getint("api", "pool_maxsize") == 32
+    assert config.get_api_url(None) == "http://127.0.0.1:5000/api"
+    assert dict(config.items("api"))["base_url"] == \
+        "http://127.0.0.1:5000/api"
+    with pytest.raises(ValueError):
+        config.getboolean("api", "metrics")
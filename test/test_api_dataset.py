@@ -0,0 +1,77 @@
+import allure
+import pytest
+from testdata.Dataset import FileDataset, ListDataset, select_indices
+
+
+@allure.title("select_indices: выборка одинакова при одном зерне")
+@allure.feature("Наборы тестовых данных")
+@pytest.mark.api
+def test_select_indices_sample() -> None:
+    """
+    Выборка - 'sample' различных номеров по возрастанию, одинаковая
+    при одном 'seed'; выборка не меньше набора - все записи.
+    """
+    assert select_indices(5) == [0, 1, 2, 3, 4]
+    sample = select_indices(1000, sample=20, seed=3)
+    assert len(set(sample)) == 20
+    assert sample == sorted(sample)
+    assert all(0 <= index < 1000 for index in sample)
+    assert select_indices(1000, sample=20, seed=3) == sample
+    assert select_indices(1000, sample=20, seed=4) != sample
+    assert select_indices(5, sample=10) == [0, 1, 2, 3, 4]
+    assert select_indices(0, sample=3) == []
+
+
+@allure.title("select_indices: части набора не пересекаются")
+@allure.feature("Наборы тестовых данных")
+@pytest.mark.api
+@pytest.mark.parametrize("sample", [0, 50])
+def test_select_indices_shards(sample: int) -> None:
+    """
+    Части K/N выборки не пересекаются и вместе дают всю выборку;
+    номер части вне 1..N - ValueError.
+    """
+    selected = select_indices(200, sample=sample, seed=7)
+    shards = [select_indices(200, sample=sample, seed=7, shard=f"{k}/3")
+              for k in (1, 2, 3)]
+    assert sorted(sum(shards, [])) == selected
+    assert shards[0] == selected[0::3]
+    assert select_indices(10, shard="2/4") == [1, 5, 9]
+    for shard in ("0/3", "4/3"):
+        with pytest.raises(ValueError):
+            select_indices(10, shard=shard)
+
+
+@allure.title("FileDataset: записи JSONL и CSV по номеру и потоком")
+@allure.feature("Наборы тестовых данных")
+@pytest.mark.api
+def test_file_dataset(tmp_path) -> None:
+    """
+    Пустые строки пропускаются, строка заголовка CSV не считается
+    записью; запись по номеру совпадает с записью при переборе.
+    """
+    jsonl = tmp_path / "phrases.jsonl"
+    jsonl.write_text('{"phrase": "Пушкин", "n": 1}\n\n'
+                     '{"phrase": "Гоголь", "n": 2}\n', encoding="utf-8")
+    dataset = FileDataset(jsonl, field="phrase")
+    assert dataset.size() == 2
+    assert list(dataset) == ["Пушкин", "Гоголь"]
+    assert dataset.item(1) == "Гоголь"
+    assert dataset.item_id(1) == "phrases-1"
+    assert FileDataset(jsonl).item(0) == {"phrase": "Пушкин", "n": 1}
+
+    csv_file = tmp_path / "phrases.csv"
+    csv_file.write_text("id,phrase\n1,\"Толстой, Лев\"\n2,Чехов\n",
+                        encoding="utf-8")
+    dataset = FileDataset(csv_file, field="phrase")
+    assert dataset.size() == 2
+    assert dataset.item(0) == "Толстой, Лев"
+    assert list(dataset) == ["Толстой, Лев", "Чехов"]
+    assert FileDataset(csv_file).item(1) == "2"
+
+    with pytest.raises(ValueError):
+        FileDataset(tmp_path / "phrases.txt")
+
+    values = ListDataset(["а", "б"])
+    assert (values.size(), list(values), values.item(1),
+            values.item_id(0)) == (2, ["а", "б"], "б", "а")
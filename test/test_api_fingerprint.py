@@ -0,0 +1,147 @@
+import sqlite3
+import allure
+import pytest
+import requests
+from api_utils.ApiResponse import ApiResponse
+from api_utils.Schema import SchemaError
+from api_utils.SearchFingerprint import (FingerprintStore, collect,
+                                         diff_fingerprints, fingerprint)
+
+
+def _items(*products) -> list:
+    """Товары ['included'] по парам (id, наименование)."""
+    return [{"id": product_id, "attributes": {"title": title, "price": 100,
+                                              "status": "canBuy"}}
+            for product_id, title in products]
+
+
+@allure.title("Отпечатки поиска: сдвиги, пропавшие, новые и измененные")
+@allure.feature("Отпечатки результатов поиска")
+@pytest.mark.api
+def test_diff_fingerprints() -> None:
+    """Сравнение отпечатков одной фразы."""
+    baseline = fingerprint(_items((1, "А"), (2, "Б"), (3, "В"), (4, "Г")))
+    current = fingerprint(_items((2, "Б"), (1, "А"), (3, "В!"), (5, "Д")))
+    assert diff_fingerprints(baseline, current) == {
+        "rank_shifts": [["2", 2, 1], ["1", 1, 2]],
+        "dropped": ["4"],
+        "new": ["5"],
+        "changed": ["3"]}
+    assert diff_fingerprints(baseline, baseline) == {
+        "rank_shifts": [], "dropped": [], "new": [], "changed": []}
+    assert diff_fingerprints(fingerprint([]), baseline)["new"] == \
+        ["1", "2", "3", "4"]
+
+
+@allure.title("Отпечатки поиска: ошибки поиска не сравниваются")
+@allure.feature("Отпечатки результатов поиска")
+@pytest.mark.api
+def test_store_diff_skips_errors(tmp_path) -> None:
+    """
+    Фраза с ошибкой в эталоне или прогоне не попадает в изменения
+    выдачи и выводится отдельным списком ошибок.
+    """
+    store = FingerprintStore(str(tmp_path / "search.sqlite"))
+    try:
+        same = fingerprint(_items((1, "А")))
+        base_id = store.begin_run("baseline")
+        store.put_many(base_id, [
+            ("стабильная", same, None),
+            ("измененная", same, None),
+            ("сбой сейчас", same, None),
+            ("сбой в эталоне", fingerprint([]), "Status Code 503"),
+            ("пропавшая", same, None)])
+        run_id = store.begin_run("today")
+        store.put_many(run_id, [
+            ("стабильная", same, None),
+            ("измененная", fingerprint(_items((2, "Б"))), None),
+            ("сбой сейчас", fingerprint([]), "ConnectionError: reset"),
+            ("сбой в эталоне", fingerprint(_items((3, "В"))), None),
+            ("новая", same, None)])
+        report = store.diff("baseline", "today")
+        assert list(report["changes"]) == ["измененная"]
+        assert report["changed"] == 1
+        assert report["errors"] == {
+            "baseline": {"сбой в эталоне": "Status Code 503"},
+            "run": {"сбой сейчас": "ConnectionError: reset"}}
+        assert report["missing"] == ["пропавшая"]
+        assert report["added"] == ["новая"]
+        assert {run["name"]: run["errors"] for run in store.runs()} == {
+            "baseline": 1, "today": 1}
+    finally:
+        store.close()
+
+
+@allure.title("Отпечатки поиска: хранилище без столбца error")
+@allure.feature("Отпечатки результатов поиска")
+@pytest.mark.api
+def test_store_upgrades_schema(tmp_path) -> None:
+    """Хранилище, созданное до учета ошибок, дополняется столбцом error."""
+    path = str(tmp_path / "search.sqlite")
+    db = sqlite3.connect(path)
+    db.executescript("""
+        CREATE TABLE fingerprints (
+            run_id INTEGER NOT NULL, phrase TEXT NOT NULL,
+            ids TEXT NOT NULL, hashes BLOB NOT NULL,
+            PRIMARY KEY (run_id, phrase)) WITHOUT ROWID;""")
+    db.close()
+    store = FingerprintStore(path)
+    try:
+        run_id = store.begin_run("run")
+        store.put_many(run_id, [("фраза", fingerprint([]), "Status Code 500")])
+        assert store.runs()[0]["errors"] == 1
+    finally:
+        store.close()
+
+
+class FakeSearch:
+    """Поиск без сети: товары, Status Code или исключение по фразе."""
+
+    def __init__(self, answers: dict) -> None:
+        self.answers = answers
+
+    def search_by_phrase(self, params: dict) -> ApiResponse:
+        answer = self.answers[params["phrase"]]
+        if isinstance(answer, Exception):
+            raise answer
+        if isinstance(answer, int):
+            return ApiResponse(answer, b"{}")
+        response = ApiResponse(200, b"")
+        response._data = {"included": answer}
+        return response
+
+
+@allure.title("Отпечатки поиска: ошибки по фразам и ограниченная очередь")
+@allure.feature("Отпечатки результатов поиска")
+@pytest.mark.api
+def test_collect_errors_and_window() -> None:
+    """
+    Ошибка поиска по фразе возвращается текстом и не прерывает сбор;
+    корпус читается не дальше 2 * workers фраз от выданного результата.
+    """
+    found = _items((1, "А"))
+    answers = {"ок": found, "503": 503,
+               "сеть": requests.ConnectionError("reset"),
+               "схема": SchemaError("$.included: ожидался массив")}
+    search = FakeSearch(answers)
+    results = {phrase: (found_print, error) for phrase, found_print, error
+               in collect(search, list(answers), workers=2)}
+    assert results["ок"] == (fingerprint(found), None)
+    assert results["503"] == (fingerprint([]), "Status Code 503")
+    assert results["сеть"][1] == "ConnectionError: reset"
+    assert results["схема"][1].startswith("SchemaError")
+
+    read = []
+
+    def corpus():
+        for number in range(100):
+            read.append(number)
+            yield f"ок{number}"
+
+    answers.update({f"ок{number}": found for number in range(100)})
+    results = collect(search, corpus(), workers=3)
+    first = next(results)
+    assert first[0] == "ок0"
+    assert len(read) <= 2 * 3 + 1
+    assert [phrase for phrase, _, _ in results] == \
+        [f"ок{number}" for number in range(1, 100)]
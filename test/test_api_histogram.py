@@ -0,0 +1,69 @@
+import random
+import allure
+import pytest
+from api_utils.Histogram import Histogram
+
+
+def _exact(values: list, percent: float) -> int:
+    """Перцентиль по отсортированным значениям (тот же порог, что в
+    Histogram.percentile)."""
+    ordered = sorted(values)
+    return ordered[max(1, round(len(ordered) * percent / 100)) - 1]
+
+
+@allure.title("Histogram: перцентили с точностью до ширины корзины")
+@allure.feature("Нагрузочный прогон API")
+@pytest.mark.api
+@pytest.mark.parametrize("percent", [1, 50, 90, 95, 99, 99.9, 100])
+def test_histogram_percentiles(percent: float) -> None:
+    """
+    Перцентили гистограммы не меньше точного значения и превышают
+    его не более чем на ширину корзины (при 7 битах - не более 1/64
+    значения).
+    """
+    rng = random.Random(7)
+    values = [int(rng.lognormvariate(9, 1.2)) for _ in range(20000)]
+    histogram = Histogram()
+    for value in values:
+        histogram.record(value)
+    exact = _exact(values, percent)
+    found = histogram.percentile(percent)
+    assert exact <= found <= exact + exact / 64, (percent, exact, found)
+
+
+@allure.title("Histogram: малые значения хранятся точно")
+@allure.feature("Нагрузочный прогон API")
+@pytest.mark.api
+def test_histogram_small_values_exact() -> None:
+    """Значения меньше 2^precision_bits попадают в собственные корзины."""
+    histogram = Histogram()
+    for value in range(1, 101):
+        histogram.record(value)
+    assert histogram.percentile(50) == 50
+    assert histogram.percentile(95) == 95
+    assert histogram.percentile(100) == 100
+    assert (histogram.min, histogram.max, histogram.total) == (1, 100, 5050)
+
+
+@allure.title("Histogram: объединение и пустая гистограмма")
+@allure.feature("Нагрузочный прогон API")
+@pytest.mark.api
+def test_histogram_merge() -> None:
+    """
+    Объединение дает те же перцентили, что запись всех значений
+    в одну гистограмму; пустая гистограмма возвращает нули.
+    """
+    assert Histogram().percentile(99) == 0
+    assert Histogram().to_dict()["p50"] == 0
+
+    rng = random.Random(3)
+    first, second, combined = Histogram(), Histogram(), Histogram()
+    for number in range(5000):
+        value = rng.randrange(1, 1_000_000)
+        (first if number % 2 else second).record(value)
+        combined.record(value)
+    first.merge(second)
+    for percent in (50, 95, 99):
+        assert first.percentile(percent) == combined.percentile(percent)
+    assert (first.count, first.total, first.min, first.max) == (
+        combined.count, combined.total, combined.min, combined.max)
@@ -0,0 +1,77 @@
+import json
+import allure
+import pytest
+from api_utils.JsonStream import iter_array_items
+
+DOCUMENT = {
+    "data": [{"included": ["не тот массив"], "id": 1}],
+    "meta": {"included": [], "text": "скобки ] } [ { и \"кавычки\""},
+    "included": [
+        {"id": "1", "attributes": {"title": "Мастер и Маргарита",
+                                   "tags": ["[", "]", "{", "}", ","]}},
+        {"id": "2", "attributes": {"title": "Экранирование \\ \" \n \t",
+                                   "emoji": "\U0001F4DA", "accent": "é"}},
+        [1, [2, [3]]],
+        "строка, с запятой",
+        -12.5e3,
+        0,
+        True,
+        False,
+        None,
+    ],
+    "links": {"next": "/v2/search/product?products[page]=2"},
+}
+
+
+def _chunks(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+@allure.title("JsonStream: элементы массива совпадают с json.loads")
+@allure.feature("Потоковый разбор JSON")
+@pytest.mark.api
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize("options", [{}, {"indent": 2},
+                                     {"ensure_ascii": True}])
+def test_json_stream_matches_loads(size: int, options: dict) -> None:
+    """
+    Документ передается фрагментами по 'size' байт: границы фрагментов
+    попадают внутрь многобайтных символов UTF-8, escape-последовательностей
+    (в том числе \\uXXXX) и чисел. Результат равен массиву 'included'
+    из json.loads.
+    """
+    text = json.dumps(DOCUMENT, **{"ensure_ascii": False, **options})
+    expected = json.loads(text)["included"]
+    assert list(iter_array_items(_chunks(text.encode("utf-8"), size),
+                                 "included")) == expected
+
+
+@allure.title("JsonStream: большой документ и строковые фрагменты")
+@allure.feature("Потоковый разбор JSON")
+@pytest.mark.api
+def test_json_stream_large_document() -> None:
+    """
+    Массив больше порога сжатия буфера, фрагменты - строки (str).
+    """
+    items = [{"id": str(number), "attributes": {"title": "книга " * 20}}
+             for number in range(500)]
+    text = json.dumps({"data": [], "included": items}, ensure_ascii=False)
+    assert list(iter_array_items(_chunks(text, 1000), "included")) == items
+
+
+@allure.title("JsonStream: отсутствующий ключ и незавершенный документ")
+@allure.feature("Потоковый разбор JSON")
+@pytest.mark.api
+def test_json_stream_missing_and_truncated() -> None:
+    """
+    Без ключа генератор пуст; обрезанный документ - ValueError после
+    разобранных полностью элементов.
+    """
+    text = json.dumps(DOCUMENT, ensure_ascii=False).encode("utf-8")
+    assert list(iter_array_items([text], "absent")) == []
+
+    truncated = text[:text.index("Экранирование".encode("utf-8"))]
+    items = iter_array_items(_chunks(truncated, 5), "included")
+    assert next(items) == DOCUMENT["included"][0]
+    with pytest.raises(ValueError):
+        next(items)
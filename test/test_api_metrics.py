@@ -0,0 +1,51 @@
+import allure
+import pytest
+from api_utils.Cassette import Cassette
+from api_utils.Metrics import RequestMetrics
+from api_utils.Transport import Transport
+from stand_in.WebGateServer import WebGateServer
+
+
+@allure.title("Метрики: потоковый ответ учитывается после чтения тела")
+@allure.feature("Метрики API-запросов")
+@pytest.mark.api
+def test_metrics_streamed_body(tmp_path) -> None:
+    """
+    Запрос stream=True учитывается один раз после чтения тела
+    с числом прочитанных байт; ответы из кассеты (replay)
+    в метрики не попадают.
+    """
+    metrics = RequestMetrics()
+    transport = Transport()
+    transport.observers.append(metrics.observe)
+    path = str(tmp_path / "metrics.cassette")
+    server = WebGateServer(catalog_size=10).start()
+    url = server.base_url + "/v2/products"
+    try:
+        response = transport.get(url, params={"page": 1}, stream=True)
+        assert metrics.take_records() == []
+        body = b"".join(response.iter_content(64))
+        response.close()
+        records = metrics.take_records()
+        assert len(records) == 1
+        assert records[0]["bytes"] == len(body) > 0
+        assert records[0]["status"] == "200"
+
+        cassette = Cassette(path, "record", server.base_url)
+        transport.cassette = cassette
+        transport.get(url, params={"page": 1})
+        cassette.close()
+        assert len(metrics.take_records()) == 1
+    finally:
+        transport.cassette = None
+        server.stop()
+
+    cassette = Cassette(path, "replay", server.base_url)
+    transport.cassette = cassette
+    try:
+        assert transport.get(url, params={"page": 1}).status_code == 200
+        assert metrics.take_records() == []
+    finally:
+        transport.cassette = None
+        cassette.close()
+        transport.close()
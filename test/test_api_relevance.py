@@ -0,0 +1,58 @@
+import random
+import allure
+import pytest
+from api_utils.Relevance import RelevanceAnalyzer, normalize, normalize_many
+
+ALPHABET = ["а", "Б", "ё", "Ё", "ß", "İ", "ﬁ", "A", "z", "1", " ", "  ",
+            "\t", "\n", "\u00a0", "\u2003", "\x1f", ",", "-"]
+
+
+@allure.title("normalize_many: совпадает с normalize для каждого текста")
+@allure.feature("Релевантность поиска")
+@pytest.mark.api
+@pytest.mark.parametrize("texts", [
+    [],
+    [""],
+    ["", "", ""],
+    ["  Мастер   и\tМаргарита ", "ЁЛКА", "   "],
+    [" \n", "Strasse STRAßE", "\u00a0Война\u2003и мир\u00a0"],
+    ["есть \x00 разделитель", "Ёж"],
+])
+def test_normalize_many_cases(texts: list) -> None:
+    """
+    Пустые и пробельные тексты, пробелы по краям, табуляции,
+    неразрывные пробелы, casefold и 'ё'; текст с символом-разделителем
+    обрабатывается по одному.
+    """
+    assert normalize_many(texts) == [normalize(text) for text in texts]
+
+
+@allure.title("normalize_many: случайные тексты")
+@allure.feature("Релевантность поиска")
+@pytest.mark.api
+def test_normalize_many_random() -> None:
+    """Пакеты случайных текстов из пробелов, букв и знаков."""
+    rng = random.Random(18)
+    for _ in range(300):
+        texts = ["".join(rng.choices(ALPHABET, k=rng.randint(0, 8)))
+                 for _ in range(rng.randint(1, 6))]
+        assert normalize_many(texts) == [normalize(text) for text in texts]
+
+
+@allure.title("RelevanceAnalyzer: ранги и доли попаданий")
+@allure.feature("Релевантность поиска")
+@pytest.mark.api
+def test_relevance_score() -> None:
+    """
+    Наименование релевантно, если содержит фразу после нормализации;
+    учитываются только первые k результатов.
+    """
+    report = RelevanceAnalyzer(k=2).score(
+        ["ёлка", "Пушкин", "нет"],
+        [["Новогодняя  ЕЛКА", "Елка"], ["Лермонтов", "А. С. ПУШКИН",
+                                        "Пушкин"], []])
+    assert report.ranks == [1, 2, None]
+    assert report.hits == [2, 1, 0]
+    assert report.to_dict() == {
+        "phrases": 3, "k": 2, "hit@1": 1 / 3, "hit@2": 2 / 3,
+        "precision@2": 1.5 / 3, "mrr": 1.5 / 3, "misses": ["нет"]}
@@ -0,0 +1,89 @@
+import json
+import allure
+import pytest
+import requests
+from api_utils.ApiResponse import ApiResponse
+
+SEARCH = {
+    "data": {"type": "search"},
+    "included": [
+        {"id": 1, "attributes": {"id": 1, "title": "Мастер и Маргарита"}},
+        {"id": "2", "attributes": {"id": 2, "title": "Белая гвардия"}}],
+    "meta": {"pagination": {"totalPages": 3}},
+}
+
+
+def _response(status_code: int, data) -> requests.Response:
+    """requests.Response с JSON-телом (без сети)."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = "OK" if status_code < 400 else "Error"
+    response.url = "http://127.0.0.1/api/v2/search/product"
+    response.headers["Content-Type"] = "application/json"
+    response.encoding = "utf-8"
+    response._content = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    return response
+
+
+@allure.title("ApiResponse: поля ответа и доступы к данным поиска")
+@allure.feature("Ответы API")
+@pytest.mark.api
+def test_api_response_from_response() -> None:
+    """
+    Из requests.Response сохраняются статус, тело, заголовки и адрес;
+    доступы included, titles и total_pages читают разобранное тело.
+    """
+    source = _response(200, SEARCH)
+    response = ApiResponse.from_response(source, "search")
+    assert response.ok
+    assert (response.status_code, response.url, response.reason) == (
+        200, source.url, "OK")
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == source.content
+    assert "Маргарита" in response.text
+    assert response.included == SEARCH["included"]
+    assert response.titles == ["Мастер и Маргарита", "Белая гвардия"]
+    assert response.total_pages == 3
+    assert repr(response) == "<ApiResponse [200]>"
+
+
+@allure.title("ApiResponse: тело разбирается один раз")
+@allure.feature("Ответы API")
+@pytest.mark.api
+def test_api_response_parsed_once() -> None:
+    """
+    Повторные обращения возвращают тот же разобранный объект;
+    некорректный JSON - ValueError.
+    """
+    response = ApiResponse(200, b'{"data": {"quantity": 2}}')
+    assert response.json() is response.json()
+    assert response.quantity == 2
+    response.content = b"{}"
+    assert response.quantity == 2
+
+    with pytest.raises(ValueError):
+        ApiResponse(200, b"<html>").json()
+
+
+@allure.title("ApiResponse: корзина, пагинация и ошибочные ответы")
+@allure.feature("Ответы API")
+@pytest.mark.api
+def test_api_response_cart_and_errors() -> None:
+    """
+    Товары корзины, total_pages в обоих вариантах записи и без
+    пагинации; ответ с ошибкой не проверяется по схеме.
+    """
+    cart = ApiResponse(200, b'{"products": [{"goodsId": 1}]}')
+    assert cart.products == [{"goodsId": 1}]
+    assert ApiResponse(
+        200, b'{"meta": {"pagination": {"total_pages": 5}}}'
+    ).total_pages == 5
+    assert ApiResponse(200, b'{"data": []}').total_pages is None
+
+    error = ApiResponse.from_response(_response(503, {"errors": []}),
+                                      "search")
+    assert not error.ok
+    assert error.json() == {"errors": []}
+    assert ApiResponse(301, b"").ok
+    assert ApiResponse(200, "кириллица".encode("cp1251"),
+                       encoding="cp1251").text == "кириллица"
@@ -0,0 +1,111 @@
+import warnings
+import allure
+import pytest
+from api_utils.Schema import SchemaError, VALIDATORS, compile_schema, validate
+from configuration.ConfigProvider import ConfigProvider
+
+ORDER = compile_schema({
+    "type": "object",
+    "required": ["id", "lines"],
+    "properties": {
+        "id": {"type": ["integer", "string"]},
+        "paid": {"type": "boolean"},
+        "total": {"type": ["number", "null"]},
+        "lines": {"type": "array", "items": {
+            "type": "object",
+            "required": ["sku"],
+            "properties": {"sku": {"type": "string"},
+                           "tags": {"type": "array",
+                                    "items": {"type": "string"}}}}},
+    },
+}, "order:$")
+
+
+def _error(check, value) -> str:
+    with pytest.raises(SchemaError) as error:
+        check(value)
+    return str(error.value)
+
+
+@allure.title("Schema: обязательные поля")
+@allure.feature("Проверка ответов API по схемам")
+@pytest.mark.api
+def test_schema_required_fields() -> None:
+    """
+    Отсутствие обязательного поля - SchemaError с путем к объекту,
+    необязательные поля могут отсутствовать, лишние поля допускаются.
+    """
+    ORDER({"id": 1, "lines": [], "extra": object()})
+    assert _error(ORDER, {"lines": []}) == \
+        "order:$: нет обязательного поля 'id'"
+    assert _error(ORDER, {"id": 1, "lines": [{"tags": []}]}) == \
+        "order:$.lines[]: нет обязательного поля 'sku'"
+
+
+@allure.title("Schema: несоответствие типов")
+@allure.feature("Проверка ответов API по схемам")
+@pytest.mark.api
+def test_schema_type_mismatch() -> None:
+    """
+    Несовпадение типа - SchemaError с ожидаемым и полученным типом;
+    bool не считается числом, int допускается как number, null -
+    только если разрешен схемой.
+    """
+    ORDER({"id": "A-1", "paid": False, "total": None, "lines": []})
+    ORDER({"id": 1, "total": 10, "lines": []})
+    assert _error(ORDER, []) == "order:$: ожидается object, получено list"
+    assert _error(ORDER, {"id": True, "lines": []}) == \
+        "order:$.id: ожидается integer|string, получено bool"
+    assert _error(ORDER, {"id": 1, "total": True, "lines": []}) == \
+        "order:$.total: ожидается number|null, получено bool"
+    assert _error(ORDER, {"id": 1, "paid": 1, "lines": []}) == \
+        "order:$.paid: ожидается boolean, получено int"
+    assert _error(ORDER, {"id": 1, "lines": {}}) == \
+        "order:$.lines: ожидается array, получено dict"
+
+
+@allure.title("Schema: вложенные массивы")
+@allure.feature("Проверка ответов API по схемам")
+@pytest.mark.api
+def test_schema_nested_arrays() -> None:
+    """
+    Элементы массивов проверяются по схеме items на любой глубине,
+    путь ошибки указывает на массив элемента.
+    """
+    ORDER({"id": 1, "lines": [{"sku": "a", "tags": ["x", "y"]},
+                              {"sku": "b"}]})
+    assert _error(ORDER, {"id": 1, "lines": [
+        {"sku": "a", "tags": ["x"]}, {"sku": "b", "tags": ["y", 2]}]}) == \
+        "order:$.lines[].tags[]: ожидается string, получено int"
+    assert _error(ORDER, {"id": 1, "lines": [{"sku": "a"}, None]}) == \
+        "order:$.lines[]: ожидается object, получено NoneType"
+
+    VALIDATORS["cart"]({"products": [
+        {"id": 1, "goodsId": "2", "quantity": 1, "title": None}]})
+    assert _error(VALIDATORS["cart"], {"products": [
+        {"id": 1, "goodsId": 2, "quantity": "1"}]}) == \
+        "cart:$.products[].quantity: ожидается integer, получено str"
+
+
+@allure.title("Schema: режимы schema_validation")
+@allure.feature("Проверка ответов API по схемам")
+@pytest.mark.api
+@pytest.mark.parametrize("mode", ["strict", "warn", "off"])
+def test_schema_validation_modes(mode: str, monkeypatch) -> None:
+    """
+    strict - SchemaError, warn - предупреждение, off - без проверки.
+    """
+    monkeypatch.setenv("CG_API_SCHEMA_VALIDATION", mode)
+    ConfigProvider.use_profile(None)
+    try:
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            if mode == "strict":
+                with pytest.raises(SchemaError):
+                    validate("cart_short", {"data": {}})
+            else:
+                validate("cart_short", {"data": {}})
+        assert len(caught) == (1 if mode == "warn" else 0)
+    finally:
+        monkeypatch.delenv("CG_API_SCHEMA_VALIDATION")
+        ConfigProvider.use_profile(None)
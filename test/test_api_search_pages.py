@@ -0,0 +1,44 @@
+import threading
+import time
+import allure
+import pytest
+from api_utils.ApiResponse import ApiResponse
+from api_utils.SearchApi import SearchApi
+
+
+class SlowSearch(SearchApi):
+    """Поиск без сети: полные страницы, загрузка второй - с задержкой."""
+
+    def __init__(self) -> None:
+        self.fetched = []
+        self.running = threading.Event()
+
+    def _fetch_page(self, phrase: str, page: int,
+                    page_size: int) -> ApiResponse:
+        if page > 1:
+            self.running.set()
+            time.sleep(0.2)
+        response = ApiResponse(200, b"")
+        response._data = {"included": [{"id": page * 100 + number}
+                                       for number in range(page_size)]}
+        self.fetched.append(page)
+        return response
+
+
+@allure.title("Страницы поиска: закрытие генератора ждет загрузку в фоне")
+@allure.feature("API: Поиск товара")
+@pytest.mark.api
+def test_iter_search_results_close_waits_prefetch() -> None:
+    """
+    Генератор закрывается во время загрузки следующей страницы:
+    close() возвращается после ее завершения, новые страницы
+    не запрашиваются.
+    """
+    search = SlowSearch()
+    items = search.iter_search_results("фраза", page_size=2)
+    assert next(items) == {"id": 100}
+    assert search.running.wait(1)
+    items.close()
+    assert search.fetched == [1, 2]
+    time.sleep(0.05)
+    assert search.fetched == [1, 2]
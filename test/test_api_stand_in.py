@@ -0,0 +1,45 @@
+import allure
+import pytest
+import requests
+from stand_in.WebGateServer import WebGateServer
+
+
+@pytest.fixture(scope="module")
+def stand_in_url() -> str:
+    """Фикстура запускает локальный стенд web-gate на время модуля."""
+    server = WebGateServer(catalog_size=20).start()
+    yield server.base_url
+    server.stop()
+
+
+@allure.title("Стенд web-gate: некорректные параметры пагинации - 400")
+@allure.feature("Локальный стенд web-gate")
+@pytest.mark.api
+@pytest.mark.parametrize("path, params", [
+    ("/v2/products", {"page": "abc"}),
+    ("/v2/products", {"per-page": "1.5"}),
+    ("/v2/search/product", {"phrase": "книга", "products[page]": "x"}),
+    ("/v2/search/product", {"phrase": "книга", "products[per-page]": "ten"}),
+])
+def test_stand_in_bad_pagination(stand_in_url: str, path: str,
+                                 params: dict) -> None:
+    """
+    Нечисловой номер или размер страницы - ответ 400 (как у web-gate),
+    а не ошибка сервера или разрыв соединения.
+    """
+    response = requests.get(stand_in_url + path, params=params, timeout=5)
+    assert response.status_code == 400, response.text
+    assert response.json() == {"message": "Bad Request"}
+
+
+@allure.title("Стенд web-gate: корректная пагинация")
+@allure.feature("Локальный стенд web-gate")
+@pytest.mark.api
+def test_stand_in_pagination(stand_in_url: str) -> None:
+    """Вторая страница каталога по 8 товаров из 20."""
+    response = requests.get(stand_in_url + "/v2/products",
+                            params={"page": 2, "per-page": 8}, timeout=5)
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["data"]) == 8
+    assert body["meta"]["pagination"]["totalPages"] == 3
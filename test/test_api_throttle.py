@@ -0,0 +1,167 @@
+import threading
+import time
+import allure
+import pytest
+import requests
+from api_utils.Throttle import (AdaptiveConcurrency, CircuitBreaker,
+                                CircuitOpenError, Throttle, TokenBucket)
+
+URL = "http://127.0.0.1/api/v1/cart"
+
+
+class FakeResponse:
+    """Ответ с кодом статуса и заголовками (без сети)."""
+
+    def __init__(self, status_code: int, headers: dict = None) -> None:
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@allure.title("CircuitBreaker: разомкнут - полуразомкнут - замкнут")
+@allure.feature("Защита API от перегрузки")
+@pytest.mark.api
+def test_breaker_open_half_open_closed() -> None:
+    """
+    После серии ошибок запросы не отправляются, по истечении 'reset'
+    пропускается один пробный запрос; успех замыкает автомат,
+    ошибка снова размыкает его.
+    """
+    breaker = CircuitBreaker(failures=2, reset=0.05)
+    breaker.record(success=False)
+    breaker.before("cart")
+    breaker.record(success=False)
+    with pytest.raises(CircuitOpenError):
+        breaker.before("cart")
+
+    time.sleep(0.06)
+    breaker.before("cart")
+    with pytest.raises(CircuitOpenError):
+        breaker.before("cart")
+    breaker.record(success=False)
+    with pytest.raises(CircuitOpenError):
+        breaker.before("cart")
+
+    time.sleep(0.06)
+    breaker.before("cart")
+    breaker.record(success=True)
+    breaker.before("cart")
+    breaker.before("cart")
+    assert (breaker.failures, breaker.opened_at, breaker.trial) == (
+        0, None, False)
+
+
+@allure.title("Throttle: исключение пробного запроса освобождает ресурсы")
+@allure.feature("Защита API от перегрузки")
+@pytest.mark.api
+def test_throttle_trial_failure_recorded() -> None:
+    """
+    Исключение любого типа при пробном запросе учитывается автоматом
+    как ошибка, а место в AdaptiveConcurrency освобождается.
+    """
+    throttle = Throttle(max_retries=0, breaker_failures=1,
+                        breaker_reset=0.05)
+
+    def broken():
+        raise ValueError("ошибка разбора ответа")
+
+    with pytest.raises(ValueError):
+        throttle.call("GET", URL, broken)
+    _, _, breaker = throttle._endpoint(URL)
+    with pytest.raises(CircuitOpenError):
+        throttle.call("GET", URL, lambda: FakeResponse(200))
+
+    time.sleep(0.06)
+    with pytest.raises(ValueError):
+        throttle.call("GET", URL, broken)
+    assert not breaker.trial
+    assert throttle.concurrency.in_flight == 0
+
+    time.sleep(0.06)
+    assert throttle.call("GET", URL, lambda: FakeResponse(200)).status_code \
+        == 200
+    assert breaker.opened_at is None
+
+
+@allure.title("Throttle: повторы идемпотентных запросов при 5xx")
+@allure.feature("Защита API от перегрузки")
+@pytest.mark.api
+def test_throttle_retries() -> None:
+    """
+    GET повторяется при 503 и ошибке соединения, POST - нет.
+    """
+    throttle = Throttle(max_retries=3, backoff=0, breaker_failures=10)
+    answers = [FakeResponse(503), requests.ConnectionError(),
+               FakeResponse(200)]
+
+    def send():
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    first = answers[0]
+    assert throttle.call("GET", URL, send).status_code == 200
+    assert first.closed and not answers
+
+    assert throttle.call("POST", URL,
+                         lambda: FakeResponse(503)).status_code == 503
+    assert throttle.concurrency.in_flight == 0
+
+
+@allure.title("TokenBucket: темп запросов и пауза Retry-After")
+@allure.feature("Защита API от перегрузки")
+@pytest.mark.api
+def test_token_bucket_rate() -> None:
+    """
+    После всплеска токены выдаются с темпом 'rate',
+    block() приостанавливает выдачу.
+    """
+    bucket = TokenBucket(rate=50, burst=2)
+    start = time.monotonic()
+    for _ in range(2):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.02
+    for _ in range(5):
+        bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+    bucket.block(0.1)
+    start = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+@allure.title("AdaptiveConcurrency: уменьшение вдвое и плавный рост")
+@allure.feature("Защита API от перегрузки")
+@pytest.mark.api
+def test_adaptive_concurrency() -> None:
+    """
+    При 429/503 лимит уменьшается вдвое и запросы сверх лимита ждут,
+    успешные ответы возвращают лимит к максимуму.
+    """
+    concurrency = AdaptiveConcurrency(maximum=4)
+    concurrency.acquire()
+    concurrency.release(throttled=True)
+    assert concurrency.limit == 2
+
+    concurrency.acquire()
+    concurrency.acquire()
+    waiting = threading.Thread(target=concurrency.acquire, daemon=True)
+    waiting.start()
+    waiting.join(0.05)
+    assert waiting.is_alive()
+    concurrency.release(throttled=False)
+    waiting.join(1)
+    assert not waiting.is_alive()
+    assert concurrency.in_flight == 2
+
+    concurrency.release(throttled=False)
+    concurrency.release(throttled=False)
+    for _ in range(20):
+        concurrency.acquire()
+        concurrency.release(throttled=False)
+    assert concurrency.limit == 4
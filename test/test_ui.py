@@ -33,8 +33,8 @@ def test_added_to_cart_from_product_page(browser) -> None:
         with allure.step("""Запомнить данные первого товара, отображаемого
  в списке товаров на странице."""):
             locator = (By.CLASS_NAME, "product-card__title")
-            product_url = main_page.get_element_attribute(locator, "href")
-            product_name = main_page.get_element_attribute(locator, "text")
+            product = main_page.get_element_attributes(locator, "href", "text")
+            product_url, product_name = product["href"], product["text"]
 
         with allure.step("Перейти в карточку товара"):
             product_page.go_to_url(product_url)
@@ -190,14 +190,15 @@ def test_number_phone_invalid(browser, number_phone_invalid) -> None:
         main_page.click_element(locator)
 
         # локатор для поля ввода
-        locator = (By.ID, 'tid-input')
-        main_page.enter_text(locator, number_phone_invalid)
+        input_locator = (By.ID, 'tid-input')
+        main_page.enter_text(input_locator, number_phone_invalid)
 
         # локатор для кнопки 'Получить код'
         atribute = "button.auth-modal-content__button"
         locator = (By.CSS_SELECTOR, atribute)
 
-        is_button_disabled = main_page.element_disabled(locator)
+        is_button_disabled = main_page.element_disabled(locator,
+                                                        input_locator)
 
     with allure.step("Проверка: состояние кнопки 'Получить код' - активна"):
         assert is_button_disabled is not None, """Кнопка 'Получить код'
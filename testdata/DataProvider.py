@@ -1,34 +1,125 @@
 import json
+import os
+import threading
+from pathlib import Path
+from testdata.Dataset import FileDataset, ListDataset
 
-with open('test_data.json', encoding='utf-8') as test_data:
-    global_data = json.load(test_data)
+DATA_PATH = Path(__file__).resolve().parent.parent / "test_data.json"
+ENV_PREFIX = "CG_DATA_"
+
+_lock = threading.Lock()
+_data = None
+_data_path = None
+_datasets = {}
+
+
+def _load() -> dict:
+    """
+    Загружает test_data.json при первом обращении (один раз на процесс).
+    Путь к файлу можно переопределить переменной CG_TEST_DATA.
+    Если задан профиль (CG_PROFILE) и рядом лежит файл
+    test_data.<профиль>.json, его значения заменяют основные.
+    """
+    global _data, _data_path
+    if _data is None:
+        with _lock:
+            if _data is None:
+                path = Path(os.environ.get("CG_TEST_DATA", DATA_PATH))
+                with open(path, encoding='utf-8') as test_data:
+                    data = json.load(test_data)
+                profile = os.environ.get("CG_PROFILE")
+                if profile:
+                    overlay = path.with_name(
+                        f"{path.stem}.{profile}{path.suffix}")
+                    if overlay.exists():
+                        with open(overlay, encoding='utf-8') as test_data:
+                            data.update(json.load(test_data))
+                _data_path = path
+                _data = data
+    return _data
 
 
 class DataProvider:
+    """
+    Провайдер тестовых данных из test_data.json.
+    Файл читается при первом обращении, путь к нему не зависит
+    от текущего каталога. Строковые значения можно переопределить
+    переменными окружения CG_DATA_<КЛЮЧ> (например, CG_DATA_TOKEN).
+    Набор данных (dataset) задается списком в test_data.json или ссылкой
+    на внешний файл JSONL/CSV (путь относительно test_data.json):
+        "search_phrase_positive": "datasets/phrases.jsonl" или
+        "search_phrase_positive": {"file": "datasets/phrases.csv",
+                                   "field": "phrase"}
+    """
 
-    def __init__(self) -> None:
-        self.data = global_data
+    @property
+    def data(self) -> dict:
+        return _load()
 
     def get(self, prop: str) -> str:
+        env = ENV_PREFIX + prop.upper()
+        if env in os.environ:
+            return os.environ[env]
         return self.data.get(prop)
 
     def getint(self, prop: str) -> int:
-        val = self.data.get(prop)
+        val = self.get(prop)
         return int(val)
 
     def get_list(self, prop: str):
-        """Получает список по ключу из файла данных."""
-        data = self.get(prop)
-        if not isinstance(data, list):
-            raise TypeError(f"Ожидается список для ключа '{prop}',\
-                            но получен {type(data)}")
-        return data
+        """
+        Получает список по ключу из файла данных
+        (внешний набор данных загружается целиком - для больших
+        наборов использовать dataset).
+        """
+        data = self.data.get(prop)
+        if isinstance(data, list):
+            return data
+        return list(self.dataset(prop))
+
+    def dataset(self, prop: str):
+        """
+        Возвращает набор данных по ключу (ListDataset или FileDataset):
+        size() - количество записей, item(index) - запись по номеру,
+        перебор - потоковое чтение записей.
+        """
+        dataset = _datasets.get(prop)
+        if dataset is None:
+            data = self.data.get(prop)
+            if isinstance(data, list):
+                dataset = ListDataset(data)
+            elif isinstance(data, (str, dict)):
+                spec = data if isinstance(data, dict) else {"file": data}
+                dataset = FileDataset(_data_path.parent / spec["file"],
+                                      spec.get("field"))
+            else:
+                raise TypeError(f"Ожидается список или файл набора данных\
+                                для ключа '{prop}', но получен {type(data)}")
+            dataset = _datasets.setdefault(prop, dataset)
+        return dataset
+
+    def iter_dataset(self, prop: str):
+        """Потоковый перебор записей набора данных по ключу."""
+        return iter(self.dataset(prop))
 
     def get_token(self) -> str:
-        return self.data.get("token")
+        return self.get("token")
+
+    def get_tokens(self) -> list:
+        """
+        Токены пула аккаунтов: список 'tokens' из test_data.json
+        (или переменная CG_DATA_TOKENS - токены через запятую);
+        если пул не задан - единственный токен 'token'.
+        """
+        env = ENV_PREFIX + "TOKENS"
+        if env in os.environ:
+            tokens = [token.strip() for token in os.environ[env].split(",")]
+        else:
+            tokens = self.data.get("tokens") or []
+        return [token for token in tokens if token] or [self.get_token()]
 
     def get_user_agent(self) -> str:
-        return self.data.get("user_agent")
+        return self.get("user_agent")
 
     def get_content_type(self) -> str:
-        return self.data.get("content_type")
+        return self.get("content_type")
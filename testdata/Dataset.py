@@ -0,0 +1,134 @@
+import csv
+import io
+import json
+import random
+import threading
+from array import array
+from pathlib import Path
+
+
+class ListDataset:
+    """Набор тестовых данных - список из test_data.json."""
+
+    def __init__(self, values: list) -> None:
+        self.values = values
+
+    def size(self) -> int:
+        return len(self.values)
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def item(self, index: int):
+        return self.values[index]
+
+    def item_id(self, index: int) -> str:
+        return str(self.values[index])
+
+
+class FileDataset:
+    """
+    Набор тестовых данных во внешнем файле JSONL или CSV
+    (одна запись - одна строка), читаемый по мере необходимости:
+    - Количество записей считается без разбора строк,
+    - Записи перебираются потоково,
+    - Запись по номеру читается через индекс смещений строк.
+        path - путь к файлу (.jsonl или .csv),
+        field: str - поле записи для подстановки в тест
+               (по умолчанию: запись JSONL целиком, первая колонка CSV).
+    """
+
+    def __init__(self, path, field: str = None) -> None:
+        self.path = Path(path)
+        self.field = field
+        self.format = self.path.suffix.lower().lstrip(".")
+        if self.format not in ("jsonl", "csv"):
+            raise ValueError(f"Неподдерживаемый формат набора данных: "
+                             f"'{self.path.name}' (ожидается .jsonl/.csv)")
+        self.header = None
+        self._size = None
+        self._offsets = None
+        self._lock = threading.Lock()
+
+    def _lines(self, file):
+        """Непустые строки-записи (для CSV - без строки заголовка)."""
+        if self.format == "csv":
+            self.header = next(csv.reader([file.readline().decode(
+                "utf-8-sig")]), [])
+        for line in iter(file.readline, b""):
+            if line.strip():
+                yield line
+
+    def _parse(self, line: bytes):
+        text = line.decode("utf-8").rstrip("\r\n")
+        if self.format == "jsonl":
+            record = json.loads(text)
+            if self.field is not None and isinstance(record, dict):
+                return record[self.field]
+            return record
+        row = next(csv.reader(io.StringIO(text)))
+        if self.field is None:
+            return row[0]
+        return row[self.header.index(self.field)]
+
+    def size(self) -> int:
+        if self._size is None:
+            with open(self.path, "rb") as file:
+                self._size = sum(1 for _ in self._lines(file))
+        return self._size
+
+    def __iter__(self):
+        with open(self.path, "rb") as file:
+            for line in self._lines(file):
+                yield self._parse(line)
+
+    def _build_offsets(self) -> None:
+        offsets = array("q")
+        with open(self.path, "rb") as file:
+            if self.format == "csv":
+                self.header = next(csv.reader([file.readline().decode(
+                    "utf-8-sig")]), [])
+            while True:
+                offset = file.tell()
+                line = file.readline()
+                if not line:
+                    break
+                if line.strip():
+                    offsets.append(offset)
+        self._offsets = offsets
+        self._size = len(offsets)
+
+    def item(self, index: int):
+        if self._offsets is None:
+            with self._lock:
+                if self._offsets is None:
+                    self._build_offsets()
+        with open(self.path, "rb") as file:
+            file.seek(self._offsets[index])
+            return self._parse(file.readline())
+
+    def item_id(self, index: int) -> str:
+        return f"{self.path.stem}-{index}"
+
+
+def select_indices(size: int, sample: int = 0, seed: int = 1,
+                   shard: str = None) -> list:
+    """
+    Выбирает номера записей набора данных для параметризации тестов.
+        size: int - количество записей,
+        sample: int - случайная выборка из 'sample' записей
+                (0 - все записи); выборка одинакова при одном 'seed',
+        seed: int - зерно генератора выборки,
+        shard: str - часть вида 'K/N' (K от 1 до N): каждая N-я запись,
+               начиная с K-й - для разделения набора между запусками.
+    """
+    indices = range(size)
+    if sample and sample < size:
+        indices = sorted(random.Random(seed).sample(indices, sample))
+    if shard:
+        number, _, count = shard.partition("/")
+        number, count = int(number), int(count)
+        if not 1 <= number <= count:
+            raise ValueError(f"Некорректная часть набора данных: '{shard}'")
+        indices = indices[number - 1::count]
+    return list(indices)
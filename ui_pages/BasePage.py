@@ -1,9 +1,62 @@
 import allure
 from configuration.ConfigProvider import ConfigProvider
 from selenium.webdriver.remote.webdriver import WebDriver
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from ui_pages.RequestBlocker import RequestBlocker
+from ui_pages.Waiter import ALL, ANY, Waiter
+
+# Извлечение данных элементов в браузере одним вызовом execute_script:
+# arguments[0] - локаторы [[by, value], ...], arguments[1] - свойства
+# или атрибуты элементов, arguments[2] - только видимые элементы.
+# Возвращает для каждого локатора список строк значений элементов.
+EXTRACT_SCRIPT = """
+var locators = arguments[0], fields = arguments[1], visible = arguments[2];
+function links(value, partial) {
+    return Array.prototype.filter.call(document.links, function (el) {
+        var text = el.innerText.trim();
+        return partial ? text.indexOf(value) !== -1 : text === value;
+    });
+}
+function find(by, value) {
+    switch (by) {
+        case "id": return document.querySelectorAll("#" + CSS.escape(value));
+        case "name": return document.getElementsByName(value);
+        case "class name": return document.getElementsByClassName(value);
+        case "tag name": return document.getElementsByTagName(value);
+        case "css selector": return document.querySelectorAll(value);
+        case "link text": return links(value, false);
+        case "partial link text": return links(value, true);
+        case "xpath":
+            var found = document.evaluate(value, document, null,
+                XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null), nodes = [];
+            for (var i = 0; i < found.snapshotLength; i++) {
+                nodes.push(found.snapshotItem(i));
+            }
+            return nodes;
+    }
+    throw new Error("Unsupported locator: " + by);
+}
+function read(el, name) {
+    var value = el[name];
+    if (typeof value === "string") {
+        return name === "innerText" ? value.trim() : value;
+    }
+    if (typeof value === "number") { return String(value); }
+    if (typeof value === "boolean") { return value ? "true" : null; }
+    return el.getAttribute(name);
+}
+return locators.map(function (locator) {
+    var rows = [];
+    Array.prototype.forEach.call(find(locator[0], locator[1]), function (el) {
+        if (visible && !el.getClientRects().length) { return; }
+        rows.push(fields.map(function (name) { return read(el, name); }));
+    });
+    return rows;
+});
+"""
+# свойство элемента с видимым текстом (аналог WebElement.text)
+TEXT = "innerText"
 
 
 class BasePage:
@@ -17,16 +70,61 @@ class BasePage:
     - Клик на элемент,
     - Доступность элемента,
     - Поиск элемента,
-    - Получение значения атрибута элемента
+    - Получение значения атрибута элемента,
+    - Получение текстов и атрибутов всех элементов по одному
+      или нескольким локаторам за один запрос к браузеру,
+    - Ожидание первого или всех из нескольких условий в одном цикле
+      опроса (без неявного ожидания драйвера),
+    - Блокировка сторонних запросов страниц (RequestBlocker)
     """
 
     def __init__(self, driver: WebDriver) -> None:
         self.driver = driver
         self.base_url = ConfigProvider().get("ui", "base_url")
-        self.waiting = ConfigProvider().get("ui", "wait_driver")
+        self.waiting = ConfigProvider().getint("ui", "wait_driver")
+        self.waiter = Waiter.for_driver(driver)
+        # блокировка сторонних запросов (применяется к браузеру один раз)
+        self.blocker = RequestBlocker.for_driver(driver)
         self.cart_path = ConfigProvider().get("ui", "cart")
         self.cart_url = self.base_url + self.cart_path
 
+    def wait_until(self, condition, locator: tuple, timeout: float = None):
+        """
+        Общая функция ожидания одного условия.
+            condition - функция от driver (например,
+                        EC.visibility_of_element_located(locator)),
+            locator: tuple - локатор (ключ в отчете об ожиданиях),
+            timeout: float - время ожидания (по умолчанию - wait_driver),
+            return: значение выполненного условия.
+        В случае превышения времени, выбрасывается исключение
+        TimeoutException.
+        """
+        return self.waiter.until(
+            self.driver, {locator: condition},
+            timeout=self.waiting if timeout is None else timeout).value
+
+    def wait_for_any(self, conditions: dict, timeout: float = None) -> tuple:
+        """
+        Общая функция ожидания первого из нескольких условий
+        (например, результатов поиска или сообщения 'ничего не найдено').
+            conditions: dict - локаторы и условия,
+            return: tuple - (локатор, значение) выполненного условия.
+        """
+        result = self.waiter.until(
+            self.driver, conditions, ANY,
+            self.waiting if timeout is None else timeout)
+        return result.first, result.value
+
+    def wait_for_all(self, conditions: dict, timeout: float = None) -> dict:
+        """
+        Общая функция ожидания всех условий в одном цикле опроса.
+            conditions: dict - локаторы и условия,
+            return: dict - локаторы и значения условий.
+        """
+        return self.waiter.until(
+            self.driver, conditions, ALL,
+            self.waiting if timeout is None else timeout).values
+
     @allure.step("Перейти на страницу: {any_url}.")
     def go_to_url(self, any_url: str) -> None:
         """
@@ -51,9 +149,8 @@ class BasePage:
         В случае ошибки, выбрасывается исключение TimeoutException.
         """
         try:
-            element = WebDriverWait(self.driver, self.waiting).until(
-                EC.element_to_be_clickable(locator)
-            )
+            element = self.wait_until(
+                EC.element_to_be_clickable(locator), locator)
             return element
         except TimeoutException:
             raise TimeoutException(f"Элемент {locator} не доступен\
@@ -73,9 +170,8 @@ class BasePage:
         В случае ошибки, выбрасывается исключение TimeoutException.
         """
         try:
-            element = WebDriverWait(self.driver, self.waiting).until(
-                EC.visibility_of_element_located(locator)
-            )
+            element = self.wait_until(
+                EC.visibility_of_element_located(locator), locator)
             return element
         except TimeoutException:
             raise TimeoutException(f"Элемент {locator} не виден\
@@ -120,30 +216,160 @@ class BasePage:
          TimeoutException
         """
         try:
-            element = WebDriverWait(self.driver, self.waiting).until(
-                EC.presence_of_element_located(locator)
-            )
+            element = self.wait_until(
+                EC.presence_of_element_located(locator), locator)
             return element
         except TimeoutException:
             raise TimeoutException(f"Превышено время ожидания {self.waiting}")
 
     @allure.step("Определить доступность элемента по атрибуту: '{locator}'")
-    def element_disabled(self, locator: str):
+    def element_disabled(self, locator: tuple, input_locator: tuple = None,
+                         message_locator: tuple = None,
+                         timeout: float = None):
         """
         Общая функция для определения доступности элемента.
+        Без поля ввода ожидается появление элемента и однократно
+        проверяется атрибут 'disabled'.
+        Если передан локатор поля ввода, от которого зависит элемент
+        (например, кнопка отправки формы), в одном цикле опроса
+        ожидается результат проверки ввода страницей: атрибут 'disabled'
+        элемента, aria-invalid="true" поля или сообщение проверки;
+        если результата нет за время ожидания, элемент доступен.
             locator: tuple - локатор для элемента вида (By.ID, "element_id")
+            input_locator: tuple - локатор поля ввода (по умолчанию -
+                           без ожидания проверки ввода),
+            message_locator: tuple - локатор сообщения проверки поля
+                             (по умолчанию - только aria-invalid),
+            timeout: float - время ожидания результата проверки ввода
+                     (по умолчанию - wait_driver),
+            return: True, если элемент недоступен, иначе None.
         В случае ошибки, выбрасывается исключение TimeoutException.
         """
+        disabled = EC.element_attribute_to_include(locator, "disabled")
         try:
-            element = WebDriverWait(self.driver, self.waiting).until(
-                EC.element_attribute_to_include(locator, "disabled")
-            )
-            return element
+            if input_locator is None:
+                self.wait_until(EC.presence_of_element_located(locator),
+                                locator)
+                return self.wait_until(disabled, locator, timeout=0)
+            conditions = {locator: disabled,
+                          input_locator: self._input_rejected(input_locator)}
+            if message_locator is not None:
+                conditions[message_locator] = \
+                    EC.visibility_of_element_located(message_locator)
+            self.wait_for_any(conditions, timeout)
+            return True
         except TimeoutException:
             return None
         except Exception as e:
             raise Exception(f"Произошла непредвиденная ошибка: {e}")
 
+    @staticmethod
+    def _input_rejected(locator: tuple):
+        """Условие: поле ввода отклонено страницей (aria-invalid="true")."""
+        def condition(driver):
+            element = driver.find_element(*locator)
+            return element.get_attribute("aria-invalid") == "true"
+        return condition
+
+    def _extract(self, locators: list, fields: tuple,
+                 visible: bool = False) -> list:
+        """
+        Значения свойств/атрибутов 'fields' всех элементов по каждому
+        локатору за один вызов execute_script.
+            return: list - для каждого локатора список строк значений.
+        """
+        return self.driver.execute_script(
+            EXTRACT_SCRIPT, [list(locator) for locator in locators],
+            list(fields), visible)
+
+    def _wait_extract(self, locators: list, fields: tuple,
+                      visible: bool = False) -> list:
+        """
+        Ожидает, пока по локаторам найдется хотя бы один элемент;
+        каждая проверка - один вызов execute_script, возвращающий
+        значения элементов (см. _extract).
+        В случае ошибки, выбрасывается исключение TimeoutException.
+        """
+        def found(driver):
+            rows = self._extract(locators, fields, visible)
+            return rows if any(rows) else False
+
+        try:
+            return self.wait_until(
+                found, tuple(tuple(locator) for locator in locators))
+        except TimeoutException:
+            raise TimeoutException(f"Элементы {locators} не найдены\
+        после {self.waiting} секунд ожидания")
+
+    def extract(self, locators: dict, *fields: str, visible: bool = False,
+                wait: bool = True) -> dict:
+        """
+        Общая функция для получения данных всех элементов по нескольким
+        локаторам за один запрос к браузеру.
+            locators: dict - имена и локаторы вида
+                      {"titles": (By.CLASS_NAME, "product-card__title")},
+            fields: str - свойства или атрибуты элементов
+                    (по умолчанию - видимый текст),
+            visible: bool - только видимые элементы,
+            wait: bool - ожидать, пока найдется хотя бы один элемент,
+            return: dict - имена локаторов и списки значений элементов
+                    (для нескольких полей - словари {поле: значение}).
+        В случае если ни один элемент не найден за время ожидания,
+        выбрасывается исключение TimeoutException.
+        """
+        fields = fields or (TEXT,)
+        names = list(locators)
+        values = [locators[name] for name in names]
+        rows = self._wait_extract(values, fields, visible) if wait else \
+            self._extract(values, fields, visible)
+        if len(fields) == 1:
+            return {name: [row[0] for row in found]
+                    for name, found in zip(names, rows)}
+        return {name: [dict(zip(fields, row)) for row in found]
+                for name, found in zip(names, rows)}
+
+    @allure.step("Получить тексты элементов: '{locator}'")
+    def get_texts(self, locator: tuple, visible: bool = True,
+                  wait: bool = True) -> list:
+        """
+        Общая функция для получения видимого текста всех элементов
+        по локатору за один запрос к браузеру.
+            locator: tuple - локатор для элементов вида
+                     (By.CLASS_NAME, "element_class")
+            return: list - тексты элементов в порядке на странице.
+        """
+        return self.extract({"texts": locator}, TEXT, visible=visible,
+                            wait=wait)["texts"]
+
+    @allure.step("Получить атрибуты {attributes} элементов: '{locator}'")
+    def get_attributes(self, locator: tuple, *attributes: str,
+                       wait: bool = True) -> list:
+        """
+        Общая функция для получения атрибутов всех элементов
+        по локатору за один запрос к браузеру.
+            locator: tuple - локатор для элементов вида
+                     (By.CLASS_NAME, "element_class")
+            attributes: str - свойства или атрибуты элементов
+            return: list - словари {атрибут: значение} элементов.
+        """
+        return self.extract({"items": locator}, *attributes,
+                            wait=wait)["items"]
+
+    @allure.step("Получить атрибуты {attributes} элемента: '{locator}'")
+    def get_element_attributes(self, locator: tuple, *attributes: str) -> dict:
+        """
+        Общая функция для получения нескольких атрибутов первого
+        найденного элемента: ожидание и чтение атрибутов выполняются
+        одним запросом к браузеру на каждую проверку.
+            locator: tuple - локатор для элемента вида (By.ID, "element_id")
+            attributes: str - свойства или атрибуты элемента
+            return: dict - {атрибут: значение}.
+        В случае если элемент не найден, выбрасывается исключение
+        TimeoutException.
+        """
+        row = self._wait_extract([locator], attributes)[0][0]
+        return dict(zip(attributes, row))
+
     @allure.step("Получить значение атрибута элемента: '{attribute}'")
     def get_element_attribute(self, locator: str, attribute: str):
         """
@@ -154,10 +380,6 @@ class BasePage:
         В случае ошибки, выбрасывается исключение Exception.
         """
         try:
-            element = WebDriverWait(self.driver, self.waiting).until(
-                EC.presence_of_element_located(locator)
-            )
-            attribute_value = element.get_attribute(attribute)
-            return attribute_value
+            return self._wait_extract([locator], (attribute,))[0][0][0]
         except Exception as e:
             raise Exception(f"Произошла ошибка: {e}")
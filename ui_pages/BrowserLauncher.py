@@ -0,0 +1,233 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import weakref
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.remote.webdriver import WebDriver
+from configuration.ConfigProvider import ConfigProvider
+
+MANIFEST = "drivers.json"
+LATEST = "latest"
+
+# аргументы быстрого запуска: без первого запуска, расширений
+# и фоновых сетевых запросов браузера
+FAST_START_ARGS = (
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-extensions",
+    "--disable-default-apps",
+    "--disable-component-update",
+    "--disable-background-networking",
+    "--disable-sync",
+    "--password-store=basic",
+)
+# файлы блокировки профиля не копируются в профиль экземпляра
+PROFILE_LOCKS = shutil.ignore_patterns("Singleton*", "lockfile")
+
+
+class DriverResolver:
+    """
+    Определяет путь к chromedriver без загрузки при каждом запуске:
+    - driver_path - готовый chromedriver (например, на CI без сети),
+    - driver_version - закрепленная версия: драйвер берется из кэша
+      driver_cache_dir, загружается webdriver-manager только один раз,
+    - без закрепленной версии последняя версия проверяется не чаще
+      одного раза в 'ttl' секунд,
+    - offline - без обращения к сети: если драйвера нет в кэше,
+      выбрасывается исключение FileNotFoundError.
+    Пути к загруженным драйверам записываются в манифест кэша.
+    """
+
+    def __init__(self, cache_dir: str, version: str = None, path: str = None,
+                 offline: bool = False, ttl: float = 86400) -> None:
+        """
+        Инициализация.
+            cache_dir: str - каталог кэша драйверов,
+            version: str - закрепленная версия chromedriver
+                     (например, '126.0.6478.126'),
+            path: str - путь к готовому chromedriver,
+            offline: bool - не обращаться к сети,
+            ttl: float - время актуальности последней версии (сек.).
+        """
+        self.cache_dir = cache_dir
+        self.version = version or None
+        self.path = path or None
+        self.offline = offline
+        self.ttl = ttl
+        self.manifest_path = os.path.join(cache_dir, MANIFEST)
+
+    @classmethod
+    def from_config(cls) -> "DriverResolver":
+        """Создает DriverResolver по настройкам секции [ui]."""
+        config = ConfigProvider()
+        return cls(config.get("ui", "driver_cache_dir") or ".browser/drivers",
+                   version=config.get("ui", "driver_version"),
+                   path=config.get("ui", "driver_path"),
+                   offline=bool(config.getboolean("ui", "driver_offline")),
+                   ttl=config.getfloat("ui", "driver_ttl") or 0)
+
+    def _manifest(self) -> dict:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, key: str, path: str) -> None:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest = self._manifest()
+        manifest[key] = {"path": os.path.abspath(path),
+                         "resolved": time.time()}
+        temp = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(temp, "w", encoding="utf-8") as file:
+            json.dump(manifest, file, indent=2)
+        os.replace(temp, self.manifest_path)
+
+    def cached(self) -> str:
+        """
+        Путь к драйверу из кэша или None. Последняя версия (без
+        закрепления) берется из кэша, пока не истек 'ttl', а в режиме
+        offline - всегда.
+        """
+        entry = self._manifest().get(self.version or LATEST)
+        if not entry or not os.path.isfile(entry["path"]):
+            return None
+        if (self.version is None and not self.offline and
+                time.time() - entry["resolved"] > self.ttl):
+            return None
+        return entry["path"]
+
+    def resolve(self) -> str:
+        """Возвращает путь к chromedriver."""
+        if self.path:
+            if not os.path.isfile(self.path):
+                raise FileNotFoundError(
+                    f"chromedriver не найден: {self.path} (driver_path)")
+            return self.path
+        path = self.cached()
+        if path:
+            return path
+        if self.offline:
+            raise FileNotFoundError(
+                f"chromedriver {self.version or LATEST} нет в кэше "
+                f"{self.cache_dir}: укажите driver_path или загрузите "
+                f"драйвер без driver_offline")
+        from webdriver_manager.chrome import ChromeDriverManager
+        from webdriver_manager.core.driver_cache import DriverCacheManager
+        path = ChromeDriverManager(
+            driver_version=self.version,
+            cache_manager=DriverCacheManager(root_dir=self.cache_dir)
+        ).install()
+        self._save(self.version or LATEST, path)
+        return path
+
+
+class ChromeProfile:
+    """
+    Профиль быстрого запуска Chrome для UI-тестов:
+    - headless-режим с заданным размером окна,
+    - без первого запуска, расширений и фоновых запросов браузера,
+    - стратегия загрузки страниц (normal, eager, none),
+    - прогретый каталог профиля: создается один раз (warm),
+      каждый браузер получает собственную копию.
+    """
+
+    def __init__(self, headless: bool = True,
+                 page_load_strategy: str = "normal",
+                 window_size: str = "1920,1080",
+                 profile_dir: str = None, capabilities: dict = None) -> None:
+        """
+        Инициализация.
+            headless: bool - запуск без окна,
+            page_load_strategy: str - стратегия загрузки страниц,
+            window_size: str - размер окна в headless-режиме ('W,H'),
+            profile_dir: str - каталог прогретого профиля
+                         (None - каждый браузер с новым профилем),
+            capabilities: dict - дополнительные возможности Chrome
+                          (например, goog:loggingPrefs).
+        """
+        self.headless = headless
+        self.page_load_strategy = page_load_strategy
+        self.window_size = window_size
+        self.profile_dir = profile_dir or None
+        self.capabilities = dict(capabilities or {})
+
+    @classmethod
+    def from_config(cls) -> "ChromeProfile":
+        """Создает ChromeProfile по настройкам секции [ui]."""
+        config = ConfigProvider()
+        headless = config.getboolean("ui", "headless")
+        return cls(headless=True if headless is None else headless,
+                   page_load_strategy=config.get(
+                       "ui", "page_load_strategy") or "normal",
+                   window_size=config.get("ui", "window_size") or "1920,1080",
+                   profile_dir=config.get("ui", "profile_dir"))
+
+    def options(self, user_data_dir: str = None) -> webdriver.ChromeOptions:
+        """Параметры запуска Chrome."""
+        options = webdriver.ChromeOptions()
+        options.page_load_strategy = self.page_load_strategy
+        for argument in FAST_START_ARGS:
+            options.add_argument(argument)
+        if self.headless:
+            options.add_argument("--headless=new")
+            options.add_argument(f"--window-size={self.window_size}")
+        if user_data_dir:
+            options.add_argument(f"--user-data-dir={user_data_dir}")
+        for name, value in self.capabilities.items():
+            options.set_capability(name, value)
+        return options
+
+    def warm(self, driver_path: str) -> None:
+        """
+        Создает прогретый профиль (если его еще нет): браузер один раз
+        запускается с каталогом профиля и закрывается.
+        """
+        if not self.profile_dir or os.path.isdir(self.profile_dir):
+            return
+        temp = f"{self.profile_dir}.{os.getpid()}.tmp"
+        driver = webdriver.Chrome(service=ChromeService(driver_path),
+                                  options=self.options(
+                                      os.path.abspath(temp)))
+        try:
+            driver.get("about:blank")
+        finally:
+            driver.quit()
+        try:
+            os.replace(temp, self.profile_dir)
+        except OSError:
+            # профиль уже создан другим процессом
+            shutil.rmtree(temp, ignore_errors=True)
+
+    def _instance_dir(self) -> str:
+        """Копия прогретого профиля для одного браузера."""
+        if not self.profile_dir or not os.path.isdir(self.profile_dir):
+            return None
+        user_data_dir = os.path.join(
+            tempfile.mkdtemp(prefix="cg-chrome-"), "profile")
+        shutil.copytree(self.profile_dir, user_data_dir,
+                        ignore=PROFILE_LOCKS)
+        return user_data_dir
+
+    def launch(self, driver_path: str) -> WebDriver:
+        """
+        Запускает Chrome с профилем быстрого запуска. Копия профиля
+        удаляется после закрытия браузера.
+        """
+        user_data_dir = self._instance_dir()
+        try:
+            driver = webdriver.Chrome(service=ChromeService(driver_path),
+                                      options=self.options(user_data_dir))
+        except Exception:
+            if user_data_dir:
+                shutil.rmtree(os.path.dirname(user_data_dir), True)
+            raise
+        if user_data_dir:
+            weakref.finalize(driver, shutil.rmtree,
+                             os.path.dirname(user_data_dir), True)
+        if not self.headless:
+            driver.maximize_window()
+        return driver
@@ -0,0 +1,181 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.remote.webdriver import WebDriver
+
+STORAGE_TYPES = ("cookies,local_storage,session_storage,indexeddb,"
+                 "websql,service_workers,cache_storage")
+
+
+class BrowserPool:
+    """
+    Пул браузеров для UI-тестов:
+    - Браузер запускается при аренде, если свободных нет и запущено
+      меньше 'size' (воркер с последовательными тестами держит
+      один браузер, сколько бы ни позволял бюджет),
+    - Каждый тест получает браузер в аренду и возвращает его,
+    - Между арендами браузер сбрасывается без перезапуска
+      (cookies, localStorage/sessionStorage, лишние вкладки),
+    - Неисправный браузер или браузер, отработавший 'max_uses' аренд,
+      закрывается, а замена запускается в фоне.
+    """
+
+    def __init__(self, launch, size: int = 2, max_uses: int = 25,
+                 origins=(), lease_timeout: float = 120) -> None:
+        """
+        Инициализация пула.
+            launch - функция запуска нового браузера (возвращает WebDriver),
+            size: int - наибольшее количество браузеров в пуле,
+            max_uses: int - количество аренд до перезапуска браузера,
+            origins - адреса сайтов, данные которых очищаются при сбросе
+                      (например, ['https://www.chitai-gorod.ru']),
+            lease_timeout: float - время ожидания свободного браузера (сек.).
+        """
+        self.launch = launch
+        self.size = max(size, 1)
+        self.max_uses = max_uses
+        self.origins = list(origins)
+        self.lease_timeout = lease_timeout
+        self.idle = queue.Queue()
+        self.uses = {}
+        # запущенные и запускаемые браузеры; браузеры в аренде
+        # и ожидающие аренды
+        self.live = 0
+        self.demand = 0
+        self.lock = threading.Lock()
+        self.closed = False
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.size, thread_name_prefix="browser-launch")
+
+    def _reserve(self, on_demand: bool = False) -> bool:
+        """
+        Резервирует место для нового браузера, если оно есть.
+            on_demand: bool - только если браузеров (в том числе
+                       запускаемых) меньше, чем арендованных и ожидающих.
+        """
+        with self.lock:
+            if self.closed or self.live >= self.size or (
+                    on_demand and self.live >= self.demand):
+                return False
+            self.live += 1
+            return True
+
+    def _launch_async(self) -> None:
+        def launch():
+            driver = self.launch()
+            with self.lock:
+                if not self.closed:
+                    self.uses[id(driver)] = 0
+                    self.idle.put(driver)
+                    return
+                self.live -= 1
+            driver.quit()
+
+        def failed(future) -> None:
+            # ошибка запуска передается тому, кто ждет браузер
+            if future.exception() is not None:
+                with self.lock:
+                    self.live -= 1
+                self.idle.put(future.exception())
+        self.executor.submit(launch).add_done_callback(failed)
+
+    def lease(self) -> WebDriver:
+        """
+        Берет браузер из пула; если свободных нет, запускает новый
+        (не больше 'size') и ожидает его запуска или возврата другого.
+        Если браузер не удалось запустить, выбрасывается исключение
+        запуска; если свободный браузер не появился за 'lease_timeout'
+        секунд - исключение queue.Empty.
+        """
+        with self.lock:
+            self.demand += 1
+        try:
+            if self._reserve(on_demand=True):
+                self._launch_async()
+            driver = self.idle.get(timeout=self.lease_timeout)
+        except BaseException:
+            with self.lock:
+                self.demand -= 1
+            raise
+        if isinstance(driver, BaseException):
+            with self.lock:
+                self.demand -= 1
+            raise driver
+        with self.lock:
+            self.uses[id(driver)] += 1
+        return driver
+
+    def release(self, driver: WebDriver, broken: bool = False) -> None:
+        """
+        Возвращает браузер в пул после сброса состояния.
+        Неисправный или отработавший браузер заменяется новым.
+            broken: bool - браузер заведомо неисправен.
+        """
+        with self.lock:
+            uses = self.uses.get(id(driver), self.max_uses)
+            self.demand -= 1
+        if not broken and uses < self.max_uses and not self.closed:
+            try:
+                self.reset(driver)
+                if self.healthy(driver):
+                    self.idle.put(driver)
+                    return
+            except Exception:
+                pass
+        # замена запускается в фоне - к аренде следующим тестом
+        self._retire(driver)
+        if self._reserve():
+            self._launch_async()
+
+    def reset(self, driver: WebDriver) -> None:
+        """
+        Сбрасывает состояние браузера без перезапуска: закрывает лишние
+        вкладки, удаляет cookies и данные сайтов, открывает пустую
+        страницу.
+        """
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        if hasattr(driver, "execute_cdp_cmd"):
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            for origin in self.origins:
+                driver.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": origin, "storageTypes": STORAGE_TYPES})
+        else:
+            driver.delete_all_cookies()
+            driver.execute_script("window.localStorage.clear();"
+                                  "window.sessionStorage.clear();")
+        driver.get("about:blank")
+
+    @staticmethod
+    def healthy(driver: WebDriver) -> bool:
+        """Проверяет, что браузер отвечает на команды."""
+        try:
+            return driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    def _retire(self, driver: WebDriver) -> None:
+        with self.lock:
+            if self.uses.pop(id(driver), None) is not None:
+                self.live -= 1
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def close(self) -> None:
+        """Закрывает все браузеры пула."""
+        with self.lock:
+            self.closed = True
+        self.executor.shutdown(wait=True)
+        while True:
+            try:
+                driver = self.idle.get_nowait()
+            except queue.Empty:
+                break
+            if not isinstance(driver, BaseException):
+                self._retire(driver)
@@ -30,13 +30,7 @@ class CartPage(BasePage):
         """
         try:
             locator = (By.CLASS_NAME, "product-cart-title__head")
-            self.wait_for_element_visibility(locator)
-            list_cart = self.driver.find_elements(*locator)
-            for product in list_cart:
-                if product.text == product_name:
-                    return True
-
-            return False
+            return product_name in self.get_texts(locator)
         except TimeoutException:
             return False
         except Exception:
@@ -2,6 +2,7 @@ import allure
 from ui_pages.BasePage import BasePage
 from selenium.webdriver.common.by import By
 from selenium.webdriver.remote.webdriver import WebDriver
+from selenium.webdriver.support import expected_conditions as EC
 
 
 class MainPage(BasePage):
@@ -28,6 +29,9 @@ class MainPage(BasePage):
         """
         Выполняет поиск по заданной фразе и возвращает текст
         с результатами поиска.
+        Результаты поиска (заголовок страницы поиска) и сообщение
+        об отсутствии результатов ожидаются в одном цикле опроса -
+        до первого появившегося.
             search_phrase: str - фраза для поиска (тестовые данные
                                  из файла test_data.json)
             return: str - текст о результатах поиска
@@ -35,14 +39,20 @@ class MainPage(BasePage):
         # переменные для запросов
         search_field_locator = (By.NAME, "search")
         search_button_locator = (By.CLASS_NAME, "search-form__icon-search")
-        search_results_locator = (By.CLASS_NAME, "search-page")
-        search_title_locator = (By.CLASS_NAME, "search-title")
+        search_title_locator = (By.CSS_SELECTOR, ".search-page .search-title")
+        search_empty_locator = (By.CSS_SELECTOR,
+                                ".search-page .catalog-empty-result")
 
-        try:
-            self.enter_text(search_field_locator, search_phrase)
-            self.click_element(search_button_locator)
-            self.wait_for_element_visibility(search_results_locator)
-            response = self.find_element(search_title_locator)
-            return response.text
-        except Exception:
-            raise
+        self.enter_text(search_field_locator, search_phrase)
+        self.click_element(search_button_locator)
+        found, element = self.wait_for_any({
+            search_title_locator: EC.visibility_of_element_located(
+                search_title_locator),
+            search_empty_locator: EC.visibility_of_element_located(
+                search_empty_locator)})
+        if found == search_empty_locator:
+            # текст о результатах - в заголовке, если он уже отрисован
+            titles = self.driver.find_elements(*search_title_locator)
+            if titles:
+                return titles[0].text
+        return element.text
@@ -0,0 +1,154 @@
+import json
+import weakref
+from collections import Counter
+from fnmatch import fnmatchcase
+from urllib.parse import urlsplit
+from configuration.ConfigProvider import ConfigProvider
+
+# изображения и шрифты (block_media): по расширению, с параметрами и без
+MEDIA_EXTENSIONS = ("png", "jpg", "jpeg", "gif", "webp", "avif", "svg", "ico",
+                    "woff", "woff2", "ttf", "otf", "eot")
+# причина отказа в загрузке для URL, заблокированных Network.setBlockedURLs
+BLOCKED_REASON = "inspector"
+# журнал браузера с событиями CDP (для подсчета заблокированных запросов)
+LOGGING_PREFS = {"performance": "ALL"}
+
+
+def _split(value: str) -> list:
+    return [item.strip() for item in (value or "").split(",")
+            if item.strip()]
+
+
+class RequestBlocker:
+    """
+    Блокировка сторонних запросов страниц (аналитика, реклама,
+    виджеты чатов, трекеры) через Chrome DevTools Protocol:
+    - Шаблоны блокируемых URL (block_urls, '*' - любые символы)
+      передаются браузеру командой Network.setBlockedURLs,
+    - Шаблоны разрешенных URL (allow_urls) имеют приоритет: шаблоны
+      блокировки, которые могут совпасть с разрешенным адресом,
+      не применяются (исключений в Network.setBlockedURLs нет),
+    - block_media - не загружать изображения и шрифты сторонних хостов
+      (media_hosts): исключений в Network.setBlockedURLs нет, поэтому
+      шаблоны без хоста блокировали бы и изображения разрешенного сайта,
+    - Заблокированные запросы считаются по журналу браузера
+      (события Network.loadingFailed с причиной 'inspector').
+    Один RequestBlocker используется всеми страницами браузера
+    (for_driver), блокировка применяется к браузеру один раз.
+    """
+    _drivers = weakref.WeakKeyDictionary()
+
+    def __init__(self, block_urls=(), allow_urls=(),
+                 block_media: bool = False, media_hosts=(),
+                 enabled: bool = True) -> None:
+        """
+        Инициализация.
+            block_urls - шаблоны блокируемых URL,
+            allow_urls - шаблоны URL, которые не блокируются,
+            block_media: bool - блокировать изображения и шрифты,
+            media_hosts - шаблоны сторонних хостов, изображения и шрифты
+                          которых блокируются (например, '*.yastatic.net'),
+            enabled: bool - блокировка включена.
+        """
+        self.allow_urls = list(allow_urls)
+        patterns = list(block_urls) + (
+            self.media_patterns(media_hosts) if block_media else [])
+        self.patterns = [pattern for pattern in dict.fromkeys(patterns)
+                         if not self._allowed(pattern)]
+        self.enabled = enabled and bool(self.patterns)
+        self.blocked = Counter()
+
+    @staticmethod
+    def media_patterns(hosts) -> list:
+        """
+        Шаблоны URL изображений и шрифтов хостов 'hosts'
+        (по расширению, с параметрами и без).
+        """
+        return [pattern for host in hosts for ext in MEDIA_EXTENSIONS
+                for pattern in (f"*://{host}/*.{ext}",
+                                f"*://{host}/*.{ext}?*")]
+
+    def _allowed(self, pattern: str) -> bool:
+        """Шаблон блокировки может совпасть с разрешенным адресом."""
+        for allow in self.allow_urls:
+            if (fnmatchcase(allow.strip("*"), pattern) or
+                    fnmatchcase(pattern.strip("*"), allow)):
+                return True
+        return False
+
+    @classmethod
+    def from_config(cls) -> "RequestBlocker":
+        """Создает RequestBlocker по настройкам секции [ui]."""
+        config = ConfigProvider()
+        return cls(_split(config.get("ui", "block_urls")),
+                   _split(config.get("ui", "allow_urls")),
+                   block_media=bool(config.getboolean("ui", "block_media")),
+                   media_hosts=_split(config.get("ui", "media_hosts")),
+                   enabled=bool(config.getboolean("ui", "block_requests")))
+
+    @classmethod
+    def for_driver(cls, driver) -> "RequestBlocker":
+        """
+        Возвращает RequestBlocker браузера (создается при первом
+        обращении по настройкам секции [ui]) и применяет блокировку.
+        """
+        blocker = cls._drivers.get(driver)
+        if blocker is None:
+            blocker = cls.from_config()
+            cls._drivers[driver] = blocker
+            blocker.apply(driver)
+        return blocker
+
+    def capabilities(self) -> dict:
+        """
+        Дополнительные возможности Chrome для подсчета заблокированных
+        запросов (журнал событий CDP).
+        """
+        return {"goog:loggingPrefs": LOGGING_PREFS} if self.enabled else {}
+
+    def apply(self, driver) -> None:
+        """Передает шаблоны блокируемых URL браузеру."""
+        if not self.enabled or not hasattr(driver, "execute_cdp_cmd"):
+            return
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs",
+                               {"urls": self.patterns})
+
+    def collect(self, driver) -> Counter:
+        """
+        Считает запросы, заблокированные с прошлого вызова, по журналу
+        браузера и возвращает их количество по адресам (хостам).
+        """
+        found = Counter()
+        if not self.enabled:
+            return found
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            # журнал событий не включен (браузер запущен без capabilities)
+            return found
+        urls = {}
+        for entry in entries:
+            raw = entry["message"]
+            # разбираются только события запросов и ошибок загрузки
+            if ("Network.loadingFailed" not in raw and
+                    "Network.requestWillBeSent" not in raw):
+                continue
+            message = json.loads(raw)["message"]
+            method, params = message.get("method"), message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                urls[params["requestId"]] = params["request"]["url"]
+            elif (method == "Network.loadingFailed" and
+                  params.get("blockedReason") == BLOCKED_REASON):
+                url = urls.get(params["requestId"], "")
+                found[urlsplit(url).netloc or url or "?"] += 1
+        self.blocked.update(found)
+        return found
+
+    @staticmethod
+    def report(blocked: Counter) -> str:
+        """Отчет: всего заблокировано и количество по хостам."""
+        lines = [f"Заблокировано запросов: {sum(blocked.values())}"]
+        lines += [f"{count:6}  {host}" for host, count
+                  in blocked.most_common()]
+        return "\n".join(lines)
@@ -0,0 +1,131 @@
+import time
+import weakref
+from selenium.common.exceptions import (TimeoutException,
+                                        NoSuchElementException,
+                                        StaleElementReferenceException)
+from configuration.ConfigProvider import ConfigProvider
+
+ANY = "any"
+ALL = "all"
+# исключения, при которых проверка условия повторяется
+IGNORED = (NoSuchElementException, StaleElementReferenceException)
+
+
+class WaitResult:
+    """
+    Результат ожидания:
+        values: dict - значения выполненных условий по ключам
+                (локаторам),
+        waited: dict - время до выполнения каждого условия (сек.),
+        first - ключ условия, выполненного первым.
+    """
+
+    def __init__(self, values: dict, waited: dict) -> None:
+        self.values = values
+        self.waited = waited
+        self.first = next(iter(values), None)
+
+    @property
+    def value(self):
+        """Значение условия, выполненного первым."""
+        return self.values.get(self.first)
+
+
+class Waiter:
+    """
+    Единый механизм явных ожиданий для страниц (вместо WebDriverWait
+    на каждый вызов и неявного ожидания драйвера):
+    - Несколько условий проверяются в одном цикле опроса: до первого
+      выполненного (ANY) или до выполнения всех (ALL),
+    - Интервал опроса задается настройкой poll_interval секции [ui],
+    - Время ожидания каждого условия (локатора) записывается в историю
+      для отчета.
+    Один Waiter используется всеми страницами браузера (for_driver).
+    """
+    _drivers = weakref.WeakKeyDictionary()
+
+    def __init__(self, timeout: float, poll: float = 0.1) -> None:
+        """
+        Инициализация.
+            timeout: float - время ожидания по умолчанию (сек.),
+            poll: float - интервал опроса условий (сек.).
+        """
+        self.timeout = timeout
+        self.poll = poll
+        self.history = []
+
+    @classmethod
+    def for_driver(cls, driver) -> "Waiter":
+        """
+        Возвращает Waiter браузера (создается при первом обращении
+        по настройкам wait_driver и poll_interval секции [ui]).
+        """
+        waiter = cls._drivers.get(driver)
+        if waiter is None:
+            config = ConfigProvider()
+            waiter = cls(config.getint("ui", "wait_driver"),
+                         config.getfloat("ui", "poll_interval") or 0.1)
+            cls._drivers[driver] = waiter
+        return waiter
+
+    def until(self, driver, conditions: dict, mode: str = ANY,
+              timeout: float = None, message: str = None) -> WaitResult:
+        """
+        Ожидает выполнения условий.
+            driver - WebDriver, передаваемый в условия,
+            conditions: dict - ключи (локаторы) и условия - функции
+                        от driver, возвращающие значение или False,
+            mode: str - ANY - до первого выполненного условия,
+                  ALL - до выполнения всех условий,
+            timeout: float - время ожидания (None - по умолчанию,
+                     0 - одна проверка),
+            message: str - текст исключения при превышении времени.
+        В случае превышения времени, выбрасывается исключение
+        TimeoutException.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        start = time.monotonic()
+        deadline = start + timeout
+        pending = dict(conditions)
+        values, waited = {}, {}
+        error = None
+        while True:
+            for key, condition in list(pending.items()):
+                try:
+                    value = condition(driver)
+                except IGNORED as e:
+                    error = e
+                    continue
+                if value:
+                    values[key] = value
+                    waited[key] = time.monotonic() - start
+                    del pending[key]
+                    if mode == ANY:
+                        break
+            if values and mode == ANY or not pending:
+                self._record(waited, (), start)
+                return WaitResult(values, waited)
+            now = time.monotonic()
+            if now >= deadline:
+                self._record(waited, pending, start)
+                raise TimeoutException(
+                    message or f"Условия {list(pending)} не выполнены "
+                               f"после {timeout} секунд ожидания",
+                    getattr(error, "screen", None),
+                    getattr(error, "stacktrace", None))
+            time.sleep(min(self.poll, deadline - now))
+
+    def _record(self, waited: dict, pending, start: float) -> None:
+        elapsed = time.monotonic() - start
+        self.history.extend((key, seconds, True)
+                            for key, seconds in waited.items())
+        self.history.extend((key, elapsed, False) for key in pending)
+
+    def report(self) -> str:
+        """
+        Отчет об ожиданиях: время ожидания по каждому ключу (локатору),
+        невыполненные условия отмечаются 'timeout'.
+        """
+        return "\n".join(
+            f"{seconds * 1000:9.1f} мс  {'ok' if ok else 'timeout':7}  "
+            f"{key}" for key, seconds, ok in self.history)